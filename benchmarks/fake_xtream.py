@@ -0,0 +1,504 @@
+"""
+Lokaler Xtream-/M3U-Stand-in fuer reproduzierbare Benchmarks: deterministischer
+Katalog, EPG, Logos/Poster als erzeugte PNGs, laeuft in einem eigenen Thread
+
+    server = FakeXtreamServer(PanelConfig(live=10_000, vod=10_000, latency_ms=30))
+    base_url = server.start()   # z.B. http://127.0.0.1:41234
+    ...
+    server.stop()
+
+Endpunkte (Zugangsdaten: Benutzer "bench", Passwort "bench"):
+    /player_api.php   Account-Info und Actions get_live_categories, get_live_streams,
+                      get_vod_categories, get_vod_streams, get_vod_info,
+                      get_series_categories, get_series, get_series_info,
+                      get_short_epg, get_simple_data_table
+    /xmltv.php        XMLTV aller Live-Sender
+    /get.php          M3U-Playlist (Live + Filme)
+    /images/<id>.png  Logos/Poster
+
+Latenz, Bandbreite und Fehler (HTTP 503, haengende Antworten) sind ueber
+PanelConfig einstellbar; `python benchmarks/fake_xtream.py --help` startet
+den Stand-in eigenstaendig.
+"""
+import asyncio
+import base64
+import json
+import random
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+from aiohttp import web
+
+USERNAME = "bench"
+PASSWORD = "bench"
+
+# ID-Bereiche (Live ab 1), getrennt auch bei 100k-Katalogen
+VOD_ID_BASE = 1_000_000
+SERIES_ID_BASE = 2_000_000
+
+# Schreibgroesse beim gedrosselten/gestreamten Senden
+_CHUNK_BYTES = 16 * 1024
+
+
+@dataclass
+class PanelConfig:
+    live: int = 1000              # Live-Sender gesamt
+    vod: int = 1000               # Filme gesamt
+    series: int = 200             # Serien gesamt
+    categories: int = 20          # Kategorien je Typ
+    seasons: int = 3              # Staffeln je Serie
+    episodes: int = 10            # Episoden je Staffel
+    programme_minutes: int = 60   # Laenge einer Sendung
+    epg_hours_back: int = 72      # Archiv (get_simple_data_table, XMLTV)
+    epg_hours_ahead: int = 24
+    image_size: int = 64          # Kantenlaenge der PNGs
+    latency_ms: float = 0.0       # Verzoegerung je Anfrage
+    bandwidth_kbps: float = 0.0   # 0 = unbegrenzt
+    error_rate: float = 0.0       # Anteil der Anfragen mit HTTP 503
+    stall_rate: float = 0.0       # Anteil der Anfragen, die `stall_s` haengen
+    stall_s: float = 30.0
+    seed: int = 1
+
+
+def solid_png(width: int, height: int, rgb: tuple[int, int, int]) -> bytes:
+    """Einfarbiges PNG ohne Bildbibliothek"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    row = b"\x00" + bytes(rgb) * width
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(row * height)) + chunk(b"IEND", b""))
+
+
+def _b64(text: str) -> str:
+    return base64.b64encode(text.encode("utf-8")).decode("ascii")
+
+
+class FakePanel:
+    """Erzeugt Katalog und Antworten; Inhalte haengen nur von der Konfiguration ab.
+
+    Fertig kodierte Katalog-Antworten werden gecacht, damit der Stand-in bei
+    grossen Katalogen nicht selbst zum Flaschenhals wird.
+    """
+
+    def __init__(self, config: PanelConfig, base_url: str = ""):
+        self.config = config
+        self.base_url = base_url
+        self.requests: Counter = Counter()
+        self.bytes_sent = 0
+        self._rng = random.Random(config.seed)
+        self._bodies: dict[tuple, bytes] = {}
+        self._images: dict[int, bytes] = {}
+
+    # ── Katalog ─────────────────────────────────────────────────────
+
+    def category_id(self, kind: str, index: int) -> str:
+        return str({"live": 1000, "vod": 2000, "series": 3000}[kind] + index % self.config.categories)
+
+    def categories(self, kind: str) -> list[dict]:
+        label = {"live": "Sender", "vod": "Filme", "series": "Serien"}[kind]
+        return [
+            {"category_id": self.category_id(kind, i), "category_name": f"{label} {i + 1}", "parent_id": 0}
+            for i in range(self.config.categories)
+        ]
+
+    def _indices(self, kind: str, count: int, category_id: str) -> Iterable[int]:
+        if not category_id:
+            return range(count)
+        offset = int(category_id) - {"live": 1000, "vod": 2000, "series": 3000}[kind]
+        if not 0 <= offset < self.config.categories:
+            return range(0)
+        return range(offset, count, self.config.categories)
+
+    def live_stream(self, i: int) -> dict:
+        return {
+            "num": i + 1, "name": f"Kanal {i + 1} HD", "stream_type": "live",
+            "stream_id": i + 1, "stream_icon": f"{self.base_url}/images/{i + 1}.png",
+            "epg_channel_id": f"kanal{i + 1}.de", "added": "1700000000",
+            "category_id": self.category_id("live", i),
+            "tv_archive": 1 if i % 3 == 0 else 0, "tv_archive_duration": 7 if i % 3 == 0 else 0,
+        }
+
+    def live_streams(self, category_id: str = "") -> list[dict]:
+        return [self.live_stream(i) for i in self._indices("live", self.config.live, category_id)]
+
+    def vod_stream(self, i: int) -> dict:
+        sid = VOD_ID_BASE + i
+        return {
+            "num": i + 1, "name": f"Film {i + 1} ({1980 + i % 45})", "stream_type": "movie",
+            "stream_id": sid, "stream_icon": f"{self.base_url}/images/{sid}.png",
+            "rating": f"{(i * 37) % 100 / 10:.1f}", "rating_5based": (i * 37) % 100 / 20,
+            "added": str(1600000000 + i * 3600), "category_id": self.category_id("vod", i),
+            "container_extension": "mkv", "tmdb": str(500 + i),
+        }
+
+    def vod_streams(self, category_id: str = "") -> list[dict]:
+        return [self.vod_stream(i) for i in self._indices("vod", self.config.vod, category_id)]
+
+    def series_entry(self, i: int) -> dict:
+        sid = SERIES_ID_BASE + i
+        return {
+            "num": i + 1, "name": f"Serie {i + 1}", "series_id": sid,
+            "cover": f"{self.base_url}/images/{sid}.png", "plot": f"Handlung von Serie {i + 1}.",
+            "rating": f"{(i * 53) % 100 / 10:.1f}", "rating_5based": (i * 53) % 100 / 20,
+            "last_modified": str(1600000000 + i * 7200), "category_id": self.category_id("series", i),
+        }
+
+    def series(self, category_id: str = "") -> list[dict]:
+        return [self.series_entry(i) for i in self._indices("series", self.config.series, category_id)]
+
+    def vod_info(self, stream_id: int) -> dict:
+        i = stream_id - VOD_ID_BASE
+        if not 0 <= i < self.config.vod:
+            return {"info": [], "movie_data": {}}
+        movie = self.vod_stream(i)
+        return {
+            "info": {
+                "name": movie["name"], "o_name": movie["name"], "tmdb_id": movie["tmdb"],
+                "plot": f"Beschreibung von {movie['name']}.", "genre": "Drama, Krimi",
+                "director": f"Regie {i % 97}", "cast": ", ".join(f"Darsteller {i % 50 + k}" for k in range(4)),
+                "releasedate": f"{1980 + i % 45}-01-01", "duration": "01:45:00", "duration_secs": 6300,
+                "rating": movie["rating"], "cover_big": movie["stream_icon"],
+                "movie_image": movie["stream_icon"], "youtube_trailer": "",
+            },
+            "movie_data": {
+                "stream_id": stream_id, "name": movie["name"],
+                "container_extension": "mkv", "category_id": movie["category_id"],
+            },
+        }
+
+    def series_info(self, series_id: int) -> dict:
+        i = series_id - SERIES_ID_BASE
+        if not 0 <= i < self.config.series:
+            return {"seasons": [], "info": {}, "episodes": {}}
+        entry = self.series_entry(i)
+        episodes = {}
+        for season in range(1, self.config.seasons + 1):
+            episodes[str(season)] = [
+                {
+                    "id": str(series_id * 1000 + season * 100 + ep), "episode_num": ep,
+                    "title": f"{entry['name']} S{season:02d}E{ep:02d}",
+                    "container_extension": "mkv", "season": season,
+                    "info": {"plot": f"Folge {ep} der Staffel {season}.", "duration_secs": 2700,
+                             "movie_image": entry["cover"], "rating": entry["rating"]},
+                }
+                for ep in range(1, self.config.episodes + 1)
+            ]
+        return {
+            "seasons": [{"season_number": s, "name": f"Staffel {s}"} for s in range(1, self.config.seasons + 1)],
+            "info": {**entry, "genre": "Drama", "director": f"Regie {i % 97}", "cast": "",
+                     "youtube_trailer": "", "backdrop_path": [entry["cover"]]},
+            "episodes": episodes,
+        }
+
+    # ── EPG ─────────────────────────────────────────────────────────
+
+    def programmes(self, stream_id: int, start: float, stop: float) -> list[tuple[int, int, str, str]]:
+        """(Start, Ende, Titel, Beschreibung) im Raster `programme_minutes`"""
+        length = self.config.programme_minutes * 60
+        first = int(start) - int(start) % length
+        return [
+            (t, t + length, f"Sendung {stream_id}-{t // length % 1000}",
+             f"Beschreibung der Sendung um {datetime.fromtimestamp(t).strftime('%H:%M')}.")
+            for t in range(first, int(stop), length)
+        ]
+
+    def epg_listings(self, stream_id: int, limit: Optional[int] = None) -> dict:
+        now = time.time()
+        has_archive = stream_id % 3 == 1  # wie tv_archive in live_stream()
+        if limit is None:
+            start = now - self.config.epg_hours_back * 3600
+        else:
+            start = now
+        stop = now + self.config.epg_hours_ahead * 3600
+        progs = self.programmes(stream_id, start, stop)
+        if limit is not None:
+            progs = progs[:limit]
+        listings = []
+        for n, (begin, end, title, desc) in enumerate(progs):
+            listings.append({
+                "id": str(stream_id * 100000 + n), "epg_id": str(stream_id),
+                "title": _b64(title), "description": _b64(desc), "lang": "de",
+                "start": datetime.fromtimestamp(begin).strftime("%Y-%m-%d %H:%M:%S"),
+                "end": datetime.fromtimestamp(end).strftime("%Y-%m-%d %H:%M:%S"),
+                "channel_id": f"kanal{stream_id}.de",
+                "start_timestamp": str(begin), "stop_timestamp": str(end),
+                "now_playing": 1 if begin <= now < end else 0,
+                "has_archive": 1 if has_archive and end <= now else 0,
+            })
+        return {"epg_listings": listings}
+
+    def xmltv_chunks(self) -> Iterable[str]:
+        now = time.time()
+        start = now - self.config.epg_hours_back * 3600
+        stop = now + self.config.epg_hours_ahead * 3600
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n<tv generator-info-name="fake_xtream">\n'
+        for i in range(self.config.live):
+            yield (f'  <channel id="kanal{i + 1}.de"><display-name>Kanal {i + 1} HD</display-name>'
+                   f'<icon src="{self.base_url}/images/{i + 1}.png"/></channel>\n')
+        for i in range(self.config.live):
+            parts = []
+            for begin, end, title, desc in self.programmes(i + 1, start, stop):
+                b = datetime.fromtimestamp(begin, timezone.utc).strftime("%Y%m%d%H%M%S +0000")
+                e = datetime.fromtimestamp(end, timezone.utc).strftime("%Y%m%d%H%M%S +0000")
+                parts.append(
+                    f'  <programme start="{b}" stop="{e}" channel="kanal{i + 1}.de">'
+                    f'<title lang="de">{escape(title)}</title><desc lang="de">{escape(desc)}</desc></programme>\n'
+                )
+            yield "".join(parts)
+        yield "</tv>\n"
+
+    def m3u_playlist(self) -> bytes:
+        key = ("m3u",)
+        body = self._bodies.get(key)
+        if body is None:
+            base = self.base_url
+            lines = ["#EXTM3U"]
+            for i in range(self.config.live):
+                s = self.live_stream(i)
+                group = f"Sender {int(s['category_id']) - 1000 + 1}"
+                lines.append(
+                    f'#EXTINF:-1 tvg-id="{s["epg_channel_id"]}" tvg-name={quoteattr(s["name"])} '
+                    f'tvg-logo="{s["stream_icon"]}" group-title="{group}",{s["name"]}'
+                )
+                lines.append(f"{base}/live/{USERNAME}/{PASSWORD}/{s['stream_id']}.ts")
+            for i in range(self.config.vod):
+                s = self.vod_stream(i)
+                group = f"Filme {int(s['category_id']) - 2000 + 1}"
+                lines.append(
+                    f'#EXTINF:-1 tvg-id="" tvg-name={quoteattr(s["name"])} '
+                    f'tvg-logo="{s["stream_icon"]}" group-title="{group}",{s["name"]}'
+                )
+                lines.append(f"{base}/movie/{USERNAME}/{PASSWORD}/{s['stream_id']}.mkv")
+            body = self._bodies[key] = ("\n".join(lines) + "\n").encode("utf-8")
+        return body
+
+    # ── Antworten ───────────────────────────────────────────────────
+
+    def api_body(self, action: str, query) -> bytes:
+        """JSON-Antwort fuer player_api.php (Katalog-Antworten gecacht)"""
+        category_id = query.get("category_id", "")
+        cacheable = action in (
+            "get_live_categories", "get_vod_categories", "get_series_categories",
+            "get_live_streams", "get_vod_streams", "get_series",
+        )
+        key = (action, category_id)
+        if cacheable and key in self._bodies:
+            return self._bodies[key]
+
+        if action == "":
+            data = self.account_info()
+        elif action in ("get_live_categories", "get_vod_categories", "get_series_categories"):
+            data = self.categories(action[len("get_"):-len("_categories")])
+        elif action == "get_live_streams":
+            data = self.live_streams(category_id)
+        elif action == "get_vod_streams":
+            data = self.vod_streams(category_id)
+        elif action == "get_series":
+            data = self.series(category_id)
+        elif action == "get_vod_info":
+            data = self.vod_info(_int(query.get("vod_id")))
+        elif action == "get_series_info":
+            data = self.series_info(_int(query.get("series_id")))
+        elif action == "get_short_epg":
+            data = self.epg_listings(_int(query.get("stream_id")), limit=_int(query.get("limit")) or 4)
+        elif action == "get_simple_data_table":
+            data = self.epg_listings(_int(query.get("stream_id")))
+        else:
+            data = []
+        body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        if cacheable:
+            self._bodies[key] = body
+        return body
+
+    def account_info(self) -> dict:
+        now = int(time.time())
+        return {
+            "user_info": {
+                "username": USERNAME, "password": PASSWORD, "auth": 1, "status": "Active",
+                "exp_date": str(now + 365 * 86400), "is_trial": "0", "active_cons": "0",
+                "created_at": str(now - 86400), "max_connections": "2",
+                "allowed_output_formats": ["m3u8", "ts"],
+            },
+            "server_info": {"url": "127.0.0.1", "timestamp_now": now, "timezone": "Europe/Berlin"},
+        }
+
+    def image(self, image_id: int) -> bytes:
+        png = self._images.get(image_id)
+        if png is None:
+            rgb = ((image_id * 67) % 256, (image_id * 131) % 256, (image_id * 199) % 256)
+            png = self._images[image_id] = solid_png(self.config.image_size, self.config.image_size, rgb)
+        return png
+
+    def inject(self) -> Optional[str]:
+        """Fehler fuer diese Anfrage auswuerfeln: None, "error" oder "stall" """
+        roll = self._rng.random()
+        if roll < self.config.error_rate:
+            return "error"
+        if roll < self.config.error_rate + self.config.stall_rate:
+            return "stall"
+        return None
+
+
+def _int(value) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def create_app(panel: FakePanel) -> web.Application:
+    config = panel.config
+
+    @web.middleware
+    async def faults(request: web.Request, handler):
+        panel.requests[request.query.get("action") or request.path.split("/")[1]] += 1
+        if config.latency_ms:
+            await asyncio.sleep(config.latency_ms / 1000)
+        fault = panel.inject()
+        if fault == "error":
+            raise web.HTTPServiceUnavailable()
+        if fault == "stall":
+            await asyncio.sleep(config.stall_s)
+        return await handler(request)
+
+    async def send(request: web.Request, chunks: Iterable[bytes], content_type: str,
+                   length: Optional[int] = None) -> web.StreamResponse:
+        """Antwort in Bloecken schreiben, gedrosselt auf `bandwidth_kbps`"""
+        resp = web.StreamResponse(headers={"Content-Type": content_type})
+        if length is not None:
+            resp.content_length = length
+        await resp.prepare(request)
+        rate = config.bandwidth_kbps * 1000 / 8
+        for chunk in chunks:
+            for pos in range(0, len(chunk), _CHUNK_BYTES):
+                part = chunk[pos:pos + _CHUNK_BYTES]
+                await resp.write(part)
+                panel.bytes_sent += len(part)
+                if rate:
+                    await asyncio.sleep(len(part) / rate)
+        await resp.write_eof()
+        return resp
+
+    def authorized(request: web.Request) -> bool:
+        q = request.query
+        return q.get("username") == USERNAME and q.get("password") == PASSWORD
+
+    async def player_api(request: web.Request) -> web.StreamResponse:
+        if not authorized(request):
+            return web.json_response({"user_info": {"auth": 0}})
+        body = panel.api_body(request.query.get("action", ""), request.query)
+        return await send(request, [body], "application/json", len(body))
+
+    async def xmltv(request: web.Request) -> web.StreamResponse:
+        if not authorized(request):
+            raise web.HTTPForbidden()
+        chunks = (text.encode("utf-8") for text in panel.xmltv_chunks())
+        return await send(request, chunks, "application/xml")
+
+    async def playlist(request: web.Request) -> web.StreamResponse:
+        if not authorized(request):
+            raise web.HTTPForbidden()
+        body = panel.m3u_playlist()
+        return await send(request, [body], "audio/x-mpegurl", len(body))
+
+    async def image(request: web.Request) -> web.StreamResponse:
+        image_id = _int(request.match_info["image_id"])
+        if not image_id:
+            raise web.HTTPNotFound()
+        body = panel.image(image_id)
+        return await send(request, [body], "image/png", len(body))
+
+    app = web.Application(middlewares=[faults])
+    app.router.add_get("/player_api.php", player_api)
+    app.router.add_get("/xmltv.php", xmltv)
+    app.router.add_get("/get.php", playlist)
+    app.router.add_get("/images/{image_id}.png", image)
+    return app
+
+
+class FakeXtreamServer:
+    """Startet den Stand-in auf 127.0.0.1 (freier Port) in einem Hintergrund-Thread"""
+
+    def __init__(self, config: Optional[PanelConfig] = None, port: int = 0):
+        self.panel = FakePanel(config or PanelConfig())
+        self.port = port
+        self.base_url = ""
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def m3u_url(self) -> str:
+        return f"{self.base_url}/get.php?username={USERNAME}&password={PASSWORD}&type=m3u_plus&output=ts"
+
+    @property
+    def xmltv_url(self) -> str:
+        return f"{self.base_url}/xmltv.php?username={USERNAME}&password={PASSWORD}"
+
+    def start(self) -> str:
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.base_url
+
+    def _run(self, ready: threading.Event):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._runner = web.AppRunner(create_app(self.panel), access_log=None)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, "127.0.0.1", self.port)
+        self._loop.run_until_complete(site.start())
+        self.port = self._runner.addresses[0][1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.panel.base_url = self.base_url
+        ready.set()
+        self._loop.run_forever()
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop = None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Lokaler Xtream-/M3U-Stand-in")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--live", type=int, default=1000)
+    parser.add_argument("--vod", type=int, default=1000)
+    parser.add_argument("--series", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--bandwidth-kbps", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeXtreamServer(
+        PanelConfig(live=args.live, vod=args.vod, series=args.series,
+                    latency_ms=args.latency_ms, bandwidth_kbps=args.bandwidth_kbps,
+                    error_rate=args.error_rate, stall_rate=args.stall_rate),
+        port=args.port,
+    )
+    server.start()
+    print(f"Xtream-Stand-in: {server.base_url}  (Benutzer/Passwort: {USERNAME}/{PASSWORD})")
+    print(f"M3U:   {server.m3u_url}")
+    print(f"XMLTV: {server.xmltv_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,123 @@
+"""
+Frame-Zeiten der GUI-Loop waehrend eine grosse M3U-Playlist geladen wird
+
+Ein QTimer tickt jede Millisekunde; gemessen werden die Abstaende zwischen den
+Ticks. Solange die Loop nicht blockiert ist, bleiben sie weit unter einem
+Frame (16 ms bei 60 Hz).
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/frame_time_m3u.py
+    python benchmarks/frame_time_m3u.py --entries 300000 --mode inline
+
+Exit-Code 1, wenn das Maximum (mit --p99-only nur p99) >= 16 ms liegt.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+from qasync import QEventLoop
+
+import compute_executor
+from m3u_provider import M3uProvider, _parse_and_build
+
+FRAME_BUDGET_MS = 16.0
+
+
+def make_playlist(entries: int) -> str:
+    """Synthetische Playlist: 80% Live in 200 Gruppen, 20% VOD"""
+    lines = ["#EXTM3U"]
+    for i in range(entries):
+        if i % 5 == 4:
+            group = f"Filme {i % 40}"
+            url = f"http://example.invalid/movie/u/p/{i}.mkv"
+        else:
+            group = f"Sender {i % 200}"
+            url = f"http://example.invalid/u/p/{i}"
+        lines.append(
+            f'#EXTINF:-1 tvg-id="ch{i}" tvg-name="Kanal {i}" '
+            f'tvg-logo="http://example.invalid/logo/{i}.png" group-title="{group}",Kanal {i} HD'
+        )
+        lines.append(url)
+    return "\n".join(lines) + "\n"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def measure(text: str, mode: str) -> tuple[list[float], float]:
+    gaps: list[float] = []
+    last = time.perf_counter()
+
+    def tick():
+        nonlocal last
+        now = time.perf_counter()
+        gaps.append((now - last) * 1000)
+        last = now
+
+    timer = QTimer()
+    timer.setInterval(1)
+    timer.timeout.connect(tick)
+    timer.start()
+    await asyncio.sleep(0.2)  # Einschwingen
+    gaps.clear()
+    last = time.perf_counter()
+
+    provider = M3uProvider("bench", "")
+    start = time.perf_counter()
+    if mode == "inline":
+        data = _parse_and_build(text)
+        provider._live_streams = data.live_streams
+    else:
+        await provider.load_text(text)
+    elapsed = time.perf_counter() - start
+
+    await asyncio.sleep(0.05)
+    timer.stop()
+    return gaps, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=300_000)
+    parser.add_argument("--mode", choices=("inline", "thread", "process"), default="thread")
+    parser.add_argument("--p99-only", action="store_true",
+                        help="nur p99 pruefen, einzelne laengere Frames tolerieren")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    loop = QEventLoop(app)
+    asyncio.set_event_loop(loop)
+
+    if args.mode != "inline":
+        compute_executor.configure(args.mode)
+    text = make_playlist(args.entries)
+
+    with loop:
+        gaps, elapsed = loop.run_until_complete(measure(text, args.mode))
+    compute_executor.get_executor().shutdown()
+
+    worst = max(gaps, default=0.0)
+    p99 = percentile(gaps, 99)
+    print(f"{args.entries} Eintraege, Modus {args.mode}: geladen in {elapsed:.2f}s")
+    print(f"Ticks: {len(gaps)}  p50: {percentile(gaps, 50):.2f} ms  "
+          f"p99: {p99:.2f} ms  max: {worst:.2f} ms")
+
+    failed = (p99 if args.p99_only else worst) >= FRAME_BUDGET_MS
+    if failed:
+        print(f"FEHLER: Frame-Budget von {FRAME_BUDGET_MS:.0f} ms ueberschritten")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,375 @@
+"""
+Micro-Benchmarks der reinen Python-Hot-Paths mit gespeicherten Baselines
+
+Synthetische Daten realistischer Groesse (erzeugt mit dem Xtream-Stand-in,
+deterministisch): M3U-Parsing und Katalog-Aufbau, XtreamAPI-Mapping, EPG mit
+Base64, Sortier-Index, Suche sowie Laden/Speichern der JSON-Manager.
+
+    python benchmarks/micro.py                 # messen, mit baselines.json vergleichen
+    python benchmarks/micro.py -k m3u          # nur Benchmarks mit "m3u" im Namen
+    python benchmarks/micro.py --save          # Ergebnisse als neue Baseline speichern
+    python benchmarks/micro.py --threshold 0.5 # erst ab +50 % als Regression werten
+
+Verglichen wird die schnellste Ausfuehrung (min) je Benchmark, nach einer
+ungemessenen Aufwaermrunde und ohne zyklische Speicherbereinigung waehrend
+der gemessenen Aufrufe. Das Skript startet sich mit PYTHONHASHSEED=0 neu:
+zufaellige String-Hashes aendern Dict-Layouts und damit die Laufzeiten von
+Prozess zu Prozess um bis zu 1,5x.
+
+Baselines gelten nur fuer die Maschine, auf der sie erzeugt wurden:
+baselines.json ist lokal (nicht im Repository) und wird mit --save angelegt.
+Passt der gespeicherte machine-Block nicht zur aktuellen Umgebung (Rechner,
+CPU-Anzahl, Python, JSON-Backend), wird nicht verglichen.
+
+Exit-Code 1 bei einer Regression ueber --threshold.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import json_codec
+from favorites_manager import Favorite, FavoritesManager
+from m3u_provider import _build_data, _parse_extinf, _parse_m3u
+from sort_index import SORT_ADDED, SORT_NAME_ASC, SORT_RATING, SortIndex
+from watch_history_manager import MAX_HISTORY_ENTRIES, WatchEntry, WatchHistoryManager
+from xtream_api import (
+    _decode, _decode_base64, _map_epg, _map_live_streams, _map_series, _map_vod_streams,
+)
+
+from fake_xtream import FakePanel, PanelConfig
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baselines.json"
+
+# Datensatz-Groessen: grosses, aber realistisches Panel
+LIVE_ITEMS = 20_000
+VOD_ITEMS = 20_000
+SERIES_ITEMS = 5_000
+EPG_CHANNELS = 20            # Voll-EPG (7 Tage Archiv, 30-Minuten-Raster) je Sender
+FAVORITES = 500
+SEARCH_QUERIES = ("kanal 12", "film 9", "serie 4", "hd", "gibt es nicht")
+
+# Messdauer je Benchmark (mindestens MIN_RUNS Ausfuehrungen nach WARMUP_RUNS ungemessenen)
+MIN_TIME_S = 0.3
+MIN_RUNS = 10
+WARMUP_RUNS = 1
+# Feste String-Hashes fuer vergleichbare Laeufe (siehe Modul-Docstring)
+HASH_SEED = "0"
+
+# name -> setup(); setup liefert (fn, prepare) - prepare() laeuft ungemessen vor jedem fn()
+BENCHMARKS: dict[str, Callable[[], tuple[Callable, Optional[Callable]]]] = {}
+
+
+def bench(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class Data:
+    """Gemeinsame Testdaten, einmal erzeugt"""
+    _instance = None
+
+    def __init__(self):
+        self.panel = FakePanel(PanelConfig(
+            live=LIVE_ITEMS, vod=VOD_ITEMS, series=SERIES_ITEMS, categories=200,
+            programme_minutes=30, epg_hours_back=7 * 24, epg_hours_ahead=24,
+        ), base_url="http://127.0.0.1:8089")
+        self.live_rows = self.panel.live_streams()
+        self.vod_rows = self.panel.vod_streams()
+        self.series_rows = self.panel.series()
+        self.live_body = json.dumps(self.live_rows).encode()
+        self.m3u_text = self.panel.m3u_playlist().decode()
+        self.epg = [self.panel.epg_listings(sid) for sid in range(1, EPG_CHANNELS + 1)]
+
+    @classmethod
+    def get(cls) -> "Data":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+
+# ── M3U ─────────────────────────────────────────────────────────────
+
+@bench("m3u.parse_extinf")
+def _m3u_parse_extinf():
+    lines = [line for line in Data.get().m3u_text.splitlines() if line.startswith("#EXTINF")]
+    return (lambda: [_parse_extinf(line) for line in lines]), None
+
+
+@bench("m3u.parse_m3u")
+def _m3u_parse_m3u():
+    text = Data.get().m3u_text
+    return (lambda: _parse_m3u(text)), None
+
+
+@bench("m3u.build_data")
+def _m3u_build_data():
+    streams = _parse_m3u(Data.get().m3u_text)
+    return (lambda: _build_data(streams)), None
+
+
+# ── XtreamAPI-Mapping ───────────────────────────────────────────────
+
+@bench("xtream.decode_live_streams")
+def _xtream_decode_live_streams():
+    body = Data.get().live_body
+    return (lambda: _decode(body, _map_live_streams)), None
+
+
+@bench("xtream.map_live_streams")
+def _xtream_map_live_streams():
+    rows = Data.get().live_rows
+    return (lambda: _map_live_streams(rows)), None
+
+
+@bench("xtream.map_vod_streams")
+def _xtream_map_vod_streams():
+    rows = Data.get().vod_rows
+    return (lambda: _map_vod_streams(rows)), None
+
+
+@bench("xtream.map_series")
+def _xtream_map_series():
+    rows = Data.get().series_rows
+    return (lambda: _map_series(rows)), None
+
+
+# ── EPG ─────────────────────────────────────────────────────────────
+
+@bench("epg.map_listings")
+def _epg_map_listings():
+    listings = Data.get().epg
+    return (lambda: [_map_epg(data) for data in listings]), None
+
+
+@bench("epg.decode_base64")
+def _epg_decode_base64():
+    values = [e[key] for data in Data.get().epg for e in data["epg_listings"]
+              for key in ("title", "description")]
+    return (lambda: [_decode_base64(v) for v in values]), None
+
+
+# ── Sortieren und Suche ─────────────────────────────────────────────
+
+@bench("sort.index_orders")
+def _sort_index_orders():
+    catalog = _map_vod_streams(Data.get().vod_rows)
+    state = {}
+
+    def prepare():
+        state["index"] = SortIndex(type(catalog).concat([catalog]))
+
+    def run():
+        index = state["index"]
+        return [index.order(mode) for mode in (SORT_ADDED, SORT_RATING, SORT_NAME_ASC)]
+    return run, prepare
+
+
+@bench("search.first_query")
+def _search_first_query():
+    data = Data.get()
+    catalogs = [_map_live_streams(data.live_rows), _map_vod_streams(data.vod_rows),
+                _map_series(data.series_rows)]
+    state = {}
+
+    def prepare():
+        # Frische Kataloge: Kleinschreibungs-Schluessel sind noch nicht gecacht
+        state["fresh"] = [type(c).concat([c]) for c in catalogs]
+    return (lambda: [c.search(SEARCH_QUERIES[0]) for c in state["fresh"]]), prepare
+
+
+@bench("search.queries_warm")
+def _search_queries_warm():
+    data = Data.get()
+    catalogs = [_map_live_streams(data.live_rows), _map_vod_streams(data.vod_rows),
+                _map_series(data.series_rows)]
+    for c in catalogs:
+        c.search("")
+    return (lambda: [c.search(q) for q in SEARCH_QUERIES for c in catalogs]), None
+
+
+# ── JSON-Manager ────────────────────────────────────────────────────
+
+# Wird beim Beenden automatisch entfernt
+_TMP_DIR = tempfile.TemporaryDirectory(prefix="iptv-micro-")
+
+
+def _tmp_file(name: str) -> Path:
+    return Path(tempfile.mkdtemp(dir=_TMP_DIR.name)) / name
+
+
+@bench("managers.favorites_load")
+def _managers_favorites_load():
+    path = _tmp_file("favorites.json")
+    manager = FavoritesManager(path)
+    manager.favorites = [
+        Favorite(id=i, name=f"Kanal {i} HD", type="live", icon=f"http://127.0.0.1/images/{i}.png",
+                 account_name="Benchmark")
+        for i in range(FAVORITES)
+    ]
+    manager._save()
+    return (lambda: FavoritesManager(path)), None
+
+
+@bench("managers.favorites_save")
+def _managers_favorites_save():
+    manager = FavoritesManager(_tmp_file("favorites.json"))
+    manager.favorites = [
+        Favorite(id=i, name=f"Kanal {i} HD", type="live", icon=f"http://127.0.0.1/images/{i}.png",
+                 account_name="Benchmark")
+        for i in range(FAVORITES)
+    ]
+    return manager._save, None
+
+
+def _history(path: Path) -> WatchHistoryManager:
+    manager = WatchHistoryManager(path)
+    manager.entries = [
+        WatchEntry(stream_id=i, stream_type="vod", account_name="Benchmark", title=f"Film {i}",
+                   icon=f"http://127.0.0.1/images/{i}.png", position=600.0, duration=6300.0,
+                   container_extension="mkv", watched_at="2026-01-01T20:00:00")
+        for i in range(MAX_HISTORY_ENTRIES)
+    ]
+    return manager
+
+
+@bench("managers.history_load")
+def _managers_history_load():
+    path = _tmp_file("watch_history.json")
+    _history(path)._save()
+    return (lambda: WatchHistoryManager(path)), None
+
+
+@bench("managers.history_add")
+def _managers_history_add():
+    manager = _history(_tmp_file("watch_history.json"))
+    entry = WatchEntry(stream_id=MAX_HISTORY_ENTRIES // 2, stream_type="vod",
+                       account_name="Benchmark", title="Film")
+    return (lambda: manager.add_or_update(entry)), None
+
+
+# ── Ablauf ──────────────────────────────────────────────────────────
+
+def run_benchmark(fn: Callable, prepare: Optional[Callable]) -> list[float]:
+    """Einzeln gemessene Ausfuehrungen in ms (mind. MIN_RUNS, mind. MIN_TIME_S).
+
+    Aufwaermrunde(n) fuellen Caches und Allokator, vor jedem Aufruf raeumt
+    gc.collect() auf, waehrend des Aufrufs ist die GC aus: sonst landet ein
+    zufaelliger Gen2-Lauf mal im einen, mal im anderen Benchmark.
+    """
+    for _ in range(WARMUP_RUNS):
+        if prepare is not None:
+            prepare()
+        fn()
+    times = []
+    total = 0.0
+    gc_was_enabled = gc.isenabled()
+    try:
+        while len(times) < MIN_RUNS or total < MIN_TIME_S:
+            if prepare is not None:
+                prepare()
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+            gc.enable()
+            times.append(elapsed * 1000)
+            total += elapsed
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        else:
+            gc.disable()
+    return times
+
+
+def machine_info() -> dict:
+    return {
+        "host": platform.node(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "json_backend": json_codec.backend(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", dest="filter", default="", help="nur Benchmarks mit diesem Namensteil")
+    parser.add_argument("--save", action="store_true", help="Ergebnisse als Baseline speichern")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="erlaubte Verlangsamung gegenueber der Baseline (0.25 = +25 %%)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    args = parser.parse_args()
+
+    if os.environ.get("PYTHONHASHSEED") != HASH_SEED:
+        env = {**os.environ, "PYTHONHASHSEED": HASH_SEED}
+        sys.exit(subprocess.call([sys.executable, __file__, *sys.argv[1:]], env=env))
+
+    baseline = {}
+    if args.baseline.exists():
+        stored = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if stored.get("machine") == machine_info():
+            baseline = stored.get("results", {})
+        elif not args.save:
+            print(f"Baseline von anderer Umgebung ({stored.get('machine')}), kein Vergleich; "
+                  "mit --save fuer diese Maschine neu anlegen")
+
+    print("Erzeuge Testdaten...", flush=True)
+    Data.get()
+    # Testdaten aus den gc.collect()-Laeufen vor jeder Messung herausnehmen
+    gc.collect()
+    gc.freeze()
+
+    results = {}
+    regressions = []
+    print(f"\n{'Benchmark':<30}{'min ms':>10}{'Median ms':>11}{'Baseline':>10}{'Faktor':>8}")
+    for name, setup in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        fn, prepare = setup()
+        times = run_benchmark(fn, prepare)
+        best, median = min(times), statistics.median(times)
+        results[name] = {"min_ms": round(best, 4), "median_ms": round(median, 4), "runs": len(times)}
+
+        line = f"{name:<30}{best:>10.2f}{median:>11.2f}"
+        base = baseline.get(name, {}).get("min_ms")
+        if base:
+            ratio = best / base
+            flag = ""
+            if ratio > 1 + args.threshold:
+                regressions.append((name, ratio))
+                flag = "  REGRESSION"
+            line += f"{base:>10.2f}{ratio:>7.2f}x{flag}"
+        print(line, flush=True)
+
+    if args.save:
+        merged = {**baseline, **results} if args.filter else results
+        args.baseline.write_text(json.dumps(
+            {"machine": machine_info(), "results": merged}, indent=2
+        ) + "\n", encoding="utf-8")
+        print(f"\nBaseline gespeichert: {args.baseline}")
+        return
+
+    if regressions:
+        print(f"\nFEHLER: {len(regressions)} Regression(en) ueber +{args.threshold:.0%}: "
+              + ", ".join(f"{name} ({ratio:.2f}x)" for name, ratio in regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
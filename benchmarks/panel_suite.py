@@ -0,0 +1,208 @@
+"""
+Lade-, Such- und EPG-Pfade gegen den lokalen Xtream-Stand-in, je Katalog-
+groesse (Standard 1k, 10k, 100k Eintraege pro Typ)
+
+Gemessen wird der Code der App (XtreamAPI, M3uProvider, Catalog.search,
+EpgStore), nicht die GUI. Der Stand-in wird vor jeder Groesse einmal
+aufgewaermt, damit dessen eigene Antwort-Erzeugung nicht mitgemessen wird.
+
+    python benchmarks/panel_suite.py
+    python benchmarks/panel_suite.py --sizes 1000,10000 --repeat 5 --latency-ms 40
+    python benchmarks/panel_suite.py --json /tmp/panel.json
+
+Ausgabe: Median und Minimum in ms je Messung und Groesse.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import compute_executor
+from epg_store import EpgStore
+from m3u_provider import M3uProvider
+from xtream_api import XtreamAPI, XtreamCredentials
+
+from fake_xtream import FakeXtreamServer, PanelConfig, USERNAME, PASSWORD
+
+SEARCH_QUERIES = ("kanal 12", "film 9", "serie 4", "hd", "gibt es nicht")
+# Kurz-EPG fuer 1 % der Sender (Refresher: Favoriten + Verlauf), mindestens 10
+SHORT_EPG_SHARE = 0.01
+FULL_EPG_CHANNELS = 10
+EPG_CONCURRENCY = 4  # wie EPG_GRID_CONCURRENCY
+
+
+class Suite:
+    def __init__(self, base_url: str, m3u_url: str, repeat: int):
+        self.base_url = base_url
+        self.m3u_url = m3u_url
+        self.repeat = repeat
+        self.results: dict[str, tuple[float, float]] = {}
+
+    def api(self) -> XtreamAPI:
+        """Frische Instanz je Messung: der Antwort-Cache der API soll nicht greifen"""
+        return XtreamAPI(XtreamCredentials(self.base_url, USERNAME, PASSWORD))
+
+    async def measure(self, name: str, fn: Callable[[], Awaitable]):
+        times = []
+        result = None
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            result = await fn()
+            times.append((time.perf_counter() - start) * 1000)
+        self.results[name] = (statistics.median(times), min(times))
+        return result
+
+    async def run(self):
+        # ── Laden ──
+        categories = await self.measure("load.live_categories", lambda: self.api().get_live_categories())
+        await self.measure(
+            "load.live_category", lambda: self.api().get_live_streams(categories[0].category_id)
+        )
+        live = await self.measure("load.live_all", lambda: self.api().get_live_streams())
+        vod = await self.measure("load.vod_all", lambda: self.api().get_vod_streams())
+        series = await self.measure("load.series_all", lambda: self.api().get_series())
+
+        async def load_m3u():
+            provider = M3uProvider("bench", self.m3u_url)
+            await provider.load()
+            return provider
+        await self.measure("load.m3u_playlist", load_m3u)
+
+        # ── Suche (wie SearchMixin: alle drei Kataloge) ──
+        catalogs = (live, vod, series)
+
+        async def search_cold():
+            # Erste Suche: Kleinschreibungs-Schluessel werden erst aufgebaut
+            fresh = [await self.api().get_live_streams(), await self.api().get_vod_streams(),
+                     await self.api().get_series()]
+            start = time.perf_counter()
+            hits = sum(len(c.search(SEARCH_QUERIES[0])) for c in fresh)
+            return hits, (time.perf_counter() - start) * 1000
+
+        cold = []
+        for _ in range(self.repeat):
+            cold.append((await search_cold())[1])
+        self.results["search.first_query"] = (statistics.median(cold), min(cold))
+
+        async def search_warm():
+            return sum(len(c.search(q)) for q in SEARCH_QUERIES for c in catalogs)
+        await search_warm()
+        await self.measure("search.5_queries", search_warm)
+
+        async def search_executor():
+            total = 0
+            for q in SEARCH_QUERIES:
+                for c in catalogs:
+                    hits = await compute_executor.run_compute(c.search, q, size=len(c),
+                                                              in_thread=True)
+                    total += len(hits)
+            return total
+        await self.measure("search.5_queries_executor", search_executor)
+
+        # ── EPG ──
+        stream_ids = [s.stream_id for s in live]
+        short_ids = stream_ids[:max(10, int(len(stream_ids) * SHORT_EPG_SHARE))]
+        full_ids = stream_ids[:FULL_EPG_CHANNELS]
+
+        async def short_epg():
+            api = self.api()
+            sem = asyncio.Semaphore(EPG_CONCURRENCY)
+
+            async def one(sid):
+                async with sem:
+                    return sid, await api.get_short_epg(sid, limit=4)
+            return await asyncio.gather(*(one(sid) for sid in short_ids))
+        short = await self.measure("epg.short_1pct_channels", short_epg)
+
+        async def full_epg():
+            api = self.api()
+            return [(sid, await api.get_full_epg(sid)) for sid in full_ids]
+        full = await self.measure("epg.full_10_channels", full_epg)
+
+        async def store():
+            epg = EpgStore()
+            for sid, entries in full + short:
+                epg.put(sid, entries)
+            now = time.time()
+            hits = 0
+            for _ in range(10):
+                for sid in short_ids:
+                    hits += len(epg.window(sid, now - 3600, now + 3 * 3600))
+            return hits
+        await self.measure("epg.store_put_window", store)
+
+
+def print_table(all_results: dict[int, dict[str, tuple[float, float]]]):
+    sizes = list(all_results)
+    names = list(dict.fromkeys(name for results in all_results.values() for name in results))
+    print(f"{'Messung':<28}" + "".join(f"{size:>20,}".replace(",", ".") for size in sizes))
+    print(f"{'':<28}" + "".join(f"{'Median / Min ms':>20}" for _ in sizes))
+    for name in names:
+        row = f"{name:<28}"
+        for size in sizes:
+            med, low = all_results[size].get(name, (float("nan"), float("nan")))
+            row += f"{f'{med:.1f} / {low:.1f}':>20}"
+        print(row)
+
+
+async def run_size(size: int, args) -> dict[str, tuple[float, float]]:
+    config = PanelConfig(live=size, vod=size, series=size, latency_ms=args.latency_ms,
+                         bandwidth_kbps=args.bandwidth_kbps)
+    server = FakeXtreamServer(config)
+    server.start()
+    try:
+        # Stand-in aufwaermen (kodierte Antworten + Playlist cachen)
+        api = XtreamAPI(XtreamCredentials(server.base_url, USERNAME, PASSWORD))
+        categories = await api.get_live_categories()
+        await api.get_live_streams(categories[0].category_id)
+        await api.get_live_streams()
+        await api.get_vod_streams()
+        await api.get_series()
+        await M3uProvider("warmup", server.m3u_url).load()
+
+        suite = Suite(server.base_url, server.m3u_url, args.repeat)
+        await suite.run()
+        return suite.results
+    finally:
+        server.stop()
+
+
+async def main_async(args):
+    all_results = {}
+    for size in args.sizes:
+        print(f"... {size} Eintraege", flush=True)
+        all_results[size] = await run_size(size, args)
+    compute_executor.get_executor().shutdown()
+    return all_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=lambda v: [int(x) for x in v.split(",")],
+                        default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--bandwidth-kbps", type=float, default=0.0)
+    parser.add_argument("--json", type=Path, help="Ergebnisse zusaetzlich als JSON schreiben")
+    args = parser.parse_args()
+
+    all_results = asyncio.run(main_async(args))
+    print()
+    print_table(all_results)
+    if args.json:
+        data = {
+            str(size): {name: {"median_ms": round(med, 3), "min_ms": round(low, 3)}
+                        for name, (med, low) in results.items()}
+            for size, results in all_results.items()
+        }
+        args.json.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
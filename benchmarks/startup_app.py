@@ -0,0 +1,151 @@
+"""
+Startzeit der App bis zur bedienbaren Senderliste (kalt/warm), headless
+
+Startet den lokalen Xtream-Stand-in, legt ein frisches Home-Verzeichnis mit
+einem Account an und startet `src/main.py` offscreen mit aktivierter
+Startmessung (startup_trace). Ausgewertet wird der Chrome-Trace jedes Laufs:
+Dauer jeder Phase und ihr Ende relativ zum Prozessstart.
+
+    python benchmarks/startup_app.py
+    python benchmarks/startup_app.py --runs 5 --live 20000 --max-ms 3000 --keep /tmp/traces
+
+Kalt = leere Config-/Cache-Verzeichnisse und kein Bytecode-Cache, warm = weitere
+Laeufe mit denselben Verzeichnissen. Die Traces lassen sich mit --keep
+aufheben und in chrome://tracing oder ui.perfetto.dev oeffnen.
+
+Exit-Code 1, wenn ein Lauf scheitert oder die bedienbare Senderliste
+(Ende von "first_items", Median warm) nach --max-ms liegt.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fake_xtream import FakeXtreamServer, PanelConfig, USERNAME, PASSWORD
+
+MAIN_PY = Path(__file__).resolve().parent.parent / "src" / "main.py"
+
+PHASES = (
+    "imports", "qapplication", "theme", "main_window", "build_ui", "account_load",
+    "first_categories", "first_items", "first_poster",
+)
+INTERACTIVE_PHASE = "first_items"
+
+
+def prepare_home(home: Path, base_url: str):
+    config_dir = home / ".config" / "iptv-app"
+    config_dir.mkdir(parents=True, exist_ok=True)
+    accounts = {
+        "accounts": [{
+            "name": "Benchmark", "type": "xtream", "server": base_url,
+            "username": USERNAME, "password": PASSWORD, "url": "",
+        }],
+        "selected_index": 0,
+    }
+    (config_dir / "accounts.json").write_text(json.dumps(accounts), encoding="utf-8")
+
+
+def run_app(home: Path, pycache: Path, trace_path: Path, timeout: float) -> dict[str, tuple[float, float]]:
+    """Ein Start; Phase -> (Dauer, Ende seit Prozessstart) in ms"""
+    env = dict(os.environ)
+    env.update({
+        "HOME": str(home),
+        "XDG_CACHE_HOME": str(home / ".cache"),
+        "PYTHONPYCACHEPREFIX": str(pycache),
+        "QT_QPA_PLATFORM": "offscreen",
+        "IPTV_STARTUP_TRACE": str(trace_path),
+        "IPTV_STARTUP_TRACE_EXIT": "1",
+        "IPTV_STARTUP_TRACE_TIMEOUT": str(timeout),
+    })
+    trace_path.unlink(missing_ok=True)
+    spawned = time.time()
+    try:
+        proc = subprocess.run(
+            [sys.executable, str(MAIN_PY)], env=env, cwd=MAIN_PY.parent,
+            capture_output=True, text=True, timeout=timeout + 15,
+        )
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"App hat sich nach {timeout + 15:.0f} s nicht beendet")
+    if not trace_path.exists():
+        tail = "\n".join(proc.stderr.strip().splitlines()[-8:])
+        raise RuntimeError(f"Kein Trace geschrieben (Exit-Code {proc.returncode}):\n{tail}")
+
+    trace = json.loads(trace_path.read_text(encoding="utf-8"))
+    offset_ms = (trace["otherData"]["t0_unix"] - spawned) * 1000
+    result = {"interpreter": (offset_ms, offset_ms)}
+    for event in trace["traceEvents"]:
+        if event.get("ph") != "X":
+            continue
+        dur = event["dur"] / 1000
+        result[event["name"]] = (dur, offset_ms + event["ts"] / 1000 + dur)
+    if trace["otherData"]["timed_out"]:
+        print(f"  Warnung: Zeitlimit erreicht, offen: {', '.join(trace['otherData']['unfinished'])}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="Anzahl warmer Laeufe")
+    parser.add_argument("--live", type=int, default=5000)
+    parser.add_argument("--vod", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--max-ms", type=float, default=5000.0,
+                        help="Grenze fuer das Ende von first_items (Median warm)")
+    parser.add_argument("--keep", type=Path, help="Traces in dieses Verzeichnis kopieren")
+    args = parser.parse_args()
+
+    server = FakeXtreamServer(PanelConfig(live=args.live, vod=args.vod, latency_ms=args.latency_ms))
+    base_url = server.start()
+    workdir = Path(tempfile.mkdtemp(prefix="iptv-startup-"))
+    home = workdir / "home"
+    prepare_home(home, base_url)
+    if args.keep:
+        args.keep.mkdir(parents=True, exist_ok=True)
+
+    runs = []
+    try:
+        for i in range(1 + args.runs):
+            label = "kalt" if i == 0 else f"warm {i}"
+            trace_path = workdir / f"trace_{i}.json"
+            try:
+                runs.append(run_app(home, workdir / "pycache", trace_path, args.timeout))
+            except RuntimeError as e:
+                print(f"Lauf '{label}' fehlgeschlagen: {e}")
+                sys.exit(1)
+            if args.keep:
+                shutil.copy(trace_path, args.keep / f"startup_{i}.json")
+            print(f"{label}: bedienbar nach {runs[-1].get(INTERACTIVE_PHASE, (0, float('nan')))[1]:.0f} ms")
+    finally:
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    cold, warm = runs[0], runs[1:]
+    print(f"\n{'Phase':<18}{'kalt Dauer':>12}{'kalt Ende':>12}{'warm Dauer':>12}{'warm Ende':>12}   (ms, warm = Median)")
+    for name in ("interpreter",) + PHASES:
+        if name not in cold:
+            print(f"{name:<18}{'-':>12}{'-':>12}{'-':>12}{'-':>12}")
+            continue
+        warm_vals = [r[name] for r in warm if name in r]
+        warm_dur = statistics.median(v[0] for v in warm_vals) if warm_vals else float("nan")
+        warm_end = statistics.median(v[1] for v in warm_vals) if warm_vals else float("nan")
+        print(f"{name:<18}{cold[name][0]:>12.1f}{cold[name][1]:>12.1f}{warm_dur:>12.1f}{warm_end:>12.1f}")
+
+    interactive = [r[INTERACTIVE_PHASE][1] for r in warm if INTERACTIVE_PHASE in r]
+    if not interactive:
+        print(f"\nFEHLER: '{INTERACTIVE_PHASE}' in keinem warmen Lauf erreicht")
+        sys.exit(1)
+    median = statistics.median(interactive)
+    if median > args.max_ms:
+        print(f"\nFEHLER: bedienbare Senderliste nach {median:.0f} ms > {args.max_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Import-Zeit beim Start (`python -X importtime -c "import main"`)
+
+Startet den Import mehrfach in frischen Prozessen, wertet die kumulierte Zeit
+von `main` aus (Median) und zeigt die teuersten Module. Zusaetzlich wird
+geprueft, dass die bewusst verzoegerten Module (Updater, TMDB, EPG-Dialoge,
+dbus) nicht im Startpfad landen.
+
+    python benchmarks/startup_importtime.py
+    python benchmarks/startup_importtime.py --runs 9 --max-ms 800 --top 20
+
+Exit-Code 1, wenn der Median ueber --max-ms liegt, ein verzoegertes Modul
+importiert wird oder der Import fehlschlaegt.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Werden erst bei Bedarf importiert und duerfen beim Start nicht auftauchen
+DEFERRED_MODULES = ("updater", "tmdb_service", "epg_dialog", "epg_grid", "dbus")
+
+
+def run_once() -> dict[str, tuple[int, int]]:
+    """Ein Import in einem frischen Prozess: Modul -> (eigene, kumulierte) Zeit in us"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=SRC_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-5:]
+        raise RuntimeError("Import von main fehlgeschlagen:\n" + "\n".join(tail))
+    modules: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Kopfzeile
+        name = parts[2].strip()
+        modules[name] = (int(parts[0]), int(parts[1]))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=1000.0,
+                        help="Grenze fuer den Median der kumulierten Import-Zeit")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    try:
+        runs = [run_once() for _ in range(args.runs)]
+    except RuntimeError as e:
+        print(e)
+        sys.exit(1)
+
+    totals = [run["main"][1] / 1000 for run in runs]
+    median = statistics.median(totals)
+    best = runs[totals.index(min(totals))]
+
+    print(f"main: Median {median:.1f} ms, min {min(totals):.1f} ms, "
+          f"max {max(totals):.1f} ms ({args.runs} Laeufe)")
+    print("\nTeuerste Module (eigene Zeit, schnellster Lauf):")
+    for name, (self_us, cum_us) in sorted(best.items(), key=lambda kv: -kv[1][0])[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {cum_us / 1000:8.1f} ms kum.  {name}")
+
+    failed = False
+    leaked = [m for m in DEFERRED_MODULES if m in best]
+    if leaked:
+        print(f"\nFEHLER: im Startpfad importiert: {', '.join(leaked)}")
+        failed = True
+    if median > args.max_ms:
+        print(f"\nFEHLER: Median {median:.1f} ms > {args.max_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ from PySide6.QtWidgets import QMessageBox
 from xtream_api import XtreamAPI, XtreamCredentials
 from m3u_provider import M3uProvider
 from account_manager import AccountEntry
+import startup_trace
+from task_scopes import SCOPE_ITEMS
 
 
 class AccountMixin:
@@ -38,28 +40,31 @@ class AccountMixin:
                 self.btn_history.setChecked(False)
                 self.category_row.setVisible(True)
                 self.sort_widget.setVisible(saved_mode in ("vod", "series"))
+                self.epg_grid_btn.setVisible(saved_mode == "live")
 
             if account.type == "m3u":
                 self.api = M3uProvider(account.name, account.url)
                 self.content_stack.setCurrentWidget(self.main_page)
-                asyncio.ensure_future(self._load_m3u_and_categories())
+                self.task_scopes.spawn(SCOPE_ITEMS, self._load_m3u_and_categories())
             else:
                 creds = XtreamCredentials(
                     server=account.server, username=account.username,
                     password=account.password, name=account.name,
                 )
-                self.api = XtreamAPI(creds)
+                self.api = XtreamAPI(creds, cache_ttl=self.app_settings.get("api_cache_ttl"))
                 self.content_stack.setCurrentWidget(self.main_page)
-                asyncio.ensure_future(self._load_categories())
+                self.task_scopes.spawn(SCOPE_ITEMS, self._load_categories())
             self._update_series_button_visibility()
         else:
-            self.content_stack.setCurrentWidget(self.settings_page)
+            self.content_stack.setCurrentWidget(self._ensure_settings_page())
+            startup_trace.finish()  # ohne Account gibt es nichts nachzuladen
 
     async def _load_m3u_and_categories(self):
         """Laedt M3U-Playlist und dann die Kategorien"""
         self._show_loading("Lade M3U-Playlist...")
         try:
-            await self.api.load()
+            with startup_trace.phase("m3u_playlist", "async"):
+                await self.api.load()
             await self._load_categories()
         except Exception as e:
             self._show_loading_error(str(e))
@@ -84,7 +89,9 @@ class AccountMixin:
         self.account_combo.setCurrentIndex(self.account_manager.selected_index)
         self.account_combo.blockSignals(False)
 
-        # Account-Liste in Einstellungen aktualisieren
+        # Account-Liste in Einstellungen aktualisieren (falls schon gebaut)
+        if self.settings_page is None:
+            return
         self.account_list.clear()
         for acc in self.account_manager.get_all():
             if acc.type == "m3u":
@@ -99,24 +106,29 @@ class AccountMixin:
             account = self.account_manager.get_selected()
             if account:
                 # Cache leeren
+                if isinstance(self.api, XtreamAPI):
+                    self.api.invalidate()
                 self.live_categories = []
                 self.vod_categories = []
                 self.series_categories = []
-                self._search_cache_loaded = False
+                self._reset_search_cache()
+                self._tmdb_enriched_categories.clear()
                 self._epg_cache = {}
+                self.epg_store.clear()
+                self.epg_refresher.reset()
                 self._initial_epg_loaded = False
 
                 self._show_loading("Lade Kategorien…")
                 if account.type == "m3u":
                     self.api = M3uProvider(account.name, account.url)
-                    asyncio.ensure_future(self._load_m3u_and_categories())
+                    self.task_scopes.spawn(SCOPE_ITEMS, self._load_m3u_and_categories())
                 else:
                     creds = XtreamCredentials(
                         server=account.server, username=account.username,
                         password=account.password, name=account.name,
                     )
-                    self.api = XtreamAPI(creds)
-                    asyncio.ensure_future(self._load_categories())
+                    self.api = XtreamAPI(creds, cache_ttl=self.app_settings.get("api_cache_ttl"))
+                    self.task_scopes.spawn(SCOPE_ITEMS, self._load_categories())
 
                 self._update_series_button_visibility()
 
@@ -125,9 +137,12 @@ class AccountMixin:
         self.app_settings.set("hwdec", value)
         self.lbl_hwdec_hint.show()
 
+    def _on_local_timeshift_changed(self, enabled: bool):
+        self.app_settings.set("local_timeshift_enabled", enabled)
+
     def _show_settings(self):
         self._update_account_combo()
-        self.content_stack.setCurrentWidget(self.settings_page)
+        self.content_stack.setCurrentWidget(self._ensure_settings_page())
         asyncio.ensure_future(self._refresh_line_info())
 
     async def _refresh_line_info(self):
@@ -276,8 +291,9 @@ class AccountMixin:
                 self.live_categories = []
                 self.vod_categories = []
                 self.series_categories = []
-                self._search_cache_loaded = False
-                asyncio.ensure_future(self._load_categories())
+                self._reset_search_cache()
+                self._tmdb_enriched_categories.clear()
+                self.task_scopes.spawn(SCOPE_ITEMS, self._load_categories())
         except Exception as e:
             QMessageBox.critical(self, "Fehler", f"Verbindung fehlgeschlagen:\n{e}")
             self._hide_loading("Verbindung fehlgeschlagen")
@@ -353,8 +369,14 @@ class AccountMixin:
             self._load_recordings()
             return
 
+        # API-Antwort-Cache verwerfen, sonst kaemen Kategorien/Streams/EPG unveraendert zurueck
+        if isinstance(self.api, XtreamAPI):
+            self.api.invalidate()
+        self._reset_search_cache()
+
         # EPG-Cache leeren → beim naechsten Kanalklick frisch laden
         self._epg_cache = {}
+        self.epg_store.clear()
         self._clear_epg_panel()
         self._initial_epg_loaded = False
 
@@ -366,4 +388,4 @@ class AccountMixin:
         else:
             self.series_categories = []
 
-        asyncio.ensure_future(self._load_categories())
+        self.task_scopes.spawn(SCOPE_ITEMS, self._load_categories())
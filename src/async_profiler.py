@@ -0,0 +1,200 @@
+"""
+Optionales Profiling der asyncio-Arbeit auf der qasync-Loop: Laufzeit und
+Loop-Blockierzeit je Operation, Warnung bei langen Schritten, Flamegraph-
+Profil beim Beenden
+
+Aktivieren ueber Umgebungsvariable oder Einstellung:
+    IPTV_ASYNC_PROFILE=<datei.folded>   Profil in diese Datei schreiben
+    settings.json "async_profile": true  Profil nach <Cache>/async_profile.folded
+    IPTV_ASYNC_PROFILE_SLOW_MS=<ms>      Schwelle fuer "langsamer Schritt" (Standard 50)
+
+Jede ueber ensure_future gestartete Coroutine wird per Task-Factory
+umhuellt und unter ihrem Namen (z.B. CategoriesMixin._load_items)
+gemessen; mit @operation markierte Coroutines auch dann, wenn sie nur
+awaited werden. Die .folded-Datei (ein Stack pro Zeile, Gewicht in us
+Blockierzeit) laesst sich mit flamegraph.pl, inferno oder speedscope
+anzeigen, daneben landet eine Zusammenfassung als .txt.
+"""
+import atexit
+import collections.abc
+import functools
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from platform_utils import get_cache_dir
+
+DEFAULT_SLOW_MS = 50.0
+
+
+class _OpStats:
+    __slots__ = ("calls", "wall", "wall_max", "blocking", "step_max", "slow_steps")
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.wall_max = 0.0
+        self.blocking = 0.0
+        self.step_max = 0.0
+        self.slow_steps = 0
+
+
+class _Profiler:
+    def __init__(self, path: Path, slow_s: float):
+        self.path = path
+        self.slow_s = slow_s
+        self.ops: dict[str, _OpStats] = {}
+        # "a;b;c" -> Eigenzeit (s) fuer das Flamegraph
+        self.folded: dict[str, float] = collections.defaultdict(float)
+        # Aktive Schritte: [Name, Zeit in Kind-Schritten, Kind schon als langsam gemeldet]
+        self.stack: list[list] = []
+
+    def stats(self, name: str) -> _OpStats:
+        stats = self.ops.get(name)
+        if stats is None:
+            stats = self.ops[name] = _OpStats()
+        return stats
+
+
+_profiler: Optional[_Profiler] = None
+
+
+class _Timed(collections.abc.Coroutine):
+    """Umhuellt eine Coroutine und misst jeden Schritt (send/throw) auf der Loop"""
+
+    def __init__(self, coro, name: str):
+        self._coro = coro
+        self.__name__ = self.__qualname__ = name
+        self._started = 0.0
+
+    def send(self, value):
+        return self._step(self._coro.send, value)
+
+    def throw(self, *args):
+        return self._step(self._coro.throw, *args)
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.send(None)
+
+    def _step(self, method, *args):
+        prof = _profiler
+        if prof is None:
+            return method(*args)
+        name = self.__name__
+        if not self._started:
+            self._started = time.perf_counter()
+        frame = [name, 0.0, False]
+        prof.stack.append(frame)
+        start = time.perf_counter()
+        done = True
+        try:
+            result = method(*args)
+            done = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            prof.stack.pop()
+            stats = prof.stats(name)
+            stats.blocking += elapsed
+            stats.step_max = max(stats.step_max, elapsed)
+            path = ";".join(f[0] for f in prof.stack) + (";" if prof.stack else "") + name
+            prof.folded[path] += elapsed - frame[1]
+            flagged = frame[2]
+            if elapsed >= prof.slow_s and not flagged:
+                # Dem innersten Schritt zuordnen, der die Schwelle allein reisst
+                stats.slow_steps += 1
+                flagged = True
+                print(f"[async-profile] langsamer Schritt: {elapsed * 1000:.1f} ms in {path}",
+                      file=sys.stderr)
+            if prof.stack:
+                parent = prof.stack[-1]
+                parent[1] += elapsed
+                parent[2] = parent[2] or flagged
+            if done:
+                wall = time.perf_counter() - self._started
+                stats.calls += 1
+                stats.wall += wall
+                stats.wall_max = max(stats.wall_max, wall)
+
+
+def _coro_name(coro) -> str:
+    return getattr(coro, "__qualname__", None) or type(coro).__name__
+
+
+def _task_factory(loop, coro, **kwargs):
+    import asyncio
+    if _profiler is not None and not isinstance(coro, _Timed):
+        coro = _Timed(coro, _coro_name(coro))
+    return asyncio.Task(coro, loop=loop, **kwargs)
+
+
+def operation(fn):
+    """Markiert eine Coroutine-Funktion als eigene Operation (auch wenn sie nur awaited wird)"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        coro = fn(*args, **kwargs)
+        if _profiler is None:
+            return coro
+        return _Timed(coro, fn.__qualname__)
+    return wrapper
+
+
+def enabled() -> bool:
+    return _profiler is not None
+
+
+def install(loop, enable_setting: bool = False) -> bool:
+    """Aktiviert das Profiling fuer `loop`, falls per Umgebung oder Einstellung gewuenscht"""
+    global _profiler
+    env_path = os.environ.get("IPTV_ASYNC_PROFILE", "")
+    if _profiler is not None or not (env_path or enable_setting):
+        return _profiler is not None
+    path = Path(env_path) if env_path else get_cache_dir() / "async_profile.folded"
+    slow_ms = float(os.environ.get("IPTV_ASYNC_PROFILE_SLOW_MS", DEFAULT_SLOW_MS))
+    _profiler = _Profiler(path, slow_ms / 1000)
+    loop.set_task_factory(_task_factory)
+    atexit.register(dump)
+    return True
+
+
+def summary() -> str:
+    if _profiler is None:
+        return ""
+    lines = [
+        f"{'Operation':<52}{'Aufrufe':>8}{'Wall ms':>11}{'max':>9}"
+        f"{'Block ms':>11}{'max Schritt':>12}{'langsam':>9}"
+    ]
+    ops = sorted(_profiler.ops.items(), key=lambda kv: -kv[1].blocking)
+    for name, s in ops:
+        lines.append(
+            f"{name[-52:]:<52}{s.calls:>8}{s.wall * 1000:>11.1f}{s.wall_max * 1000:>9.1f}"
+            f"{s.blocking * 1000:>11.1f}{s.step_max * 1000:>12.1f}{s.slow_steps:>9}"
+        )
+    return "\n".join(lines)
+
+
+def dump():
+    """Profil (.folded) und Zusammenfassung (.txt) schreiben; mehrfacher Aufruf ueberschreibt"""
+    if _profiler is None:
+        return
+    try:
+        _profiler.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(_profiler.path, "w", encoding="utf-8") as f:
+            for path, seconds in sorted(_profiler.folded.items()):
+                micros = int(seconds * 1e6)
+                if micros > 0:
+                    f.write(f"{path} {micros}\n")
+        _profiler.path.with_suffix(".txt").write_text(summary() + "\n", encoding="utf-8")
+    except OSError:
+        pass
@@ -0,0 +1,140 @@
+"""
+Spaltenbasierter Katalog fuer grosse Stream-Listen (Live, VOD, Serien)
+
+Statt einer Liste von Dataclass-Objekten haelt ein Catalog pro Feld eine Spalte:
+Zahlen in array.array, Texte in Listen (wiederkehrende Werte wie Kategorie-IDs
+oder Dateiendungen interniert). Zeilen werden erst beim Zugriff als
+slots-Dataclass erzeugt, die Mixins sehen weiterhin LiveStream/VodStream/Series.
+"""
+import sys
+from array import array
+from operator import itemgetter
+from collections.abc import Sequence
+from typing import Callable, Iterable, Optional
+
+
+class Catalog(Sequence):
+    """Liste von Zeilen gleichen Typs, spaltenweise gespeichert.
+
+    Unterklassen setzen `row_type` (Dataclass), `fields` (Reihenfolge der
+    Konstruktor-Argumente), `numeric` (Feld -> array-Typecode) und `interned`
+    (Textfelder mit vielen Wiederholungen).
+    """
+
+    row_type: type = None
+    fields: tuple[str, ...] = ()
+    numeric: dict[str, str] = {}
+    interned: frozenset[str] = frozenset()
+
+    def __init__(self, columns: Optional[dict] = None, rows: Optional[array] = None,
+                 key_cache: Optional[dict] = None):
+        if columns is None:
+            columns = {f: self._empty_column(f) for f in self.fields}
+        self._columns = columns
+        self._order = [columns[f] for f in self.fields]
+        # Auswahl/Reihenfolge als Zeilennummern in die (geteilten) Spalten; None = alle
+        self._rows = rows
+        # (Feld, key-Funktion) -> Sortierschluessel aller Zeilen, geteilt mit take()-Ergebnissen
+        self._key_cache: dict = {} if key_cache is None else key_cache
+
+    @classmethod
+    def _empty_column(cls, field: str):
+        code = cls.numeric.get(field)
+        return array(code) if code else []
+
+    @classmethod
+    def from_columns(cls, **columns) -> "Catalog":
+        """Baut einen Katalog aus fertigen Spalten (fehlende Felder: Dataclass-Default)."""
+        length = len(next(iter(columns.values()))) if columns else 0
+        built = {}
+        for field in cls.fields:
+            values = columns.get(field)
+            if values is None:
+                default = cls.row_type.__dataclass_fields__[field].default
+                values = [default] * length
+            elif field in cls.interned:
+                intern = sys.intern
+                values = [intern(v) for v in values]
+            code = cls.numeric.get(field)
+            built[field] = array(code, values) if code else list(values)
+        return cls(built)
+
+    @classmethod
+    def concat(cls, catalogs: Iterable["Catalog"]) -> "Catalog":
+        result = cls()
+        for cat in catalogs:
+            for field in cls.fields:
+                result._columns[field].extend(cat.column(field))
+        return result
+
+    def append(self, *values):
+        """Zeile anhaengen (Werte in Reihenfolge von `fields`, nur ohne Auswahl)."""
+        if self._rows is not None:
+            raise TypeError("append() auf einer Auswahl eines Katalogs")
+        for field, column, value in zip(self.fields, self._order, values):
+            if field in self.interned:
+                value = sys.intern(value)
+            column.append(value)
+        self._key_cache.clear()
+
+    def __len__(self) -> int:
+        if self._rows is not None:
+            return len(self._rows)
+        return len(self._order[0]) if self._order else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(len(self))))
+        if self._rows is not None:
+            index = self._rows[index]
+        return self.row_type(*[column[index] for column in self._order])
+
+    def __iter__(self):
+        row_type = self.row_type
+        if self._rows is None:
+            columns = self._order
+        else:
+            columns = [_gather(column, self._rows) for column in self._order]
+        for values in zip(*columns):
+            yield row_type(*values)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {len(self)} Eintraege>"
+
+    def column(self, field: str) -> Sequence:
+        """Werte einer Spalte in Katalog-Reihenfolge (nicht veraendern)."""
+        column = self._columns[field]
+        return column if self._rows is None else _gather(column, self._rows)
+
+    def take(self, indices: Iterable[int]) -> "Catalog":
+        """Auswahl der Zeilen `indices` in dieser Reihenfolge.
+
+        Kopiert keine Spalten: das Ergebnis teilt Spalten und Schluessel-Cache
+        und merkt sich nur die Zeilennummern.
+        """
+        indices = list(indices)
+        rows = indices if self._rows is None else _gather(self._rows, indices)
+        return type(self)(self._columns, array("q", rows), self._key_cache)
+
+    def sort_keys(self, field: str, key: Optional[Callable] = None) -> Sequence:
+        """Sortierschluessel einer Spalte; mit key-Funktion einmalig berechnet und gecacht."""
+        if key is None:
+            return self.column(field)
+        cache_key = (field, key)
+        keys = self._key_cache.get(cache_key)
+        if keys is None:
+            keys = list(map(key, self._columns[field]))
+            self._key_cache[cache_key] = keys
+        return keys if self._rows is None else _gather(keys, self._rows)
+
+    def search(self, query_lower: str) -> "Catalog":
+        """Zeilen, deren Name `query_lower` enthaelt (Kleinschreibung wird gecacht)."""
+        names = self.sort_keys("name", str.lower)
+        return self.take([i for i, name in enumerate(names) if query_lower in name])
+
+
+def _gather(source: Sequence, indices: Sequence[int]) -> list:
+    """source[i] fuer alle i in indices (itemgetter: Schleife in C)."""
+    if len(indices) > 1:
+        return list(itemgetter(*indices)(source))
+    return [source[i] for i in indices]
@@ -9,11 +9,29 @@ from PySide6.QtWidgets import (
     QScroller, QDialog, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QScrollArea, QWidget, QCheckBox
 )
-from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QIcon, QPixmap, QPainter, QFont, QFontMetrics, QColor
+from PySide6.QtCore import Qt, QSize, QTimer
+from PySide6.QtGui import QIcon, QPixmap
 
 from xtream_api import LiveStream, VodStream, Series
 from favorites_manager import Favorite
+from compute_executor import run_compute
+from vod_detail_mixin import VOD_COVER_SIZE
+from series_detail_mixin import SERIES_COVER_SIZE
+from image_source_cache import decode_scaled
+from sort_index import SortIndex, SORT_RATING, compute_order
+import startup_trace
+from async_profiler import operation
+from task_scopes import SCOPE_ITEMS, SCOPE_POSTERS, SCOPE_EPG, SCOPE_SEARCH, SCOPE_DETAIL
+
+# Anzahl Nachbarn links/rechts der Auswahl, deren Details vorgeladen werden
+DETAIL_PREFETCH_RADIUS = 4
+
+# VOD/Serien-Grid: so viele Eintraege werden pro Seite eingefuegt; weitere
+# Seiten folgen beim Scrollen
+ITEMS_PAGE_SIZE = 240
+
+# Sortier-Indizes der zuletzt geoeffneten Kategorien, die behalten werden
+SORT_INDEX_CACHE_SIZE = 8
 
 
 class CategoriesMixin:
@@ -40,6 +58,7 @@ class CategoriesMixin:
 
         # Kategorie nur bei Live/VOD/Serien anzeigen
         self.category_row.setVisible(mode in ("live", "vod", "series"))
+        self.epg_grid_btn.setVisible(mode == "live")
         if mode not in ("live", "vod", "series"):
             self.category_list.hide()
 
@@ -51,8 +70,10 @@ class CategoriesMixin:
         # Sortierung nur bei VOD/Serien anzeigen
         self.sort_widget.setVisible(mode in ("vod", "series"))
 
-        # Detail-Ansichten zuruecksetzen
+        # Detail-Ansichten zuruecksetzen, Ladevorgaenge des alten Modus abbrechen
         self.channel_stack.setCurrentIndex(0)
+        if self.task_scopes.cancel(SCOPE_ITEMS, SCOPE_POSTERS, SCOPE_SEARCH, SCOPE_DETAIL):
+            self._hide_loading()
 
         # Player-Layout anpassen wenn Player laeuft
         if self.player_area.isVisible() and not self._player_maximized:
@@ -108,8 +129,9 @@ class CategoriesMixin:
             self.epg_panel.hide()
             self._loading_text.setText("Lade...")
             self.channel_loading.show()
-            asyncio.ensure_future(self._load_categories())
+            self.task_scopes.spawn(SCOPE_ITEMS, self._load_categories())
 
+    @operation
     async def _load_categories(self):
         if not self.api:
             return
@@ -120,6 +142,7 @@ class CategoriesMixin:
             self._epg_splitter.show()
 
         self._show_loading("Lade Kategorien...")
+        startup_trace.begin("first_categories", "async")
 
         try:
             if self.current_mode == "live":
@@ -145,6 +168,7 @@ class CategoriesMixin:
             ]
 
             self._category_items = [(cat.category_name, cat.category_id) for cat in visible_cats]
+            startup_trace.end("first_categories", count=len(visible_cats))
 
             # Session-Restore: letzte Kategorie wiederfinden
             session = self.session_manager.get(account_name, self.current_mode)
@@ -169,7 +193,8 @@ class CategoriesMixin:
             if visible_cats:
                 target_cat = visible_cats[target_cat_idx]
                 self.category_btn.setText(f"{target_cat.category_name}  \u25BE")
-                await self._load_items(target_cat.category_id)
+                with startup_trace.phase("first_items", "async"):
+                    await self._load_items(target_cat.category_id)
                 if session:
                     self._restore_session_item(session)
             else:
@@ -179,26 +204,6 @@ class CategoriesMixin:
         except Exception as e:
             self._show_loading_error(str(e))
 
-    def _sort_items(self, items):
-        """Sortiert VOD/Serien-Items nach aktueller Sortierauswahl"""
-        sort_index = self.sort_combo.currentIndex()
-        if sort_index == 0:  # Standard
-            return items
-        elif sort_index == 1:  # Zuletzt hinzugefuegt
-            return sorted(items, key=lambda x: x.added or "", reverse=True)
-        elif sort_index == 2:  # Bewertung (beste zuerst)
-            def rating_key(x):
-                try:
-                    return float(x.rating) if x.rating else 0.0
-                except ValueError:
-                    return 0.0
-            return sorted(items, key=rating_key, reverse=True)
-        elif sort_index == 3:  # A - Z
-            return sorted(items, key=lambda x: x.name.lower())
-        elif sort_index == 4:  # Z - A
-            return sorted(items, key=lambda x: x.name.lower(), reverse=True)
-        return items
-
     def _on_sort_changed(self):
         """Sortierung geaendert - Kategorie neu laden"""
         self.app_settings.set("vod_sort_index", self.sort_combo.currentIndex())
@@ -207,7 +212,11 @@ class CategoriesMixin:
         if self._current_category_index < 0:
             return
         _, cat_id = self._category_items[self._current_category_index]
-        asyncio.ensure_future(self._load_items(cat_id))
+        if self._items_sort_index is not None and self._items_category_id == cat_id:
+            # Kategorie ist geladen: nur neu sortieren, kein erneuter Abruf
+            self.task_scopes.spawn(SCOPE_ITEMS, self._show_sorted_items())
+        else:
+            self.task_scopes.spawn(SCOPE_ITEMS, self._load_items(cat_id))
 
     def _toggle_category_list(self):
         """Klappt die Kategorie-Liste auf/zu"""
@@ -238,7 +247,7 @@ class CategoriesMixin:
         self._current_category_index = index
         name, cat_id = self._category_items[index]
         self._close_category_list()
-        asyncio.ensure_future(self._load_items(cat_id))
+        self.task_scopes.spawn(SCOPE_ITEMS, self._load_items(cat_id))
 
     def _on_category_context_menu(self, pos):
         """Kontextmenue fuer Kategorie-Liste (Ausblenden)"""
@@ -294,7 +303,7 @@ class CategoriesMixin:
                     any_hidden = True
             dialog.accept()
             if any_hidden:
-                asyncio.ensure_future(self._load_categories())
+                self.task_scopes.spawn(SCOPE_ITEMS, self._load_categories())
 
         hide_btn.clicked.connect(do_hide)
         cancel_btn.clicked.connect(dialog.reject)
@@ -347,12 +356,12 @@ class CategoriesMixin:
                 if cb.isChecked():
                     self.hidden_categories_manager.unhide(account.name, self.current_mode, cat_id)
             dialog.accept()
-            asyncio.ensure_future(self._load_categories())
+            self.task_scopes.spawn(SCOPE_ITEMS, self._load_categories())
 
         def unhide_all():
             self.hidden_categories_manager.unhide_all(account.name, self.current_mode)
             dialog.accept()
-            asyncio.ensure_future(self._load_categories())
+            self.task_scopes.spawn(SCOPE_ITEMS, self._load_categories())
 
         unhide_selected_btn.clicked.connect(unhide_selected)
         unhide_all_btn.clicked.connect(unhide_all)
@@ -372,6 +381,16 @@ class CategoriesMixin:
             (mode == "series" and getattr(self, "_current_series", None) is not None)
         )
 
+        if mode in ("vod", "series") and self._items_view is not None:
+            # Eintrag liegt evtl. noch nicht eingefuegten Seiten: bis dahin nachladen
+            field, key = ("stream_id", "stream_id") if mode == "vod" else ("series_id", "series_id")
+            try:
+                index = list(self._items_view.column(field)).index(session.get(key))
+            except ValueError:
+                index = -1
+            while 0 <= index and self._items_shown <= index:
+                self._append_item_page()
+
         for i in range(self.channel_list.count()):
             item = self.channel_list.item(i)
             data = item.data(Qt.UserRole)
@@ -391,70 +410,18 @@ class CategoriesMixin:
                     self._on_channel_selected(item)
                 break
 
-    def _get_item_rating(self, data) -> str:
-        """Extrahiert die anzuzeigende Bewertung aus einem VOD/Serien-Item"""
-        if not isinstance(data, (VodStream, Series)):
-            return ""
-        rating_str = data.rating
-        if rating_str and rating_str not in ("0", "0.0", ""):
-            try:
-                val = float(rating_str)
-                if val > 0:
-                    return f"{val:.1f}"
-            except (ValueError, TypeError):
-                pass
-        return ""
-
-    def _draw_rating_badge(self, pixmap: QPixmap, rating: str) -> QPixmap:
-        """Zeichnet einen kleinen farbigen Rating-Badge auf das Poster"""
-        result = QPixmap(pixmap)
-        painter = QPainter(result)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        font = QFont()
-        font.setPointSize(max(7, min(10, result.height() // 22)))
-        font.setBold(True)
-        painter.setFont(font)
-
-        fm = QFontMetrics(font)
-        text = f"\u2605 {rating}"
-        text_w = fm.horizontalAdvance(text)
-        text_h = fm.height()
-        padding = 3
-        badge_w = text_w + padding * 2
-        badge_h = text_h + padding * 2
-
-        # Farbe je nach Bewertung
-        try:
-            val = float(rating)
-            if val >= 7.0:
-                color = QColor(46, 160, 67)   # Grün
-            elif val >= 5.0:
-                color = QColor(200, 140, 20)  # Orange
-            else:
-                color = QColor(200, 50, 50)   # Rot
-        except Exception:
-            color = QColor(80, 80, 80)
-
-        # Badge zeichnen
-        painter.setOpacity(0.85)
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(color)
-        painter.drawRoundedRect(4, 4, badge_w, badge_h, 3, 3)
-
-        painter.setOpacity(1.0)
-        painter.setPen(QColor(255, 255, 255))
-        painter.drawText(4 + padding, 4 + padding + fm.ascent(), text)
-
-        painter.end()
-        return result
-
+    @operation
     async def _load_items(self, category_id: str):
         if not self.api:
             return
 
         self._show_loading("Lade Inhalte...")
+        # Poster der alten Liste duerfen nicht in die neuen Zeilen geschrieben werden
+        self.task_scopes.cancel(SCOPE_POSTERS)
         self.channel_list.clear()
+        self._items_view = None
+        self._items_sort_index = None
+        self._items_category_id = None
 
         # View-Modus je nach Kategorie umschalten
         is_grid = self.current_mode in ("vod", "series")
@@ -491,31 +458,17 @@ class CategoriesMixin:
                     list_item.setData(Qt.UserRole, item)
                     self.channel_list.addItem(list_item)
 
-            elif self.current_mode == "vod":
-                items = await self.api.get_vod_streams(category_id)
-                items = self._sort_items(items)
-                cell_size = self.channel_list.gridSize()
-                for item in items:
-                    list_item = QListWidgetItem(item.name)
-                    list_item.setData(Qt.UserRole, item)
-                    if cell_size.isValid():
-                        list_item.setSizeHint(cell_size)
-                    if item.rating and item.rating not in ("0", ""):
-                        list_item.setToolTip(f"Bewertung: {item.rating}")
-                    self.channel_list.addItem(list_item)
-
-            else:  # series
-                items = await self.api.get_series(category_id)
-                items = self._sort_items(items)
-                cell_size = self.channel_list.gridSize()
-                for item in items:
-                    list_item = QListWidgetItem(item.name)
-                    list_item.setData(Qt.UserRole, item)
-                    if cell_size.isValid():
-                        list_item.setSizeHint(cell_size)
-                    if item.rating and item.rating not in ("0", ""):
-                        list_item.setToolTip(f"Bewertung: {item.rating}")
-                    self.channel_list.addItem(list_item)
+            else:  # vod / series: Katalog merken, sortiert seitenweise anzeigen
+                if self.current_mode == "vod":
+                    items = await self.api.get_vod_streams(category_id)
+                    if self.tmdb_service.available:
+                        self._start_tmdb_enrichment(category_id, items)
+                else:
+                    items = await self.api.get_series(category_id)
+                self._items_sort_index = self._sort_index_for(category_id, items)
+                self._items_category_id = category_id
+                await self._show_sorted_items()
+                return
 
             self._hide_loading(f"{self.channel_list.count()} Eintraege geladen")
             self._update_current_list_item_display()
@@ -532,23 +485,100 @@ class CategoriesMixin:
                         self._current_epg_stream_id = data.stream_id
                         self._current_epg_has_catchup = getattr(data, 'tv_archive', False)
                         self.epg_channel_name.setText(data.name)
-                        asyncio.ensure_future(self._load_epg(data.stream_id))
+                        self.task_scopes.spawn(SCOPE_EPG, self._load_epg(data.stream_id))
 
             # Poster/Logos laden
-            asyncio.ensure_future(self._load_item_posters())
+            self.task_scopes.spawn(SCOPE_POSTERS, self._load_item_posters())
 
         except Exception as e:
             self._show_loading_error(str(e))
 
-    async def _load_item_posters(self):
-        """Laedt Poster/Cover/Logos"""
-        self._poster_load_generation += 1
+    def _sort_index_for(self, category_id: str, items) -> SortIndex:
+        """SortIndex der Kategorie wiederverwenden, solange der Katalog derselbe ist
+        (API-Cache), sonst neu anlegen"""
+        key = (self.current_mode, category_id)
+        index = self._sort_indexes.pop(key, None)
+        if index is None or index.catalog is not items:
+            index = SortIndex(items)
+        self._sort_indexes[key] = index
+        while len(self._sort_indexes) > SORT_INDEX_CACHE_SIZE:
+            self._sort_indexes.popitem(last=False)
+        return index
+
+    async def _show_sorted_items(self):
+        """Ordnet den geladenen Katalog nach Sortierauswahl und zeigt die erste Seite sofort an.
+
+        Schluessel und Reihenfolgen rechnet der SortIndex nur beim ersten Mal
+        (im Worker); danach ist ein Sortierwechsel reines Umordnen.
+        """
+        index = self._items_sort_index
+        if index is None:
+            return
+        mode = self.sort_combo.currentIndex()
+        if mode == SORT_RATING and self.current_mode == "vod" and self.tmdb_service.available:
+            index.set_scores(self.tmdb_service.cached_scores(index.catalog.column("tmdb")))
+        if not index.has_order(mode):
+            # Im Worker nur rechnen, den SortIndex aendert allein der GUI-Thread
+            args = index.order_args(mode)
+            order, keys = await run_compute(compute_order, *args, size=len(index), in_thread=True)
+            index.remember_order(mode, order, keys, args[3])
+        if index is not self._items_sort_index:
+            return  # inzwischen andere Kategorie geladen
+        view = index.view(mode)
+
+        self.channel_list.clear()
+        self._items_view = view
+        self._items_shown = 0
+        self._append_item_page()
+        self._hide_loading(f"{len(view)} Eintraege geladen")
+
+    def _append_item_page(self):
+        """Fuegt die naechste Seite des sortierten Katalogs in das Grid ein"""
+        view = self._items_view
+        start = self._items_shown
+        if view is None or start >= len(view):
+            return
+        end = min(start + ITEMS_PAGE_SIZE, len(view))
+        cell_size = self.channel_list.gridSize()
+        self.channel_list.setUpdatesEnabled(False)
+        for item in view[start:end]:
+            list_item = QListWidgetItem(item.name)
+            list_item.setData(Qt.UserRole, item)
+            if cell_size.isValid():
+                list_item.setSizeHint(cell_size)
+            if item.rating and item.rating not in ("0", ""):
+                list_item.setToolTip(f"Bewertung: {item.rating}")
+            self.channel_list.addItem(list_item)
+        self.channel_list.setUpdatesEnabled(True)
+        self._items_shown = end
+        self._update_current_list_item_display(start)
+        self.task_scopes.spawn(SCOPE_POSTERS, self._load_item_posters(start), replace=False)
+        # Fuellt die Seite den sichtbaren Bereich nicht, gleich nachlegen
+        QTimer.singleShot(0, lambda: self._on_channel_list_scrolled(
+            self.channel_list.verticalScrollBar().value()))
+
+    def _on_channel_list_scrolled(self, value: int):
+        """Nahe am Ende des Grids: naechste Seite einfuegen"""
+        if self._items_view is None or self.current_mode not in ("vod", "series"):
+            return
+        if self._items_shown >= len(self._items_view):
+            return
+        bar = self.channel_list.verticalScrollBar()
+        if value >= bar.maximum() - bar.pageStep():
+            self._append_item_page()
+
+    @operation
+    async def _load_item_posters(self, start: int = 0):
+        """Laedt Poster/Cover/Logos (ab Zeile `start`, z.B. fuer eine neue Seite)"""
+        if start == 0:
+            self._poster_load_generation += 1
         current_gen = self._poster_load_generation
         icon_size = self.channel_list.iconSize()
+        self._posters_rendered_w = icon_size.width()
         sem = asyncio.Semaphore(8)
 
         items_to_load = []
-        for i in range(self.channel_list.count()):
+        for i in range(start, self.channel_list.count()):
             item = self.channel_list.item(i)
             data = item.data(Qt.UserRole)
             url = ""
@@ -564,8 +594,10 @@ class CategoriesMixin:
                 items_to_load.append((i, url, data))
 
         if not items_to_load:
+            startup_trace.finish()
             return
 
+        startup_trace.begin("first_poster", "async")
         async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
             async def load_one(index, url, data):
                 async with sem:
@@ -573,17 +605,89 @@ class CategoriesMixin:
                         return
                     pixmap = await self._fetch_poster(session, url, icon_size.width(), icon_size.height())
                     if pixmap and self._poster_load_generation == current_gen:
-                        rating = self._get_item_rating(data)
-                        if rating:
-                            pixmap = self._draw_rating_badge(pixmap, rating)
+                        # Bewertungs-Badge zeichnet der PosterItemDelegate
                         item = self.channel_list.item(index)
                         if item:
                             item.setIcon(QIcon(pixmap))
+                            startup_trace.end("first_poster", row=index)
 
             await asyncio.gather(
                 *[load_one(i, url, data) for i, url, data in items_to_load],
                 return_exceptions=True
             )
+        startup_trace.finish()  # auch wenn kein Poster geladen werden konnte
+
+    # ── TMDB-Bewertungen einer Kategorie im Hintergrund ──────────────
+
+    def _start_tmdb_enrichment(self, category_id: str, items):
+        """Laedt fehlende TMDB-Bewertungen der Kategorie (einmal pro Kategorie)"""
+        if category_id in self._tmdb_enriched_categories:
+            return
+        if not self.app_settings.get("tmdb_enrich_categories", True):
+            return
+        self._tmdb_enriched_categories.add(category_id)
+        asyncio.ensure_future(self._enrich_category_ratings(category_id, list(items.column("tmdb"))))
+
+    async def _enrich_category_ratings(self, category_id: str, tmdb_ids: list):
+        def still_current():
+            return (self.current_mode == "vod" and self._current_category_index >= 0
+                    and self._category_items[self._current_category_index][1] == category_id)
+
+        loaded = await self.tmdb_service.enrich(tmdb_ids, should_continue=still_current)
+        if not still_current():
+            # Abgebrochen: beim naechsten Oeffnen der Kategorie fortsetzen
+            self._tmdb_enriched_categories.discard(category_id)
+        elif loaded and self.sort_combo.currentIndex() == 2 and self._items_category_id == category_id:
+            await self._show_sorted_items()
+
+    # ── Details der Nachbarn vorladen ────────────────────────────────
+
+    def _detail_cache_account(self) -> str:
+        account = self.account_manager.get_selected()
+        return account.name if account else ""
+
+    def _schedule_detail_prefetch(self, row: int):
+        """Auswahl im Grid geaendert: Vorladen kurz verzoegert starten (entprellt)"""
+        if row >= 0 and self.current_mode in ("vod", "series"):
+            self._detail_prefetch_timer.start()
+
+    def _prefetch_neighbour_details(self):
+        row = self.channel_list.currentRow()
+        if row < 0 or not self.api:
+            return
+        self._detail_prefetch_generation += 1
+        # Naechste Nachbarn zuerst: r+1, r-1, r+2, r-2, ...
+        rows = []
+        for distance in range(1, DETAIL_PREFETCH_RADIUS + 1):
+            rows.extend((row + distance, row - distance))
+        items = []
+        for r in [row] + rows:
+            item = self.channel_list.item(r) if 0 <= r < self.channel_list.count() else None
+            data = item.data(Qt.UserRole) if item else None
+            if isinstance(data, (VodStream, Series)):
+                items.append(data)
+        if items:
+            asyncio.ensure_future(self._prefetch_details(items, self._detail_prefetch_generation))
+
+    async def _prefetch_details(self, items: list, generation: int):
+        """Laedt Details und Detail-Cover nacheinander; bricht ab, wenn sich die Auswahl aendert"""
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
+            for data in items:
+                if generation != self._detail_prefetch_generation:
+                    return
+                try:
+                    if isinstance(data, VodStream):
+                        raw = await self._fetch_vod_info(data)
+                        url = self._vod_cover_url(data, raw.get("info", {}) or {})
+                        size = VOD_COVER_SIZE
+                    else:
+                        raw = await self._fetch_series_info(data)
+                        url = self._series_cover_url(data, raw.get("info", {}) or {})
+                        size = SERIES_COVER_SIZE
+                    if url and generation == self._detail_prefetch_generation:
+                        await self._fetch_poster(session, url, *size)
+                except Exception:
+                    pass
 
     def _update_grid_size(self):
         """Berechnet Grid-Größe dynamisch basierend auf verfügbarer Breite."""
@@ -608,7 +712,6 @@ class CategoriesMixin:
         poster_w = cell_w - 16
         poster_h = int(poster_w * 1.5)
         cell_h = poster_h + 48
-        old_icon_w = self.channel_list.iconSize().width()
         self.channel_list.setIconSize(QSize(poster_w, poster_h))
         self.channel_list.setGridSize(QSize(cell_w, cell_h))
         self.channel_list.setSpacing(0)
@@ -619,28 +722,46 @@ class CategoriesMixin:
             item = self.channel_list.item(i)
             if item:
                 item.setSizeHint(hint)
-        # Poster neu laden wenn sich Größe wesentlich geändert hat
-        if abs(old_icon_w - poster_w) > 20 and self.channel_list.count() > 0:
-            asyncio.ensure_future(self._load_item_posters())
+        # Poster neu skalieren wenn sich Größe wesentlich geändert hat –
+        # entprellt, damit fortlaufendes Ziehen am Fenster nur einmal skaliert
+        if abs(self._posters_rendered_w - poster_w) > 20 and self.channel_list.count() > 0:
+            self._poster_rescale_timer.start()
 
     async def _fetch_poster(self, session: aiohttp.ClientSession, url: str, w: int, h: int) -> QPixmap | None:
-        """Laedt ein Bild, skaliert und cached es"""
+        """Laedt ein Bild, skaliert und cached es.
+
+        Die Originaldaten bleiben im ImageSourceCache; andere Groessen (z.B.
+        nach Fenster-Resize) werden daraus lokal skaliert, ohne Netzwerk.
+        """
         cache_key = f"{url}_{w}x{h}"
         if cache_key in self._image_cache:
             return self._image_cache[cache_key]
+        if self._image_sources.failed(url):
+            return None
 
-        try:
-            async with session.get(url) as resp:
-                if resp.status == 200:
-                    data = await resp.read()
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(data)
-                    if not pixmap.isNull():
-                        scaled = pixmap.scaled(w, h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                        self._image_cache[cache_key] = scaled
-                        return scaled
-        except Exception:
-            pass
-
-        self._image_cache[cache_key] = None
-        return None
+        data = self._image_sources.get(url)
+        if data is None:
+            try:
+                async with session.get(url) as resp:
+                    if resp.status == 200:
+                        data = await resp.read()
+                    elif resp.status in (404, 410):
+                        self._image_sources.mark_failed(url, permanent=True)
+                        self._image_cache[cache_key] = None
+                        return None
+            except Exception:
+                pass
+            if data is None:
+                # Timeout, Serverfehler, Ratenlimit: spaeter erneut versuchen
+                self._image_sources.mark_failed(url)
+                return None
+
+        image = await asyncio.to_thread(decode_scaled, data, w, h) if data else None
+        if image is None:
+            self._image_sources.mark_failed(url, permanent=True)
+            self._image_cache[cache_key] = None
+            return None
+        self._image_sources.put(url, data)
+        scaled = QPixmap.fromImage(image)
+        self._image_cache[cache_key] = scaled
+        return scaled
@@ -0,0 +1,282 @@
+"""
+Rechenintensive Arbeit (Parsen, Katalog-Aufbau, Sortieren, Suche) aus der
+qasync-GUI-Loop auslagern: Thread- oder Prozess-Pool, Ergebnis kommt als await zurueck
+"""
+import asyncio
+import gc
+import os
+import pickle
+import sys
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Iterator, Optional
+
+# Unterhalb dieser Eingabegroesse (Eintraege/Bytes) lohnt sich das Auslagern nicht
+INLINE_BELOW = 2000
+# Text-Argumente ab dieser Laenge gehen ueber Shared Memory in den Prozess-Pool
+SHARE_TEXT_ABOVE = 1 << 20
+_SHARE_CHUNK = 1 << 20
+# Worker-Threads geben die GIL spaetestens nach dieser Zeit an die GUI-Loop ab
+# (Python-Standard 5 ms: pro Frame mehrere Uebergaben, Spitzen ueber 16 ms)
+GIL_SWITCH_INTERVAL_S = 0.002
+# Prioritaet der Prozess-Worker: auf wenigen Kernen bekommt die GUI Vorrang
+WORKER_NICE = 10
+
+
+class ComputeExecutor:
+    """Fuehrt CPU-lastige Funktionen in einem Pool aus.
+
+    kind="thread": geteilter Speicher, kein Pickling (Standard). Die GIL wird
+    alle GIL_SWITCH_INTERVAL_S an die GUI-Loop abgegeben, Frames bleiben fluessig;
+    lange C-Aufrufe am Stueck (splitlines, Freigabe grosser Listen, volle
+    GC-Laeufe) muessen die Worker-Funktionen selbst vermeiden (gc_paused).
+    kind="process": echte Parallelitaet; Funktionen und Argumente muessen
+    picklebar sein (Modul-Funktionen). Grosse Texte gehen ueber Shared Memory,
+    grosse Ergebnisse mit split/join in Teilen zurueck.
+    Arbeit auf grossen Objekten im Speicher (z.B. Suche in einem Katalog) laeuft
+    mit in_thread=True auch dann im Thread-Pool, statt jedes Mal den ganzen
+    Katalog zu pickeln.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: Optional[int] = None):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unbekannter Executor-Typ: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._pool: Optional[Executor] = None
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            if sys.getswitchinterval() > GIL_SWITCH_INTERVAL_S:
+                sys.setswitchinterval(GIL_SWITCH_INTERVAL_S)
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="compute"
+            )
+        return self._thread_pool
+
+    def _get_pool(self) -> Executor:
+        if self.kind == "thread":
+            return self._get_thread_pool()
+        if self._pool is None:
+            if os.name == "posix":
+                # Vor dem Fork starten, damit Worker denselben Resource-Tracker
+                # nutzen wie der Hauptprozess, der die Shared-Memory-Bloecke freigibt
+                resource_tracker.ensure_running()
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             initializer=_init_worker)
+        return self._pool
+
+    async def run(self, fn: Callable, *args, size: Optional[int] = None,
+                  in_thread: bool = False, split: Optional[Callable] = None,
+                  join: Optional[Callable] = None):
+        """Fuehrt fn(*args) im Pool aus. Mit size < INLINE_BELOW direkt in der Loop,
+        mit in_thread=True immer im Thread-Pool (kein Pickling der Argumente).
+
+        split/join (Modul-Funktionen) zerlegen ein grosses Ergebnis im
+        Prozess-Modus in Teile, die einzeln gepickelt und ausserhalb der Loop
+        wieder zusammengesetzt werden: ein einziges pickle.loads eines ganzen
+        Katalogs haelt die GIL sonst 200 ms und mehr am Stueck.
+        """
+        if size is not None and size < INLINE_BELOW:
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        if in_thread or self.kind == "thread":
+            return await loop.run_in_executor(self._get_thread_pool(), partial(fn, *args))
+        shared = await loop.run_in_executor(self._get_thread_pool(), _share_args, args)
+        try:
+            result = await loop.run_in_executor(
+                self._get_pool(), partial(_call_in_process, fn, shared, split)
+            )
+        finally:
+            for arg in shared:
+                if isinstance(arg, _SharedText):
+                    arg.release()
+        if split is None or join is None:
+            return result
+        return await loop.run_in_executor(self._get_thread_pool(), _load_joined, result, join)
+
+    def prestart(self):
+        """Prozess-Worker vorab starten: beim ersten Auftrag forkt der Pool alle
+        Worker auf einmal in der GUI-Loop (~15 ms bei grossem Speicherabbild)"""
+        if self.kind == "process":
+            self._get_pool().submit(int)
+
+    def shutdown(self):
+        if self._pool is not None:
+            # Auf die Verwaltungs-Threads des Prozess-Pools warten: mit wait=False
+            # schliessen sie ihre Pipes erst nach dem Interpreter-Ende
+            # ("OSError: [Errno 9] Bad file descriptor"). Offene Auftraege verwerfen.
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
+
+
+def _init_worker():
+    if hasattr(os, "nice"):
+        try:
+            os.nice(WORKER_NICE)
+        except OSError:
+            pass
+
+
+class _SharedParts:
+    """Bytes-Teile ueber Shared Memory zwischen Haupt- und Worker-Prozess.
+
+    Am Stueck gepickelt haelt eine 50-MB-Playlist die GIL ~70 ms, ebenso das
+    Empfangen eines grossen Ergebnisses. Hier wird in Teilen kopiert,
+    gepickelt werden nur Name und Teil-Laengen. Freigeben (release) muss
+    immer der Hauptprozess.
+    """
+
+    def __init__(self, parts: list[bytes]):
+        self.sizes = [len(p) for p in parts]
+        self._shm: Optional[shared_memory.SharedMemory] = shared_memory.SharedMemory(
+            create=True, size=max(1, sum(self.sizes))
+        )
+        self.name = self._shm.name
+        pos = 0
+        for part in parts:
+            self._shm.buf[pos:pos + len(part)] = part
+            pos += len(part)
+
+    def __getstate__(self):
+        return {"name": self.name, "sizes": self.sizes}
+
+    def __setstate__(self, state):
+        self.name = state["name"]
+        self.sizes = state["sizes"]
+        self._shm = None
+
+    def _attach(self) -> shared_memory.SharedMemory:
+        if self._shm is None:
+            self._shm = shared_memory.SharedMemory(name=self.name)
+        return self._shm
+
+    def parts(self) -> Iterator[bytes]:
+        buf = self._attach().buf
+        pos = 0
+        for size in self.sizes:
+            yield bytes(buf[pos:pos + size])
+            pos += size
+
+    def close(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def release(self):
+        shm = self._attach()
+        self._shm = None
+        shm.close()
+        shm.unlink()
+
+
+class _SharedText(_SharedParts):
+    """Grosser Text als Argument fuer den Prozess-Pool, im Thread-Pool in
+    1-MB-Schritten kodiert"""
+
+    def __init__(self, text: str):
+        super().__init__([text[i:i + _SHARE_CHUNK].encode("utf-8")
+                          for i in range(0, len(text), _SHARE_CHUNK)])
+
+    def text(self) -> str:
+        try:
+            return b"".join(self.parts()).decode("utf-8")
+        finally:
+            self.close()
+
+
+def _share_args(args: tuple) -> tuple:
+    return tuple(
+        _SharedText(arg) if isinstance(arg, str) and len(arg) > SHARE_TEXT_ABOVE else arg
+        for arg in args
+    )
+
+
+def _call_in_process(fn: Callable, args: tuple, split: Optional[Callable]):
+    """Prozess-Worker: geteilte Texte aufloesen; mit split das Ergebnis in
+    einzeln gepickelte Teile zerlegen"""
+    args = tuple(arg.text() if isinstance(arg, _SharedText) else arg for arg in args)
+    result = fn(*args)
+    if split is None:
+        return result
+    parts = split(result)
+    del result
+    # Teile nach dem Pickeln einzeln freigeben: den ganzen Katalog auf einmal
+    # abzubauen gibt viel Speicher am Stueck zurueck, was auf einem Kern auch
+    # die GUI-Loop kurz anhaelt
+    parts.reverse()
+    blobs = []
+    while parts:
+        blobs.append(pickle.dumps(parts.pop(), pickle.HIGHEST_PROTOCOL))
+    shared = _SharedParts(blobs)
+    shared.close()
+    return shared
+
+
+def _load_joined(shared: _SharedParts, join: Callable):
+    """Thread-Pool: Teile nacheinander entpickeln (GIL-Wechsel dazwischen moeglich)"""
+    try:
+        with gc_paused():
+            return join([pickle.loads(blob) for blob in shared.parts()])
+    finally:
+        shared.release()
+
+
+_default = ComputeExecutor()
+
+
+def get_executor() -> ComputeExecutor:
+    return _default
+
+
+def configure(kind: str):
+    """Setzt den Standard-Executor (z.B. aus AppSettings 'compute_executor')."""
+    global _default
+    if kind != _default.kind:
+        _default.shutdown()
+        _default = ComputeExecutor(kind)
+        _default.prestart()
+
+
+async def run_compute(fn: Callable, *args, size: Optional[int] = None,
+                      in_thread: bool = False, split: Optional[Callable] = None,
+                      join: Optional[Callable] = None):
+    """Kurzform: fn(*args) auf dem Standard-Executor ausfuehren."""
+    return await _default.run(fn, *args, size=size, in_thread=in_thread,
+                              split=split, join=join)
+
+
+_gc_lock = threading.Lock()
+_gc_depth = 0
+_gc_was_enabled = False
+
+
+@contextmanager
+def gc_paused():
+    """Zyklische Speicherbereinigung waehrend eines grossen Aufbaus aussetzen.
+
+    Beim Anlegen hunderttausender Objekte loest CPython wiederholt volle
+    Gen2-Laeufe aus, die die GIL am Stueck halten (60-150 ms) und damit auch
+    im Thread-Modus die GUI-Loop stocken lassen. Verschachtelt und aus
+    mehreren Worker-Threads nutzbar.
+    """
+    global _gc_depth, _gc_was_enabled
+    with _gc_lock:
+        if _gc_depth == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_depth += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_depth -= 1
+            if _gc_depth == 0 and _gc_was_enabled:
+                gc.enable()
@@ -0,0 +1,117 @@
+"""
+Cache fuer VOD-/Serien-Details (get_vod_info / get_series_info): LRU im Speicher
+plus JSON-Dateien auf der Platte mit Ablaufzeit, Schluessel: Account + Art + ID
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from platform_utils import get_cache_dir
+
+KIND_VOD = "vod"
+KIND_SERIES = "series"
+
+
+class DetailCache:
+    """Haelt Detail-Antworten der API, damit die Detailseite sofort oeffnet.
+
+    Eintraege im Speicher (max. `max_entries`, zuletzt benutzte bleiben) und
+    auf der Platte gelten `ttl` Sekunden. Gleichzeitige Abrufe derselben ID
+    (Oeffnen + Vorladen) teilen sich einen Request.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None,
+                 ttl: float = 24 * 3600, max_entries: int = 200):
+        if cache_dir is None:
+            cache_dir = get_cache_dir() / "details"
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._memory: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Task] = {}
+
+    def _path(self, key: tuple) -> Path:
+        digest = hashlib.sha1("|".join(map(str, key)).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def get_memory(self, account: str, kind: str, item_id) -> Optional[dict]:
+        """Eintrag aus dem Speicher (ohne Plattenzugriff) oder None."""
+        key = (account, kind, str(item_id))
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        stored, data = entry
+        if time.time() - stored > self.ttl:
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return data
+
+    async def fetch(self, account: str, kind: str, item_id,
+                    loader: Callable[[], Awaitable[dict]]) -> dict:
+        """Details aus Speicher, Platte oder ueber `loader()` (wird dann gespeichert)."""
+        data = self.get_memory(account, kind, item_id)
+        if data is not None:
+            return data
+        key = (account, kind, str(item_id))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _load(self, key: tuple, loader: Callable[[], Awaitable[dict]]) -> dict:
+        path = self._path(key)
+        entry = await asyncio.to_thread(self._read_file, path)
+        if entry is not None and time.time() - entry[0] <= self.ttl:
+            self._remember(key, *entry)
+            return entry[1]
+
+        data = await loader()
+        if data:
+            stored = time.time()
+            self._remember(key, stored, data)
+            asyncio.ensure_future(asyncio.to_thread(self._write_file, path, stored, data))
+        return data
+
+    def _remember(self, key: tuple, stored: float, data: dict):
+        self._memory[key] = (stored, data)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _read_file(path: Path) -> Optional[tuple[float, dict]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            return float(entry["stored"]), entry["data"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_file(self, path: Path, stored: float, data: dict):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"stored": stored, "data": data}, f, ensure_ascii=False)
+            tmp.replace(path)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def cleanup_expired(self):
+        """Abgelaufene Dateien loeschen (beim Start, blockierend)."""
+        if not self.cache_dir.exists():
+            return
+        cutoff = time.time() - self.ttl
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
@@ -1,15 +1,342 @@
 """
 EPG Detail Dialog
+
+Die Programmliste ist ein QListView mit Model und zeichnendem Delegate: auch bei
+mehreren tausend Eintraegen (7 Tage Catchup) werden nur die sichtbaren Zeilen
+gezeichnet, es entstehen keine Widgets pro Sendung.
 """
+from dataclasses import dataclass
 from datetime import datetime
+
 from PySide6.QtWidgets import (
-    QDialog, QVBoxLayout, QLabel, QScrollArea, QWidget,
-    QPushButton, QHBoxLayout, QFrame, QProgressBar
+    QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QFrame,
+    QListView, QStyledItemDelegate, QStyleOptionViewItem, QAbstractItemView,
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, QTimer, Signal,
+)
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen
 
 from xtream_api import EpgEntry
 
+_MARGIN_H = 16
+_MARGIN_V = 12
+_SPACING = 10
+_TIME_W = 100
+_DESC_INDENT = 110
+_PLAY_BTN_H = 28
+_REC_BTN_H = 32
+
+BUTTON_CATCHUP = "catchup"
+BUTTON_RECORD = "record"
+
+
+class EpgListModel(QAbstractListModel):
+    """Sendungen eines Senders; Zeile = EpgEntry in Qt.UserRole"""
+
+    def __init__(self, entries: list[EpgEntry], parent=None):
+        super().__init__(parent)
+        self._entries = entries
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._entries[index.row()]
+        if role == Qt.UserRole:
+            return entry
+        if role == Qt.DisplayRole:
+            return entry.title
+        return None
+
+    def entry(self, row: int) -> EpgEntry:
+        return self._entries[row]
+
+    def scroll_row(self, now: float) -> int:
+        """Laufende Sendung, sonst die naechste kommende (-1 wenn keine)"""
+        for i, entry in enumerate(self._entries):
+            if entry.start_timestamp <= now <= entry.stop_timestamp:
+                return i
+        for i, entry in enumerate(self._entries):
+            if entry.start_timestamp > now:
+                return i
+        return -1
+
+
+@dataclass
+class _RowLayout:
+    height: int
+    time: QRect
+    title: QRect
+    badge: QRect | None
+    play: QRect | None
+    record: QRect | None
+    progress: QRect | None
+    desc: QRect | None
+
+
+def _font(pixel_size: int, bold: bool = False) -> QFont:
+    font = QFont()
+    font.setPixelSize(pixel_size)
+    font.setBold(bold)
+    return font
+
+
+class EpgRowDelegate(QStyledItemDelegate):
+    """Zeichnet eine Programmzeile inkl. Catchup- und Aufnahme-Button.
+
+    Button-Klicks werden ueber editorEvent erkannt und als Signal gemeldet.
+    """
+
+    button_clicked = Signal(str, object)  # (BUTTON_*, EpgEntry)
+
+    def __init__(self, view: QListView, has_catchup: bool, can_schedule: bool):
+        super().__init__(view)
+        self._view = view
+        self._has_catchup = has_catchup
+        self._can_schedule = can_schedule
+        self._now = datetime.now().timestamp()
+        self._hover: tuple[int, str] | None = None
+
+        self._time_font = _font(12, bold=True)
+        self._title_font = _font(13)
+        self._title_font_current = _font(14, bold=True)
+        self._badge_font = _font(9, bold=True)
+        self._button_font = _font(11)
+        self._record_font = _font(17)
+        self._desc_font = _font(11)
+        self._fm_title = QFontMetrics(self._title_font)
+        self._fm_title_current = QFontMetrics(self._title_font_current)
+        self._fm_badge = QFontMetrics(self._badge_font)
+        self._fm_button = QFontMetrics(self._button_font)
+        self._fm_record = QFontMetrics(self._record_font)
+        self._fm_desc = QFontMetrics(self._desc_font)
+        self._fm_time = QFontMetrics(self._time_font)
+
+        # Konstante Breiten einmal messen
+        self._record_w = self._fm_record.horizontalAdvance("\U0001F4F9") + 18
+        self._play_w = {
+            current: self._fm_button.horizontalAdvance(self._play_text(current)) + 26
+            for current in (True, False)
+        }
+        self._badge_w = self._fm_badge.horizontalAdvance("JETZT") + 16
+        # (Schrift, Text, Breite) -> Hoehe; Titel wie "Nachrichten" wiederholen sich oft
+        self._text_heights: dict[tuple[int, str, int], int] = {}
+        # Zeilenhoehen fuer die aktuelle Breite (nur bei Groessenaenderung neu)
+        self._row_heights: dict[int, int] = {}
+        self._row_heights_width = -1
+
+    def _state(self, entry: EpgEntry) -> tuple[bool, bool, bool]:
+        now = self._now
+        is_current = entry.start_timestamp <= now <= entry.stop_timestamp
+        return is_current, entry.stop_timestamp < now, entry.start_timestamp > now
+
+    @staticmethod
+    def _play_text(is_current: bool) -> str:
+        return "\u25B6 " + ("Von Anfang" if is_current else "Abspielen")
+
+    def _text_height(self, fm: QFontMetrics, text: str, width: int) -> int:
+        """Hoehe des umbrochenen Textes; einzeilige Texte ohne Umbruch-Berechnung"""
+        key = (id(fm), text, width)
+        height = self._text_heights.get(key)
+        if height is None:
+            if fm.horizontalAdvance(text) <= width:
+                height = fm.height()
+            else:
+                height = fm.boundingRect(0, 0, width, 100000, Qt.TextWordWrap, text).height()
+            self._text_heights[key] = height
+        return height
+
+    def _layout(self, entry: EpgEntry, rect: QRect) -> _RowLayout:
+        is_current, is_past, is_future = self._state(entry)
+        left = rect.left() + _MARGIN_H
+        right = rect.right() - _MARGIN_H
+        top = rect.top() + _MARGIN_V
+
+        # Rechts: Aufnahme-Button, Catchup-Button, JETZT-Badge (von aussen nach innen)
+        record = play = badge = None
+        x = right
+        line_h = _REC_BTN_H if self._can_schedule else _PLAY_BTN_H
+        if self._can_schedule and (is_current or is_future):
+            w = self._record_w
+            record = QRect(x - w + 1, top, w, _REC_BTN_H)
+            x = record.left() - _SPACING
+        if self._has_catchup and (is_past or is_current):
+            w = self._play_w[is_current]
+            play = QRect(x - w + 1, top + (line_h - _PLAY_BTN_H) // 2, w, _PLAY_BTN_H)
+            x = play.left() - _SPACING
+        if is_current:
+            w = self._badge_w
+            badge = QRect(x - w + 1, top + (line_h - 20) // 2, w, 20)
+            x = badge.left() - _SPACING
+
+        title_left = left + _TIME_W + _SPACING
+        title_w = max(40, x - title_left)
+        fm = self._fm_title_current if is_current else self._fm_title
+        title_h = self._text_height(fm, entry.title, title_w)
+        first_h = max(title_h, self._fm_time.height(), line_h if (record or play) else 0)
+        title = QRect(title_left, top, title_w, max(title_h, fm.height()))
+        time_rect = QRect(left, top, _TIME_W, max(self._fm_time.height(), fm.height()))
+        if record or play:
+            # Zeit und Titel vertikal an der Button-Zeile ausrichten
+            offset = max(0, (line_h - max(fm.height(), self._fm_time.height())) // 2) if title_h <= fm.height() else 0
+            title.translate(0, offset)
+            time_rect.translate(0, offset)
+
+        y = top + first_h
+        progress = None
+        if is_current and entry.stop_timestamp > entry.start_timestamp:
+            y += 6
+            progress = QRect(left, y, right - left + 1, 3)
+            y += 3
+
+        desc = None
+        text = entry.description.strip() if entry.description else ""
+        if text:
+            y += 6
+            desc_w = right - (left + _DESC_INDENT) + 1
+            h = self._text_height(self._fm_desc, text, desc_w)
+            desc = QRect(left + _DESC_INDENT, y, desc_w, h)
+            y += h
+
+        height = y + _MARGIN_V - rect.top()
+        return _RowLayout(height, time_rect, title, badge, play, record, progress, desc)
+
+    def _row_rect(self, option: QStyleOptionViewItem) -> QRect:
+        rect = QRect(option.rect)
+        rect.setWidth(self._view.viewport().width())
+        return rect
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        width = option.rect.width() or self._view.viewport().width()
+        if width != self._row_heights_width:
+            self._row_heights.clear()
+            self._row_heights_width = width
+        row = index.row()
+        height = self._row_heights.get(row)
+        if height is None:
+            entry = index.model().entry(row)
+            height = self._layout(entry, QRect(0, 0, width, 0)).height
+            self._row_heights[row] = height
+        return QSize(width, height)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        entry: EpgEntry = index.data(Qt.UserRole)
+        rect = self._row_rect(option)
+        is_current, is_past, _ = self._state(entry)
+        lay = self._layout(entry, rect)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Hintergrund + Trennlinie
+        painter.fillRect(rect, QColor("#0f1f30") if is_current else QColor("#121212"))
+        painter.fillRect(QRect(rect.left(), rect.bottom(), rect.width(), 1),
+                         QColor("#1a2a3a") if is_current else QColor("#1a1a2a"))
+        if is_current:
+            painter.fillRect(QRect(rect.left(), rect.top(), 3, rect.height()), QColor("#0078d4"))
+
+        # Zeit
+        start = datetime.fromtimestamp(entry.start_timestamp).strftime("%H:%M")
+        end = datetime.fromtimestamp(entry.stop_timestamp).strftime("%H:%M")
+        painter.setFont(self._time_font)
+        painter.setPen(QColor("#0078d4" if is_current else "#666" if is_past else "#999"))
+        painter.drawText(lay.time, Qt.AlignLeft | Qt.AlignTop, f"{start} – {end}")
+
+        # Titel
+        painter.setFont(self._title_font_current if is_current else self._title_font)
+        painter.setPen(QColor("white" if is_current else "#555" if is_past else "#ccc"))
+        painter.drawText(lay.title, Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, entry.title)
+
+        if lay.badge:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#0078d4"))
+            painter.drawRoundedRect(lay.badge, 3, 3)
+            painter.setFont(self._badge_font)
+            painter.setPen(QColor("white"))
+            painter.drawText(lay.badge, Qt.AlignCenter, "JETZT")
+
+        row = index.row()
+        if lay.play:
+            hover = self._hover == (row, BUTTON_CATCHUP)
+            painter.setPen(QPen(QColor("#0078d4"), 1))
+            painter.setBrush(QColor("#0078d4") if hover else Qt.NoBrush)
+            painter.drawRoundedRect(lay.play.adjusted(0, 0, -1, -1), 6, 6)
+            painter.setFont(self._button_font)
+            painter.setPen(QColor("white") if hover else QColor("#0078d4"))
+            painter.drawText(lay.play, Qt.AlignCenter, self._play_text(is_current))
+
+        if lay.record:
+            hover = self._hover == (row, BUTTON_RECORD)
+            painter.setPen(QPen(QColor("#c0392b" if hover else "#444"), 1))
+            painter.setBrush(QColor("#c0392b") if hover else Qt.NoBrush)
+            painter.drawRoundedRect(lay.record.adjusted(0, 0, -1, -1), 6, 6)
+            painter.setFont(self._record_font)
+            painter.setPen(QColor("white") if hover else QColor("#888"))
+            painter.drawText(lay.record, Qt.AlignCenter, "\U0001F4F9")
+
+        # Fortschrittsbalken fuer aktuelle Sendung
+        if lay.progress:
+            duration = entry.stop_timestamp - entry.start_timestamp
+            progress = max(0.0, min(1.0, (self._now - entry.start_timestamp) / duration))
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#1a3a5a"))
+            painter.drawRoundedRect(lay.progress, 1, 1)
+            if progress > 0:
+                done = QRect(lay.progress)
+                done.setWidth(int(lay.progress.width() * progress))
+                painter.setBrush(QColor("#0078d4"))
+                painter.drawRoundedRect(done, 1, 1)
+
+        # Beschreibung
+        if lay.desc:
+            painter.setFont(self._desc_font)
+            painter.setPen(QColor("#aaa" if is_current else "#666" if is_past else "#888"))
+            painter.drawText(lay.desc, Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap,
+                             entry.description.strip())
+        painter.restore()
+
+    def _button_at(self, entry: EpgEntry, rect: QRect, pos) -> str | None:
+        lay = self._layout(entry, rect)
+        if lay.play and lay.play.contains(pos):
+            return BUTTON_CATCHUP
+        if lay.record and lay.record.contains(pos):
+            return BUTTON_RECORD
+        return None
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        etype = event.type()
+        if etype not in (QEvent.MouseMove, QEvent.MouseButtonRelease, QEvent.MouseButtonPress):
+            return False
+        entry = index.data(Qt.UserRole)
+        pos = event.position().toPoint()
+        button = self._button_at(entry, self._row_rect(option), pos)
+        if etype == QEvent.MouseMove:
+            hover = (index.row(), button) if button else None
+            if hover != self._hover:
+                self._hover = hover
+                self._view.viewport().setCursor(Qt.PointingHandCursor if button else Qt.ArrowCursor)
+                self._view.viewport().update()
+            return False
+        if button and event.button() == Qt.LeftButton:
+            if etype == QEvent.MouseButtonRelease:
+                self.button_clicked.emit(button, entry)
+            return True
+        return False
+
+    def clear_hover(self):
+        if self._hover is not None:
+            self._hover = None
+            self._view.viewport().setCursor(Qt.ArrowCursor)
+            self._view.viewport().update()
+
+
+class _EpgListView(QListView):
+    def leaveEvent(self, event):
+        self.itemDelegate().clear_hover()
+        super().leaveEvent(event)
+
 
 class EpgDialog(QDialog):
     """Dialog mit vollstaendigem Programmueberblick"""
@@ -73,11 +400,32 @@ class EpgDialog(QDialog):
         header_layout.addWidget(btn_close)
         layout.addWidget(header)
 
-        # Scrollbarer Programmbereich
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("""
-            QScrollArea { border: none; background-color: #121212; }
+        if not epg_data:
+            empty = QLabel("Keine Programmdaten verfuegbar")
+            empty.setStyleSheet("color: #666; padding: 40px; font-size: 14px;")
+            empty.setAlignment(Qt.AlignCenter)
+            layout.addWidget(empty)
+            layout.addStretch()
+            return
+
+        # Programmliste: Model + zeichnender Delegate, nur sichtbare Zeilen kosten Zeit
+        self._model = EpgListModel(epg_data, self)
+        view = _EpgListView()
+        # Scroll-Modus vor setModel setzen, sonst wird sofort komplett vermessen
+        view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        view.setLayoutMode(QListView.Batched)
+        view.setBatchSize(200)
+        view.setModel(self._model)
+        delegate = EpgRowDelegate(view, self._has_catchup, self._schedule_callback is not None)
+        delegate.button_clicked.connect(self._on_row_button)
+        view.setItemDelegate(delegate)
+        view.setMouseTracking(True)
+        view.setSelectionMode(QAbstractItemView.NoSelection)
+        view.setFocusPolicy(Qt.NoFocus)
+        view.verticalScrollBar().setSingleStep(24)
+        view.setResizeMode(QListView.Adjust)
+        view.setStyleSheet("""
+            QListView { border: none; background-color: #121212; }
             QScrollBar:vertical {
                 background: #121212;
                 width: 8px;
@@ -89,155 +437,28 @@ class EpgDialog(QDialog):
             }
             QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0; }
         """)
+        layout.addWidget(view)
+        self._view = view
 
-        content = QWidget()
-        content_layout = QVBoxLayout(content)
-        content_layout.setContentsMargins(0, 0, 0, 0)
-        content_layout.setSpacing(0)
+        target = self._model.scroll_row(datetime.now().timestamp())
+        if target >= 0:
+            QTimer.singleShot(0, lambda: self._scroll_to_row(target))
 
-        now = datetime.now().timestamp()
-
-        scroll_target = None
-
-        if not epg_data:
-            empty = QLabel("Keine Programmdaten verfuegbar")
-            empty.setStyleSheet("color: #666; padding: 40px; font-size: 14px;")
-            empty.setAlignment(Qt.AlignCenter)
-            content_layout.addWidget(empty)
-        else:
-            for entry in epg_data:
-                is_current = entry.start_timestamp <= now <= entry.stop_timestamp
-                is_future = entry.start_timestamp > now
-                row = self._create_program_row(entry, now)
-                content_layout.addWidget(row)
-                if is_current:
-                    scroll_target = row
-                elif is_future and scroll_target is None:
-                    scroll_target = row
-
-        content_layout.addStretch()
-        scroll.setWidget(content)
-        layout.addWidget(scroll)
-
-        if scroll_target is not None:
-            target = scroll_target
-            QTimer.singleShot(0, lambda: scroll.ensureWidgetVisible(target))
-
-    def _create_program_row(self, entry: EpgEntry, now: float) -> QWidget:
-        """Erstellt eine Programmzeile"""
-        is_current = entry.start_timestamp <= now <= entry.stop_timestamp
-        is_past = entry.stop_timestamp < now
-        is_future = entry.start_timestamp > now
+    def _scroll_to_row(self, row: int):
+        """Zur laufenden Sendung scrollen, sobald das Batched-Layout fertig ist
+        (vorher ist der Scrollbereich noch nicht vollstaendig)"""
+        index = self._model.index(row)
+        last = self._model.index(self._model.rowCount() - 1)
+        if not self._view.visualRect(last).isValid() and self._view.isVisible():
+            QTimer.singleShot(0, lambda: self._scroll_to_row(row))
+            return
+        self._view.scrollTo(index, QAbstractItemView.PositionAtTop)
 
-        row = QFrame()
-        row.setObjectName("epgRow")
-        if is_current:
-            row.setStyleSheet("""
-                #epgRow { background-color: #0f1f30; border-left: 3px solid #0078d4; border-bottom: 1px solid #1a2a3a; }
-            """)
-        elif is_past:
-            row.setStyleSheet("""
-                #epgRow { background-color: #121212; border-bottom: 1px solid #1a1a2a; }
-            """)
-        else:
-            row.setStyleSheet("""
-                #epgRow { background-color: #121212; border-bottom: 1px solid #1a1a2a; }
-            """)
-
-        layout = QVBoxLayout(row)
-        layout.setContentsMargins(16, 12, 16, 12)
-        layout.setSpacing(6)
-
-        # Kopfzeile: Zeit + Titel + Badges/Buttons
-        title_line = QHBoxLayout()
-        title_line.setSpacing(10)
-
-        # Zeit
-        start = datetime.fromtimestamp(entry.start_timestamp).strftime("%H:%M")
-        end = datetime.fromtimestamp(entry.stop_timestamp).strftime("%H:%M")
-        time_color = '#0078d4' if is_current else '#666' if is_past else '#999'
-        time_label = QLabel(f"{start} – {end}")
-        time_label.setStyleSheet(f"font-size: 12px; font-weight: bold; color: {time_color};")
-        time_label.setFixedWidth(100)
-        title_line.addWidget(time_label)
-
-        # Titel
-        title_label = QLabel(entry.title)
-        weight = "bold" if is_current else "normal"
-        size = "14px" if is_current else "13px"
-        title_color = "white" if is_current else "#555" if is_past else "#ccc"
-        title_label.setStyleSheet(f"font-size: {size}; font-weight: {weight}; color: {title_color};")
-        title_label.setWordWrap(True)
-        title_line.addWidget(title_label, stretch=1)
-
-        if is_current:
-            badge = QLabel("JETZT")
-            badge.setStyleSheet("""
-                font-size: 9px; font-weight: bold; color: white;
-                background-color: #0078d4; padding: 2px 8px; border-radius: 3px;
-            """)
-            badge.setFixedHeight(20)
-            title_line.addWidget(badge)
-
-        # Catchup-Button
-        if self._has_catchup and (is_past or is_current):
-            btn_play = QPushButton("\u25B6 " + ("Von Anfang" if is_current else "Abspielen"))
-            btn_play.setFixedHeight(28)
-            btn_play.setStyleSheet("""
-                QPushButton {
-                    background: transparent; color: #0078d4;
-                    border: 1px solid #0078d4; border-radius: 6px;
-                    font-size: 11px; padding: 2px 12px;
-                }
-                QPushButton:hover { background-color: #0078d4; color: white; }
-            """)
-            btn_play.clicked.connect(lambda checked=False, e=entry: self._on_catchup_clicked(e))
-            title_line.addWidget(btn_play)
-
-        # Aufnahme-planen-Button für zukünftige und aktuelle Sendungen
-        if self._schedule_callback and (is_current or is_future):
-            btn_rec = QPushButton("\U0001F4F9")
-            btn_rec.setToolTip("Aufnahme planen")
-            btn_rec.setFixedHeight(32)
-            btn_rec.setStyleSheet("""
-                QPushButton {
-                    background: transparent; color: #888;
-                    border: 1px solid #444; border-radius: 6px;
-                    font-size: 17px; padding: 2px 8px;
-                }
-                QPushButton:hover { background: #c0392b; color: white; border-color: #c0392b; }
-            """)
-            btn_rec.clicked.connect(lambda checked=False, e=entry: self._schedule_callback(e))
-            title_line.addWidget(btn_rec)
-
-        layout.addLayout(title_line)
-
-        # Fortschrittsbalken fuer aktuelle Sendung
-        if is_current:
-            duration = entry.stop_timestamp - entry.start_timestamp
-            if duration > 0:
-                elapsed = now - entry.start_timestamp
-                progress = max(0, min(100, int(elapsed / duration * 100)))
-                bar = QProgressBar()
-                bar.setFixedHeight(3)
-                bar.setTextVisible(False)
-                bar.setValue(progress)
-                bar.setStyleSheet("""
-                    QProgressBar { background: #1a3a5a; border: none; border-radius: 1px; }
-                    QProgressBar::chunk { background: #0078d4; border-radius: 1px; }
-                """)
-                layout.addWidget(bar)
-
-        # Beschreibung
-        desc = entry.description.strip() if entry.description else ""
-        if desc:
-            desc_label = QLabel(desc)
-            desc_color = '#aaa' if is_current else '#666' if is_past else '#888'
-            desc_label.setStyleSheet(f"font-size: 11px; color: {desc_color}; padding-left: 110px;")
-            desc_label.setWordWrap(True)
-            layout.addWidget(desc_label)
-
-        return row
+    def _on_row_button(self, button: str, entry: EpgEntry):
+        if button == BUTTON_CATCHUP:
+            self._on_catchup_clicked(entry)
+        elif button == BUTTON_RECORD and self._schedule_callback:
+            self._schedule_callback(entry)
 
     def _on_catchup_clicked(self, entry: EpgEntry):
         self.selected_catchup_entry = entry
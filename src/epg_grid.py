@@ -0,0 +1,603 @@
+"""
+Programmfuehrer: Zeit x Sender-Raster fuer eine Live-Kategorie
+
+Das Raster wird komplett selbst gezeichnet und ist in beiden Richtungen
+virtualisiert: pro Frame werden nur die sichtbaren Sender-Zeilen und aus dem
+EpgStore nur die Sendungen im sichtbaren Zeitfenster abgefragt. Zeilen werden
+als Kacheln vorgerendert, beim Scrollen kommen nur neue Kacheln hinzu. Fehlende
+EPG-Daten sichtbarer Sender werden per Signal nachgefordert.
+"""
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from PySide6.QtWidgets import (
+    QAbstractScrollArea, QApplication, QDialog, QVBoxLayout, QHBoxLayout, QFrame, QLabel,
+    QPushButton, QMenu, QToolTip,
+)
+from PySide6.QtCore import Qt, QRect, QPoint, QEvent, QTimer, Signal
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPixmap
+
+from epg_store import EpgStore
+from xtream_api import EpgEntry, LiveStream
+
+ROW_H = 48
+HEADER_H = 30
+CHANNEL_W = 180
+PX_PER_MIN = 4
+DAYS_BACK = 7
+DAYS_AHEAD = 2
+# Zeilen werden in Kacheln zu 2 Stunden vorgerendert und gecacht
+TILE_SECONDS = 2 * 3600
+TILE_W = TILE_SECONDS * PX_PER_MIN // 60
+TILE_CACHE_SIZE = 256
+# Fehlgeschlagene Sender erst nach dieser Wartezeit erneut anfordern (verdoppelt sich)
+REQUEST_BACKOFF_S = 5.0
+REQUEST_BACKOFF_MAX_S = 300.0
+
+_ALIGN_LEFT_TOP = Qt.AlignLeft | Qt.AlignTop
+_ALIGN_LEFT_BOTTOM = Qt.AlignLeft | Qt.AlignBottom
+_ALIGN_LEFT_VCENTER = Qt.AlignLeft | Qt.AlignVCenter
+
+_C_BACKGROUND = QColor("#121212")
+_C_HEADER = QColor("#0d0d14")
+_C_NOW = QColor("#e74c3c")
+_C_LINE = QColor("#1a1a2a")
+_C_MUTED = QColor("#444")
+_C_ACCENT = QColor("#0078d4")
+_C_CELL = QColor("#1c1c28")
+_C_CELL_PAST = QColor("#181820")
+_C_CELL_CURRENT = QColor("#0f2a45")
+_C_TEXT = QColor("#ccc")
+_C_TEXT_PAST = QColor("#777")
+_C_TEXT_CURRENT = QColor("white")
+_C_TIME = QColor("#555")
+
+
+def _font(pixel_size: int, bold: bool = False) -> QFont:
+    font = QFont()
+    font.setPixelSize(pixel_size)
+    font.setBold(bold)
+    return font
+
+
+class EpgGrid(QAbstractScrollArea):
+    """Zeit x Sender-Raster ueber einem EpgStore.
+
+    Klick auf eine Sendung meldet `entry_clicked` (erst nach Ablauf des
+    Doppelklick-Intervalls), Doppelklick `entry_activated`; Sender ohne Daten
+    im Store meldet `channels_needed` (gebuendelt, hoechstens einmal pro
+    Sender; nach `request_failed()` erst wieder nach Backoff).
+    """
+
+    entry_clicked = Signal(object, object, QPoint)   # (LiveStream, EpgEntry, globale Pos)
+    entry_activated = Signal(object, object)         # (LiveStream, EpgEntry)
+    channels_needed = Signal(list)                   # [stream_id, ...]
+
+    def __init__(self, store: EpgStore, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self._channels: list[LiveStream] = []
+        now = datetime.now()
+        day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        self._t0 = (day - timedelta(days=DAYS_BACK)).timestamp()
+        self._t1 = (day + timedelta(days=DAYS_AHEAD + 1)).timestamp()
+        self._px_per_sec = PX_PER_MIN / 60.0
+        self._hover: tuple[int, int] | None = None  # (Zeile, start_timestamp)
+        self._requested: set[int] = set()
+        self._missing: set[int] = set()
+        # stream_id -> (Fehlversuche, fruehester naechster Versuch, monotonic)
+        self._failures: dict[int, tuple[int, float]] = {}
+        self._request_timer = QTimer(self)
+        self._request_timer.setSingleShot(True)
+        self._request_timer.setInterval(120)
+        self._request_timer.timeout.connect(self._emit_missing)
+        # Jetzt-Linie mitlaufen lassen
+        self._now_timer = QTimer(self)
+        self._now_timer.setInterval(60_000)
+        self._now_timer.timeout.connect(self._on_minute)
+        self._now_timer.start()
+        # Einfacher Klick wartet auf einen moeglichen Doppelklick
+        self._pending_click: tuple[int, EpgEntry, QPoint] | None = None
+        self._ignore_release = False
+        self._click_timer = QTimer(self)
+        self._click_timer.setSingleShot(True)
+        self._click_timer.setInterval(QApplication.doubleClickInterval())
+        self._click_timer.timeout.connect(self._emit_pending_click)
+
+        self._title_font = _font(12, bold=True)
+        self._time_font = _font(10)
+        self._header_font = _font(11, bold=True)
+        self._channel_font = _font(12)
+        self._fm_title = QFontMetrics(self._title_font)
+        self._fm_time = QFontMetrics(self._time_font)
+        self._fm_channel = QFontMetrics(self._channel_font)
+        # Texte/Breiten je Sendung nur einmal berechnen (beim Scrollen wiederholt)
+        self._time_labels: dict[tuple[int, int], str] = {}
+        self._title_widths: dict[str, int] = {}
+        self._time_widths: dict[str, int] = {}
+        self._tiles: OrderedDict[tuple[int, int], QPixmap] = OrderedDict()
+
+        self.setMouseTracking(True)
+        self.viewport().setMouseTracking(True)
+        self.setFrameShape(QFrame.NoFrame)
+        self.horizontalScrollBar().setSingleStep(PX_PER_MIN * 15)
+        self.verticalScrollBar().setSingleStep(ROW_H)
+        self.horizontalScrollBar().valueChanged.connect(self._on_scrolled)
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+    # ── Daten / Geometrie ───────────────────────────────────────────
+
+    def set_channels(self, channels: list[LiveStream]):
+        self._channels = list(channels)
+        self._hover = None
+        self._update_scrollbars()
+        self.viewport().update()
+
+    def channels(self) -> list[LiveStream]:
+        return self._channels
+
+    def request_failed(self, stream_ids):
+        """Abruf gescheitert: Sender nach exponentiellem Backoff erneut anfordern"""
+        now = time.monotonic()
+        longest = 0.0
+        for stream_id in stream_ids:
+            failures = self._failures.get(stream_id, (0, 0.0))[0] + 1
+            delay = min(REQUEST_BACKOFF_MAX_S, REQUEST_BACKOFF_S * 2 ** (failures - 1))
+            self._failures[stream_id] = (failures, now + delay)
+            self._requested.discard(stream_id)
+            longest = max(longest, delay)
+        self.viewport().update()
+        if longest:
+            # Nach Ablauf neu zeichnen, damit sichtbare Sender wieder angefordert werden
+            QTimer.singleShot(int(longest * 1000) + 50, self, self.viewport().update)
+
+    def _backing_off(self, stream_id: int) -> bool:
+        failure = self._failures.get(stream_id)
+        return failure is not None and time.monotonic() < failure[1]
+
+    def _content_width(self) -> int:
+        return int((self._t1 - self._t0) * self._px_per_sec)
+
+    def _update_scrollbars(self):
+        vp = self.viewport()
+        self.horizontalScrollBar().setPageStep(max(1, vp.width() - CHANNEL_W))
+        self.horizontalScrollBar().setRange(0, max(0, self._content_width() - (vp.width() - CHANNEL_W)))
+        self.verticalScrollBar().setPageStep(max(1, vp.height() - HEADER_H))
+        self.verticalScrollBar().setRange(
+            0, max(0, len(self._channels) * ROW_H - (vp.height() - HEADER_H)))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scrollbars()
+
+    def scroll_to_time(self, timestamp: float, lead_minutes: int = 30):
+        """Zeitpunkt (abzueglich Vorlauf) an den linken Rand scrollen"""
+        x = (timestamp - lead_minutes * 60 - self._t0) * self._px_per_sec
+        self.horizontalScrollBar().setValue(int(x))
+
+    def _x_for(self, timestamp: float) -> float:
+        return CHANNEL_W + (timestamp - self._t0) * self._px_per_sec - self.horizontalScrollBar().value()
+
+    def _time_for(self, x: float) -> float:
+        return self._t0 + (x - CHANNEL_W + self.horizontalScrollBar().value()) / self._px_per_sec
+
+    def _visible_rows(self) -> range:
+        top = self.verticalScrollBar().value()
+        first = top // ROW_H
+        last = (top + self.viewport().height() - HEADER_H) // ROW_H + 1
+        return range(first, min(len(self._channels), last))
+
+    def _row_top(self, row: int) -> int:
+        return HEADER_H + row * ROW_H - self.verticalScrollBar().value()
+
+    def _visible_window(self) -> tuple[float, float]:
+        return self._time_for(CHANNEL_W), self._time_for(self.viewport().width())
+
+    def _hit(self, pos: QPoint) -> tuple[int, EpgEntry | None]:
+        """(Zeile, Sendung) unter der Mausposition"""
+        if pos.x() < CHANNEL_W or pos.y() < HEADER_H:
+            return -1, None
+        row = (pos.y() - HEADER_H + self.verticalScrollBar().value()) // ROW_H
+        if not 0 <= row < len(self._channels):
+            return -1, None
+        return row, self.store.at(self._channels[row].stream_id, self._time_for(pos.x()))
+
+    # ── Nachladen ───────────────────────────────────────────────────
+
+    def _on_scrolled(self):
+        self._hover = None
+        self.viewport().update()
+
+    def _note_missing(self, stream_id: int):
+        if stream_id not in self._requested and not self._backing_off(stream_id):
+            self._missing.add(stream_id)
+            if not self._request_timer.isActive():
+                self._request_timer.start()
+
+    def _emit_missing(self):
+        # Nur Sender anfordern, die nach der Entprellung noch sichtbar sind
+        visible = {self._channels[row].stream_id for row in self._visible_rows()}
+        ids = [sid for sid in self._missing if sid in visible and sid not in self.store]
+        self._missing.clear()
+        if ids:
+            self._requested.update(ids)
+            self.channels_needed.emit(ids)
+
+    # ── Zeichnen ────────────────────────────────────────────────────
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        vp_w = self.viewport().width()
+        vp_h = self.viewport().height()
+        painter.fillRect(0, 0, vp_w, vp_h, _C_BACKGROUND)
+
+        now = datetime.now().timestamp()
+        t_left, t_right = self._visible_window()
+        rows = self._visible_rows()
+        first_tile = int((t_left - self._t0) // TILE_SECONDS)
+        last_tile = int((t_right - self._t0) // TILE_SECONDS)
+        x_base = CHANNEL_W - self.horizontalScrollBar().value()
+
+        painter.save()
+        painter.setClipRect(CHANNEL_W, HEADER_H, vp_w - CHANNEL_W, vp_h - HEADER_H)
+        for row in rows:
+            stream_id = self._channels[row].stream_id
+            top = self._row_top(row)
+            if stream_id not in self.store:
+                self._note_missing(stream_id)
+                text = "Programm nicht verfuegbar – neuer Versuch folgt" \
+                    if self._backing_off(stream_id) else "Lade Programm…"
+                painter.setFont(self._time_font)
+                painter.setPen(_C_MUTED)
+                painter.drawText(QRect(CHANNEL_W + 10, top, 400, ROW_H), _ALIGN_LEFT_VCENTER, text)
+                painter.fillRect(QRect(CHANNEL_W, top + ROW_H - 1, vp_w - CHANNEL_W, 1), _C_LINE)
+                continue
+            for tile in range(first_tile, last_tile + 1):
+                painter.drawPixmap(x_base + tile * TILE_W, top, self._tile(stream_id, tile, now))
+
+        if self._hover is not None and self._hover[0] in rows:
+            row, start = self._hover
+            entry = self.store.at(self._channels[row].stream_id, start)
+            if entry:
+                x1 = int(self._x_for(entry.start_timestamp))
+                x2 = int(self._x_for(entry.stop_timestamp))
+                painter.setPen(_C_ACCENT)
+                painter.setBrush(Qt.NoBrush)
+                painter.drawRect(QRect(x1 + 1, self._row_top(row) + 2, max(1, x2 - x1 - 3), ROW_H - 6))
+
+        # Jetzt-Linie
+        x_now = self._x_for(now)
+        if CHANNEL_W <= x_now <= vp_w:
+            painter.fillRect(QRect(int(x_now) - 1, HEADER_H, 2, vp_h - HEADER_H), _C_NOW)
+        painter.restore()
+
+        self._paint_header(painter, t_left, t_right, now)
+        self._paint_channels(painter, rows)
+        painter.fillRect(0, 0, CHANNEL_W, HEADER_H, _C_HEADER)
+
+    # ── Kacheln ─────────────────────────────────────────────────────
+
+    def _tile(self, stream_id: int, tile: int, now: float) -> QPixmap:
+        """Vorgerenderter Ausschnitt (TILE_SECONDS) einer Sender-Zeile; beim
+        Scrollen werden nur neu sichtbar werdende Kacheln gezeichnet"""
+        key = (stream_id, tile)
+        pixmap = self._tiles.get(key)
+        if pixmap is not None:
+            self._tiles.move_to_end(key)
+            return pixmap
+        pixmap = self._render_tile(stream_id, tile, now)
+        self._tiles[key] = pixmap
+        while len(self._tiles) > TILE_CACHE_SIZE:
+            self._tiles.popitem(last=False)
+        return pixmap
+
+    def invalidate_channel(self, stream_id: int):
+        """Nach neuen EPG-Daten: Kacheln des Senders verwerfen"""
+        self._failures.pop(stream_id, None)
+        # Wird der Sender spaeter aus dem Store verdraengt, darf er erneut angefordert werden
+        self._requested.discard(stream_id)
+        for key in [k for k in self._tiles if k[0] == stream_id]:
+            del self._tiles[key]
+        self.viewport().update()
+
+    def _on_minute(self):
+        # Sendungen wechseln von "laeuft" zu "vorbei": Kacheln um jetzt neu zeichnen
+        tile = int((datetime.now().timestamp() - self._t0) // TILE_SECONDS)
+        for key in [k for k in self._tiles if tile - 1 <= k[1] <= tile]:
+            del self._tiles[key]
+        self.viewport().update()
+
+    def _render_tile(self, stream_id: int, tile: int, now: float) -> QPixmap:
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(round(TILE_W * dpr), round(ROW_H * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(_C_BACKGROUND)
+        painter = QPainter(pixmap)
+        painter.fillRect(QRect(0, ROW_H - 1, TILE_W, 1), _C_LINE)
+
+        tile_t0 = self._t0 + tile * TILE_SECONDS
+        pps = self._px_per_sec
+        for entry in self.store.window(stream_id, tile_t0, tile_t0 + TILE_SECONDS):
+            x1 = int((entry.start_timestamp - self._t0) * pps) - tile * TILE_W
+            x2 = int((entry.stop_timestamp - self._t0) * pps) - tile * TILE_W
+            cell = QRect(x1 + 1, 2, max(1, x2 - x1 - 2), ROW_H - 5)
+            is_current = entry.start_timestamp <= now < entry.stop_timestamp
+            is_past = entry.stop_timestamp <= now
+            if is_current:
+                painter.fillRect(cell, _C_CELL_CURRENT)
+                if cell.left() >= 0:
+                    painter.fillRect(QRect(cell.left(), cell.top(), 3, cell.height()), _C_ACCENT)
+            else:
+                painter.fillRect(cell, _C_CELL_PAST if is_past else _C_CELL)
+
+            # Text immer relativ zum Zellanfang: ueber Kachelgrenzen hinweg nahtlos,
+            # die Kachel schneidet ihn ab
+            text_rect = cell.adjusted(8, 4, -6, -4)
+            width = text_rect.width()
+            if width < 24:
+                continue
+            time_label = self._time_label(entry)
+            title_w = self._text_width(self._fm_title, self._title_widths, entry.title)
+            time_w = self._text_width(self._fm_time, self._time_widths, time_label)
+            if text_rect.left() + min(width, max(title_w, time_w)) < 0:
+                continue  # Text liegt komplett in einer frueheren Kachel
+            painter.setFont(self._title_font)
+            painter.setPen(_C_TEXT_CURRENT if is_current else _C_TEXT_PAST if is_past else _C_TEXT)
+            painter.drawText(text_rect, _ALIGN_LEFT_TOP, entry.title if title_w <= width
+                             else self._fm_title.elidedText(entry.title, Qt.ElideRight, width))
+            painter.setFont(self._time_font)
+            painter.setPen(_C_ACCENT if is_current else _C_TIME)
+            painter.drawText(text_rect, _ALIGN_LEFT_BOTTOM, time_label if time_w <= width
+                             else self._fm_time.elidedText(time_label, Qt.ElideRight, width))
+        painter.end()
+        return pixmap
+
+    def _time_label(self, entry: EpgEntry) -> str:
+        key = (entry.start_timestamp, entry.stop_timestamp)
+        label = self._time_labels.get(key)
+        if label is None:
+            start = datetime.fromtimestamp(entry.start_timestamp).strftime("%H:%M")
+            end = datetime.fromtimestamp(entry.stop_timestamp).strftime("%H:%M")
+            label = self._time_labels[key] = f"{start} – {end}"
+        return label
+
+    @staticmethod
+    def _text_width(fm: QFontMetrics, widths: dict, text: str) -> int:
+        """Textbreite, je Text nur einmal gemessen"""
+        width = widths.get(text)
+        if width is None:
+            width = widths[text] = fm.horizontalAdvance(text)
+        return width
+
+    def _paint_header(self, painter: QPainter, t_left: float, t_right: float, now: float):
+        vp_w = self.viewport().width()
+        painter.fillRect(QRect(CHANNEL_W, 0, vp_w - CHANNEL_W, HEADER_H), QColor("#0d0d14"))
+        painter.fillRect(QRect(0, HEADER_H - 1, vp_w, 1), QColor("#1a1a2a"))
+        painter.save()
+        painter.setClipRect(CHANNEL_W, 0, vp_w - CHANNEL_W, HEADER_H)
+        painter.setFont(self._header_font)
+        step = 30 * 60
+        tick = int(t_left // step) * step
+        while tick <= t_right:
+            x = int(self._x_for(tick))
+            dt = datetime.fromtimestamp(tick)
+            painter.fillRect(QRect(x, HEADER_H - 8, 1, 8), QColor("#333"))
+            if dt.hour == 0 and dt.minute == 0:
+                label = dt.strftime("%a %d.%m.")
+                painter.setPen(QColor("#0078d4"))
+            else:
+                label = dt.strftime("%H:%M")
+                painter.setPen(QColor("#888"))
+            painter.drawText(QRect(x + 4, 0, 120, HEADER_H - 2), Qt.AlignVCenter | Qt.AlignLeft, label)
+            tick += step
+        x_now = self._x_for(now)
+        if CHANNEL_W <= x_now <= vp_w:
+            painter.fillRect(QRect(int(x_now) - 1, HEADER_H - 10, 2, 10), QColor("#e74c3c"))
+        painter.restore()
+
+    def _paint_channels(self, painter: QPainter, rows: range):
+        vp_h = self.viewport().height()
+        painter.fillRect(QRect(0, HEADER_H, CHANNEL_W, vp_h - HEADER_H), QColor("#0d0d14"))
+        painter.fillRect(QRect(CHANNEL_W - 1, 0, 1, vp_h), QColor("#1a1a2a"))
+        painter.save()
+        painter.setClipRect(0, HEADER_H, CHANNEL_W, vp_h - HEADER_H)
+        painter.setFont(self._channel_font)
+        for row in rows:
+            channel = self._channels[row]
+            top = self._row_top(row)
+            painter.fillRect(QRect(0, top + ROW_H - 1, CHANNEL_W, 1), QColor("#1a1a2a"))
+            name = channel.name + ("  ↺" if channel.tv_archive else "")
+            painter.setPen(QColor("#ccc"))
+            painter.drawText(QRect(12, top, CHANNEL_W - 20, ROW_H), Qt.AlignVCenter | Qt.AlignLeft,
+                             self._fm_channel.elidedText(name, Qt.ElideRight, CHANNEL_W - 20))
+        painter.restore()
+
+    # ── Maus ────────────────────────────────────────────────────────
+
+    def mouseMoveEvent(self, event):
+        row, entry = self._hit(event.position().toPoint())
+        hover = (row, entry.start_timestamp) if entry else None
+        if hover != self._hover:
+            self._hover = hover
+            self.viewport().setCursor(Qt.PointingHandCursor if entry else Qt.ArrowCursor)
+            self.viewport().update()
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        if self._hover is not None:
+            self._hover = None
+            self.viewport().update()
+        super().leaveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            if self._ignore_release:
+                # Loslassen nach einem Doppelklick
+                self._ignore_release = False
+                return
+            pos = event.position().toPoint()
+            row, entry = self._hit(pos)
+            if entry:
+                # Menue (modal) erst zeigen, wenn kein Doppelklick folgt
+                self._pending_click = (row, entry, self.viewport().mapToGlobal(pos))
+                self._click_timer.start()
+                return
+        super().mouseReleaseEvent(event)
+
+    def _emit_pending_click(self):
+        pending, self._pending_click = self._pending_click, None
+        if pending and pending[0] < len(self._channels):
+            row, entry, global_pos = pending
+            self.entry_clicked.emit(self._channels[row], entry, global_pos)
+
+    def mouseDoubleClickEvent(self, event):
+        row, entry = self._hit(event.position().toPoint())
+        if entry:
+            self._click_timer.stop()
+            self._pending_click = None
+            self._ignore_release = True
+            self.entry_activated.emit(self._channels[row], entry)
+            return
+        super().mouseDoubleClickEvent(event)
+
+    def viewportEvent(self, event):
+        if event.type() == QEvent.ToolTip:
+            row, entry = self._hit(event.pos())
+            if entry:
+                start = datetime.fromtimestamp(entry.start_timestamp).strftime("%a %H:%M")
+                end = datetime.fromtimestamp(entry.stop_timestamp).strftime("%H:%M")
+                text = f"<b>{entry.title}</b><br>{start} – {end}"
+                if entry.description:
+                    desc = entry.description.strip()
+                    text += "<br><br>" + (desc[:300] + "…" if len(desc) > 300 else desc)
+                QToolTip.showText(event.globalPos(), text, self.viewport())
+            else:
+                QToolTip.hideText()
+            return True
+        return super().viewportEvent(event)
+
+
+class EpgGridDialog(QDialog):
+    """Programmfuehrer-Dialog fuer die Sender einer Kategorie.
+
+    Klick auf eine Sendung oeffnet ein Menue (Catchup / Aufnahme planen),
+    Doppelklick spielt vergangene/laufende Sendungen direkt per Catchup ab.
+    """
+
+    catchup_requested = Signal(object, object)    # (LiveStream, EpgEntry)
+    schedule_requested = Signal(object, object)   # (LiveStream, EpgEntry)
+
+    def __init__(self, title: str, channels: list[LiveStream], store: EpgStore,
+                 can_schedule: bool = True, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Programmfuehrer - {title}")
+        self.setMinimumSize(900, 560)
+        self.resize(1280, 760)
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #121212;
+                color: white;
+            }
+        """)
+        self._can_schedule = can_schedule
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        header = QFrame()
+        header.setStyleSheet("background-color: #0d0d14; border-bottom: 1px solid #1a1a2a;")
+        header_layout = QHBoxLayout(header)
+        header_layout.setContentsMargins(20, 12, 20, 12)
+
+        title_label = QLabel(title)
+        title_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #0078d4;")
+        header_layout.addWidget(title_label)
+        count = QLabel(f"{len(channels)} Sender")
+        count.setStyleSheet("font-size: 12px; color: #666;")
+        header_layout.addWidget(count)
+        header_layout.addStretch()
+
+        nav_style = """
+            QPushButton {
+                background: transparent; color: #ccc;
+                border: 1px solid #2a2a3a; border-radius: 6px;
+                padding: 5px 12px; font-size: 12px;
+            }
+            QPushButton:hover { background-color: #2a2a3a; color: white; }
+        """
+        for label, offset in (("◂ Tag", -1), ("Jetzt", 0), ("Tag ▸", 1)):
+            btn = QPushButton(label)
+            btn.setStyleSheet(nav_style)
+            btn.clicked.connect(lambda checked=False, o=offset: self._jump(o))
+            header_layout.addWidget(btn)
+
+        btn_close = QPushButton("✕")
+        btn_close.setFixedSize(32, 32)
+        btn_close.setStyleSheet("""
+            QPushButton {
+                background: transparent;
+                color: #888;
+                border: none;
+                border-radius: 16px;
+                font-size: 16px;
+            }
+            QPushButton:hover { background-color: #2a2a3a; color: white; }
+        """)
+        btn_close.clicked.connect(self.reject)
+        header_layout.addWidget(btn_close)
+        layout.addWidget(header)
+
+        self.grid = EpgGrid(store, self)
+        self.grid.setStyleSheet("""
+            QScrollBar:vertical, QScrollBar:horizontal {
+                background: #121212;
+                width: 8px;
+                height: 8px;
+            }
+            QScrollBar::handle:vertical, QScrollBar::handle:horizontal {
+                background: #444;
+                border-radius: 4px;
+                min-height: 20px;
+                min-width: 20px;
+            }
+            QScrollBar::add-line, QScrollBar::sub-line { height: 0; width: 0; }
+        """)
+        self.grid.set_channels(channels)
+        self.grid.entry_clicked.connect(self._on_entry_clicked)
+        self.grid.entry_activated.connect(self._on_entry_activated)
+        layout.addWidget(self.grid, stretch=1)
+
+        QTimer.singleShot(0, lambda: self.grid.scroll_to_time(datetime.now().timestamp()))
+
+    def _jump(self, days: int):
+        if days == 0:
+            self.grid.scroll_to_time(datetime.now().timestamp())
+            return
+        bar = self.grid.horizontalScrollBar()
+        bar.setValue(bar.value() + days * 24 * 60 * PX_PER_MIN)
+
+    def _actions_for(self, channel: LiveStream, entry: EpgEntry) -> list[tuple[str, Signal]]:
+        now = datetime.now().timestamp()
+        actions = []
+        if channel.tv_archive and entry.start_timestamp <= now:
+            is_current = now < entry.stop_timestamp
+            actions.append(("▶ Von Anfang" if is_current else "▶ Abspielen", self.catchup_requested))
+        if self._can_schedule and entry.stop_timestamp > now:
+            actions.append(("\U0001F4F9 Aufnahme planen", self.schedule_requested))
+        return actions
+
+    def _on_entry_clicked(self, channel: LiveStream, entry: EpgEntry, pos: QPoint):
+        actions = self._actions_for(channel, entry)
+        if not actions:
+            return
+        menu = QMenu(self)
+        for label, signal in actions:
+            action = menu.addAction(label)
+            action.triggered.connect(lambda checked=False, s=signal: s.emit(channel, entry))
+        menu.exec(pos)
+
+    def _on_entry_activated(self, channel: LiveStream, entry: EpgEntry):
+        if channel.tv_archive and entry.start_timestamp <= datetime.now().timestamp():
+            self.catchup_requested.emit(channel, entry)
@@ -2,16 +2,24 @@
 EPG: Programmfuehrer laden, anzeigen, Catchup abspielen
 """
 import asyncio
+import time
 import aiohttp
 from datetime import datetime
+from typing import Optional
 
 from PySide6.QtCore import Qt, Slot, QPropertyAnimation, QEasingCurve
-from PySide6.QtWidgets import QListWidgetItem, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
+from PySide6.QtWidgets import QListWidgetItem
 from PySide6.QtGui import QPixmap
 
 from xtream_api import LiveStream, EpgEntry
 from favorites_manager import Favorite
-from epg_dialog import EpgDialog
+from async_profiler import operation
+from task_scopes import SCOPE_EPG
+
+# Gleichzeitige EPG-Abrufe beim Nachladen im Programmfuehrer
+EPG_GRID_CONCURRENCY = 4
+# Zuletzt gesehene Live-Sender, deren EPG der Refresher aktuell haelt
+EPG_REFRESH_RECENT = 10
 
 
 class EpgMixin:
@@ -44,22 +52,28 @@ class EpgMixin:
             asyncio.ensure_future(self._load_epg_panel_logo(icon_url))
             # Detail-Panel anzeigen (nur wenn kein Player aktiv)
             self._show_channel_detail(data)
-            asyncio.ensure_future(self._load_epg(stream_id))
+            self.task_scopes.spawn(SCOPE_EPG, self._load_epg(stream_id))
         else:
             self._clear_epg_panel()
             self._hide_channel_detail()
 
+    @operation
     async def _load_epg(self, stream_id: int):
         """Load EPG data for a stream"""
-        if stream_id in self._epg_cache:
+        fresh = time.time() - self.epg_store.updated_at(stream_id) < self.epg_refresher.interval
+        if stream_id in self._epg_cache and fresh:
             epg = self._epg_cache[stream_id]
             self._update_epg_panel(epg)
             self._update_detail_epg(epg)
             return
 
+        api = self.api
         try:
-            epg_data = await self.api.get_short_epg(stream_id, limit=8)
+            epg_data = await api.get_short_epg(stream_id, limit=8)
+            if self.api is not api:
+                return  # Account inzwischen gewechselt
             self._epg_cache[stream_id] = epg_data
+            self.epg_store.put(stream_id, epg_data)
             if self._current_epg_stream_id == stream_id:
                 self._update_epg_panel(epg_data)
                 # Detail-Panel aktualisieren wenn es diesen Sender zeigt
@@ -70,6 +84,42 @@ class EpgMixin:
         except Exception:
             self._clear_epg_panel()
 
+    # ── Hintergrund-Refresher ─────────────────────────────────────────
+
+    async def _fetch_short_epg(self, stream_id: int) -> Optional[list[EpgEntry]]:
+        """Kurz-EPG fuer den Refresher; None, wenn der Account waehrend des
+        Abrufs gewechselt wurde (reset() bricht laufende Abrufe nicht ab)"""
+        api = self.api
+        if not api:
+            return None
+        entries = await api.get_short_epg(stream_id, limit=8)
+        return entries if self.api is api else None
+
+    def _epg_refresh_targets(self) -> list[int]:
+        """Laufender Live-Sender, Live-Favoriten, zuletzt gesehene Live-Sender"""
+        account = self.account_manager.get_selected()
+        if not self.api or not account:
+            return []
+        ids = []
+        if self._current_stream_type == "live" and self._current_playing_stream_id:
+            ids.append(self._current_playing_stream_id)
+        ids.extend(fav.id for fav in self.favorites_manager.get_by_type("live", account.name))
+        recent = [e.stream_id for e in self.history_manager.get_all(account.name)
+                  if e.stream_type == "live"]
+        ids.extend(recent[:EPG_REFRESH_RECENT])
+        return ids
+
+    def _on_epg_refreshed(self, stream_id: int, entries: list[EpgEntry]):
+        if not entries:
+            return  # vorhandene Daten nicht durch eine leere Antwort ersetzen
+        self._epg_cache[stream_id] = entries
+        if self._current_epg_stream_id == stream_id:
+            self._update_epg_panel(entries)
+            detail_id = getattr(self._detail_stream_data, 'stream_id',
+                                getattr(self._detail_stream_data, 'id', None))
+            if self.channel_detail_panel.isVisible() and detail_id == stream_id:
+                self._update_detail_epg(entries)
+
     def _update_epg_panel(self, epg_data: list[EpgEntry]):
         """Update EPG panel with data"""
         if not epg_data:
@@ -130,9 +180,10 @@ class EpgMixin:
             self.epg_next_title.setText("")
 
         self.btn_full_epg.setEnabled(True)
-        # Fuer Hover-Overlay bereitstellen (auch wenn Detail-Panel nicht offen ist)
-        self._detail_now_entry = current_entry
-        self._detail_next_entry = next_entry
+        # Fuer Hover-Overlay bereitstellen (auch wenn Detail-Panel nicht offen ist);
+        # die Detailpanel-Eintraege setzt allein _update_detail_epg
+        self._overlay_now_entry = current_entry
+        self._overlay_next_entry = next_entry
 
     def _clear_epg_panel(self):
         """Clear EPG panel"""
@@ -169,6 +220,7 @@ class EpgMixin:
         self._show_loading("Lade vollstaendiges Programm...")
         try:
             epg_data = await self.api.get_full_epg(stream_id)
+            self.epg_store.put(stream_id, epg_data)
             if not epg_data:
                 epg_data = self._epg_cache.get(stream_id, [])
             if self._current_epg_stream_id == stream_id:
@@ -181,6 +233,7 @@ class EpgMixin:
 
     def _open_epg_dialog(self, epg_data: list[EpgEntry], has_catchup: bool):
         """Oeffnet den EPG-Dialog (non-blocking mit open())"""
+        from epg_dialog import EpgDialog
         channel_name = self.epg_channel_name.text()
         self._epg_dialog = EpgDialog(
             channel_name, epg_data, has_catchup=has_catchup,
@@ -197,17 +250,22 @@ class EpgMixin:
         if dialog and dialog.selected_catchup_entry is not None:
             self._play_catchup(dialog.selected_catchup_entry)
 
-    def _play_catchup(self, entry: EpgEntry):
-        """Spielt eine vergangene/aktuelle Sendung via Catchup ab (EPG bleibt sichtbar)."""
-        if not self.api or self._current_epg_stream_id is None:
+    def _play_catchup(self, entry: EpgEntry, channel: Optional[LiveStream] = None):
+        """Spielt eine vergangene/aktuelle Sendung via Catchup ab (EPG bleibt sichtbar).
+
+        Ohne `channel` gilt der Sender des EPG-Panels.
+        """
+        if channel is not None:
+            stream_id, channel_name = channel.stream_id, channel.name
+        else:
+            stream_id, channel_name = self._current_epg_stream_id, self.epg_channel_name.text()
+        if not self.api or stream_id is None:
             return
 
-        stream_id = self._current_epg_stream_id
         duration_min = max(1, (entry.stop_timestamp - entry.start_timestamp) // 60)
         start = datetime.fromtimestamp(entry.start_timestamp)
-        url = self.api.creds.catchup_url(stream_id, start, duration_min)
+        url = self._timeshift_url(stream_id, start, duration_min)
 
-        channel_name = self.epg_channel_name.text()
         start_str = start.strftime("%H:%M")
         end_str = datetime.fromtimestamp(entry.stop_timestamp).strftime("%H:%M")
         title = f"{channel_name} \u2013 {entry.title} ({start_str}\u2013{end_str})"
@@ -219,6 +277,69 @@ class EpgMixin:
         self._timeshift_start_ts = entry.start_timestamp
         self._update_seek_controls_visibility()
 
+    # ── Programmfuehrer (Grid) ────────────────────────────────────────
+
+    def _open_epg_grid(self):
+        """Oeffnet den Programmfuehrer fuer die Sender der aktuellen Live-Kategorie"""
+        if not self.api or self.current_mode != "live":
+            return
+        channels = []
+        for i in range(self.channel_list.count()):
+            data = self.channel_list.item(i).data(Qt.UserRole)
+            if isinstance(data, LiveStream):
+                channels.append(data)
+        if not channels:
+            return
+        name = self._category_items[self._current_category_index][0] \
+            if self._current_category_index >= 0 else "Live"
+        from epg_grid import EpgGridDialog
+        dialog = EpgGridDialog(name, channels, self.epg_store, parent=self)
+        # Obergrenze gilt fuer alle Nachlade-Batches des Dialogs zusammen
+        self._epg_grid_semaphore = asyncio.Semaphore(EPG_GRID_CONCURRENCY)
+        dialog.grid.channels_needed.connect(
+            lambda ids: asyncio.ensure_future(self._load_grid_epg(ids))
+        )
+        dialog.catchup_requested.connect(self._play_grid_catchup)
+        dialog.schedule_requested.connect(self._schedule_grid_entry)
+        dialog.finished.connect(self._on_epg_grid_finished)
+        self._epg_grid_dialog = dialog
+        dialog.open()
+
+    def _on_epg_grid_finished(self):
+        self._epg_grid_dialog = None
+
+    async def _load_grid_epg(self, stream_ids: list[int]):
+        """Laedt das vollstaendige EPG sichtbarer Sender in den EpgStore"""
+        api = self.api
+        semaphore = self._epg_grid_semaphore
+
+        async def load(stream_id: int):
+            async with semaphore:
+                if self.api is not api or self._epg_grid_dialog is None:
+                    return
+                try:
+                    entries = await api.get_full_epg(stream_id)
+                except Exception:
+                    # Nach Backoff erneut versuchen, sobald der Sender sichtbar ist
+                    if self._epg_grid_dialog is not None:
+                        self._epg_grid_dialog.grid.request_failed([stream_id])
+                    return
+                if self.api is not api:
+                    return
+                self.epg_store.put(stream_id, entries)
+                if self._epg_grid_dialog is not None:
+                    self._epg_grid_dialog.grid.invalidate_channel(stream_id)
+
+        await asyncio.gather(*(load(sid) for sid in stream_ids))
+
+    def _play_grid_catchup(self, channel: LiveStream, entry: EpgEntry):
+        if self._epg_grid_dialog is not None:
+            self._epg_grid_dialog.accept()
+        self._play_catchup(entry, channel)
+
+    def _schedule_grid_entry(self, channel: LiveStream, entry: EpgEntry):
+        self._schedule_from_epg(entry, channel)
+
     def _play_detail_prev(self):
         """Spielt die vorherige Sendung via Catchup ab."""
         if self._detail_prev_entry:
@@ -272,7 +393,7 @@ class EpgMixin:
 
         stream_id = getattr(stream_data, 'stream_id', None) or getattr(stream_data, 'id', None)
         if stream_id:
-            asyncio.ensure_future(self._load_epg(stream_id))
+            self.task_scopes.spawn(SCOPE_EPG, self._load_epg(stream_id))
 
     def _hide_channel_detail(self):
         """Versteckt das Kanal-Detailpanel mit Slide-Animation."""
@@ -346,7 +467,7 @@ class EpgMixin:
             elif entry.start_timestamp > now:
                 future.append(entry)
 
-        future = future[:3]
+        future = future[:len(self._detail_future_rows)]
 
         # Eintraege fuer Play-Button-Callbacks speichern
         self._detail_prev_entry = prev
@@ -379,14 +500,6 @@ class EpgMixin:
                 self.detail_now_desc.show()
             else:
                 self.detail_now_desc.hide()
-            # 📹-Button fuer JETZT verdrahten
-            try:
-                self.detail_now_rec_btn.clicked.disconnect()
-            except RuntimeError:
-                pass
-            self.detail_now_rec_btn.clicked.connect(
-                lambda checked=False, e=current: self._schedule_from_epg(e)
-            )
             self.detail_now_rec_btn.show()
         else:
             self.detail_now_title.setText("Keine EPG-Daten")
@@ -395,54 +508,32 @@ class EpgMixin:
             self.detail_now_desc.hide()
             self.detail_now_rec_btn.hide()
 
-        # DANACH: bis zu 3 zukuenftige Eintraege dynamisch aufbauen
-        while self.detail_future_layout.count():
-            item = self.detail_future_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        if future:
-            for entry in future:
+        # DANACH: feste Zeilen befuellen, ueberzaehlige ausblenden
+        self._detail_future_entries = future
+        for i, (entry_w, title_lbl, time_lbl) in enumerate(self._detail_future_rows):
+            if i < len(future):
+                entry = future[i]
                 s = datetime.fromtimestamp(entry.start_timestamp).strftime("%H:%M")
                 e_time = datetime.fromtimestamp(entry.stop_timestamp).strftime("%H:%M")
-                entry_w = QWidget()
-                entry_w.setStyleSheet("background: transparent;")
-                entry_lay = QVBoxLayout(entry_w)
-                entry_lay.setContentsMargins(0, 0, 0, 0)
-                entry_lay.setSpacing(2)
-                title_lbl = QLabel(entry.title)
-                title_lbl.setStyleSheet("font-size: 15px; color: #aaa;")
-                title_lbl.setWordWrap(True)
-                entry_lay.addWidget(title_lbl)
-                # Zeitzeile + 📹-Button
-                time_row = QHBoxLayout()
-                time_row.setSpacing(6)
-                time_lbl = QLabel(f"{s} \u2013 {e_time}")
-                time_lbl.setStyleSheet("font-size: 12px; color: #555;")
-                time_row.addWidget(time_lbl, stretch=1)
-                rec_btn = QPushButton("\U0001F4F9")
-                rec_btn.setToolTip("Aufnahme planen")
-                rec_btn.setFixedHeight(26)
-                rec_btn.setStyleSheet("""
-                    QPushButton {
-                        background: transparent; color: #666;
-                        border: 1px solid #333; border-radius: 3px;
-                        font-size: 15px; padding: 0 5px;
-                    }
-                    QPushButton:hover { background: #c0392b; color: white; border-color: #c0392b; }
-                """)
-                rec_btn.clicked.connect(
-                    lambda checked=False, e=entry: self._schedule_from_epg(e)
-                )
-                time_row.addWidget(rec_btn, alignment=Qt.AlignVCenter)
-                entry_lay.addLayout(time_row)
-                self.detail_future_layout.addWidget(entry_w)
-            self.detail_future_section.show()
-        else:
-            self.detail_future_section.hide()
+                title_lbl.setText(entry.title)
+                time_lbl.setText(f"{s} \u2013 {e_time}")
+                entry_w.show()
+            else:
+                entry_w.hide()
+        self.detail_future_section.setVisible(bool(future))
 
         self.detail_epg_action_btn.setEnabled(True)
 
+    def _schedule_detail_now(self):
+        """📹 bei JETZT im Detailpanel"""
+        if self._detail_now_entry:
+            self._schedule_from_epg(self._detail_now_entry)
+
+    def _schedule_detail_future(self, index: int):
+        """📹 bei einer DANACH-Zeile im Detailpanel"""
+        if index < len(self._detail_future_entries):
+            self._schedule_from_epg(self._detail_future_entries[index])
+
     async def _load_detail_logo(self, url: str):
         """Laedt das Senderlogo und setzt es als 80x80 Icon."""
         try:
@@ -472,12 +563,15 @@ class EpgMixin:
         except Exception:
             pass
 
-    def _schedule_from_epg(self, entry):
-        """Oeffnet den Planungsdialog fuer eine EPG-Sendung."""
-        if not self.api or self._current_epg_stream_id is None:
+    def _schedule_from_epg(self, entry, channel: Optional[LiveStream] = None):
+        """Oeffnet den Planungsdialog fuer eine EPG-Sendung (ohne `channel`: Sender des EPG-Panels)."""
+        if channel is not None:
+            stream_id, channel_name = channel.stream_id, channel.name
+        else:
+            stream_id, channel_name = self._current_epg_stream_id, self.epg_channel_name.text()
+        if not self.api or stream_id is None:
             return
-        channel_name = self.epg_channel_name.text()
-        stream_url = self.api.creds.stream_url(self._current_epg_stream_id)
+        stream_url = self.api.creds.stream_url(stream_id)
         self._open_schedule_dialog(
             channel_name=channel_name,
             stream_url=stream_url,
@@ -492,8 +586,7 @@ class EpgMixin:
         if not data or not self.api:
             return
         if isinstance(data, LiveStream):
-            url = self.api.creds.stream_url(data.stream_id)
-            self._play_stream(url, data.name, "live", data.stream_id, icon=data.stream_icon)
+            self._play_live_channel(data.stream_id, data.name, icon=data.stream_icon,
+                                    tv_archive=bool(data.tv_archive))
         elif isinstance(data, Favorite) and data.type == "live":
-            url = self.api.creds.stream_url(data.id)
-            self._play_stream(url, data.name, "live", data.id, icon=data.icon or "")
+            self._play_live_channel(data.id, data.name, icon=data.icon or "")
@@ -0,0 +1,161 @@
+"""
+Hintergrund-Aktualisierung des kurzen EPG fuer Favoriten und zuletzt gesehene
+Live-Sender: Jetzt/Danach ist beim Oeffnen sofort da, und an Programmgrenzen
+liegt die naechste Sendung bereits vor
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+
+from epg_store import EpgStore
+from xtream_api import EpgEntry
+
+# Kurz-EPG gilt nach dieser Zeit als veraltet
+REFRESH_INTERVAL_S = 15 * 60
+# So weit in die Zukunft muss das bekannte Programm mindestens reichen
+LOOKAHEAD_S = 30 * 60
+# Sender ohne (ausreichende) EPG-Daten beim Anbieter nicht staendig neu fragen
+_EMPTY_RETRY_S = 5 * 60
+# Pruefintervall der Schleife; poke() weckt sofort
+_MAX_SLEEP_S = 60.0
+# Abstand zwischen zwei Requests eines Slots (niedrige Prioritaet)
+_REQUEST_GAP_S = 0.25
+_BACKOFF_BASE_S = 30.0
+_BACKOFF_MAX_S = 30 * 60.0
+# Ab so vielen Fehlern in Folge pausiert der ganze Durchlauf (Server down)
+_GLOBAL_BACKOFF_AFTER = 3
+# EpgStore aufraeumen: Archiv aelter als ARCHIVE_KEEP_S und Sender, die so lange
+# nicht abgefragt wurden (z.B. aus dem Programmfuehrer), verwerfen
+PRUNE_INTERVAL_S = 10 * 60
+ARCHIVE_KEEP_S = 8 * 24 * 3600
+IDLE_EVICT_S = 30 * 60
+
+
+class EpgRefresher:
+    """Haelt das kurze EPG einer wechselnden Sender-Liste aktuell.
+
+    `targets()` liefert die Stream-IDs in Prioritaetsreihenfolge (z.B.
+    laufender Sender, Favoriten, Verlauf), `fetch(stream_id)` laedt das
+    kurze EPG (None: Ergebnis veraltet, verwerfen). Ergebnisse landen im EpgStore und werden ueber
+    `on_updated(stream_id, entries)` gemeldet. Hoechstens `max_concurrent`
+    Requests gleichzeitig; Fehler fuehren zu exponentiellem Backoff je
+    Sender, mehrere Fehler in Folge pausieren den gesamten Durchlauf.
+    """
+
+    def __init__(self, store: EpgStore,
+                 fetch: Callable[[int], Awaitable[Optional[list[EpgEntry]]]],
+                 targets: Callable[[], Iterable[int]],
+                 on_updated: Callable[[int, list[EpgEntry]], None],
+                 interval: float = REFRESH_INTERVAL_S, lookahead: float = LOOKAHEAD_S,
+                 max_concurrent: int = 2):
+        self.store = store
+        self.fetch = fetch
+        self.targets = targets
+        self.on_updated = on_updated
+        self.interval = interval
+        self.lookahead = lookahead
+        self.max_concurrent = max_concurrent
+        self._failures: dict[int, int] = {}
+        self._retry_at: dict[int, float] = {}
+        self._errors_in_row = 0
+        self._paused_until = 0.0
+        self._pruned_at = time.time()
+        self._wakeup = asyncio.Event()
+
+    def poke(self):
+        """Sofort pruefen (Senderwechsel, neue Favoriten, Account-Wechsel)"""
+        self._wakeup.set()
+
+    def reset(self):
+        """Backoff-Zustand verwerfen (z.B. nach Account-Wechsel)"""
+        self._failures.clear()
+        self._retry_at.clear()
+        self._errors_in_row = 0
+        self._paused_until = 0.0
+        self.poke()
+
+    def is_due(self, stream_id: int, now: float) -> bool:
+        if now < self._retry_at.get(stream_id, 0.0):
+            return False
+        age = now - self.store.updated_at(stream_id)
+        if age >= self.interval:
+            return True
+        # Programmgrenze: die bekannte Zukunft ist zu kurz
+        upcoming = self.store.window(stream_id, now, now + self.lookahead)
+        covered = upcoming and upcoming[-1].stop_timestamp >= now + self.lookahead
+        return not covered and age >= _EMPTY_RETRY_S
+
+    async def refresh_due(self) -> int:
+        """Einen Durchlauf ueber alle faelligen Sender; gibt die Anzahl der Updates zurueck"""
+        now = time.time()
+        if now < self._paused_until:
+            return 0
+        due = [sid for sid in dict.fromkeys(self.targets()) if self.is_due(sid, now)]
+        if not due:
+            return 0
+
+        queue = list(reversed(due))  # pop() liefert die hoechste Prioritaet zuerst
+        updated = 0
+
+        async def worker():
+            nonlocal updated
+            while queue and time.time() >= self._paused_until:
+                stream_id = queue.pop()
+                if await self._refresh(stream_id):
+                    updated += 1
+                await asyncio.sleep(_REQUEST_GAP_S)
+
+        await asyncio.gather(*(worker() for _ in range(min(self.max_concurrent, len(due)))))
+        return updated
+
+    async def _refresh(self, stream_id: int) -> bool:
+        try:
+            entries = await self.fetch(stream_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._on_error(stream_id)
+            return False
+        if entries is None:
+            return False
+        self._failures.pop(stream_id, None)
+        self._retry_at.pop(stream_id, None)
+        self._errors_in_row = 0
+        self.store.put(stream_id, entries)
+        self.on_updated(stream_id, entries)
+        return True
+
+    def _on_error(self, stream_id: int):
+        now = time.time()
+        failures = self._failures.get(stream_id, 0) + 1
+        self._failures[stream_id] = failures
+        delay = min(_BACKOFF_MAX_S, _BACKOFF_BASE_S * 2 ** (failures - 1))
+        self._retry_at[stream_id] = now + delay
+        self._errors_in_row += 1
+        if self._errors_in_row >= _GLOBAL_BACKOFF_AFTER:
+            steps = self._errors_in_row - _GLOBAL_BACKOFF_AFTER
+            self._paused_until = now + min(_BACKOFF_MAX_S, _BACKOFF_BASE_S * 2 ** steps)
+
+    def prune_store(self, force: bool = False):
+        """Hoechstens alle PRUNE_INTERVAL_S: alte Sendungen und ungenutzte Sender verwerfen"""
+        now = time.time()
+        if not force and now - self._pruned_at < PRUNE_INTERVAL_S:
+            return
+        self._pruned_at = now
+        self.store.prune(now - ARCHIVE_KEEP_S, idle_before=now - IDLE_EVICT_S,
+                         keep=self.targets())
+
+    async def run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.refresh_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass  # Hintergrundjob: naechster Durchlauf versucht es erneut
+            self.prune_store()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=_MAX_SLEEP_S)
+            except asyncio.TimeoutError:
+                pass
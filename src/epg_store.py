@@ -0,0 +1,118 @@
+"""
+Lokaler EPG-Speicher: Sendungen je Sender nach Startzeit sortiert, Abfragen
+nach Zeitfenster per Binaersuche (fuer Programmfuehrer-Grid und Detailpanel)
+"""
+import time
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Optional
+
+from xtream_api import EpgEntry
+
+
+class _ChannelEpg:
+    __slots__ = ("entries", "starts", "updated", "used")
+
+    def __init__(self):
+        self.entries: list[EpgEntry] = []
+        self.starts: list[int] = []
+        self.updated = 0.0
+        self.used = 0.0  # letzter put() oder letzte Abfrage
+
+
+class EpgStore:
+    """Sendungen aller geladenen Sender, zeitlich indiziert.
+
+    `put()` fuegt neue Daten ein und ersetzt dabei alle vorhandenen
+    Sendungen im Zeitraum der neuen Daten (kurzes EPG und vollstaendiges
+    Archiv ergaenzen sich so). Ein Sender gilt auch mit leerer Liste als
+    geladen, damit er nicht staendig neu angefragt wird.
+    """
+
+    def __init__(self):
+        self._channels: dict[int, _ChannelEpg] = {}
+
+    def __contains__(self, stream_id) -> bool:
+        return stream_id in self._channels
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def clear(self):
+        self._channels.clear()
+
+    def put(self, stream_id: int, entries: Iterable[EpgEntry]):
+        new = sorted(
+            (e for e in entries if e.stop_timestamp > e.start_timestamp),
+            key=lambda e: e.start_timestamp,
+        )
+        channel = self._channels.get(stream_id)
+        if channel is None:
+            channel = self._channels[stream_id] = _ChannelEpg()
+        channel.updated = channel.used = time.time()
+        if not new:
+            return
+
+        first = new[0].start_timestamp
+        last = max(e.stop_timestamp for e in new)
+        # Vorhandene Sendungen ausserhalb des neuen Zeitraums behalten
+        lo = bisect_left(channel.starts, first)
+        hi = bisect_left(channel.starts, last)
+        before = channel.entries[:lo]
+        while before and before[-1].stop_timestamp > first:
+            before.pop()
+        merged = before + _dedupe(new) + channel.entries[hi:]
+        channel.entries = merged
+        channel.starts = [e.start_timestamp for e in merged]
+
+    def updated_at(self, stream_id: int) -> float:
+        """Zeitpunkt des letzten put() (0 = nie geladen)"""
+        channel = self._channels.get(stream_id)
+        return channel.updated if channel else 0.0
+
+    def entries(self, stream_id: int) -> list[EpgEntry]:
+        channel = self._channels.get(stream_id)
+        return list(channel.entries) if channel else []
+
+    def window(self, stream_id: int, start: float, stop: float) -> list[EpgEntry]:
+        """Alle Sendungen, die sich mit [start, stop) ueberschneiden"""
+        channel = self._channels.get(stream_id)
+        if channel is None:
+            return []
+        channel.used = time.time()
+        # Eine vor `start` beginnende Sendung kann noch hineinragen
+        i = max(0, bisect_right(channel.starts, start) - 1)
+        j = bisect_left(channel.starts, stop)
+        return [e for e in channel.entries[i:j] if e.stop_timestamp > start]
+
+    def at(self, stream_id: int, timestamp: float) -> Optional[EpgEntry]:
+        """Sendung, die zum Zeitpunkt laeuft"""
+        hits = self.window(stream_id, timestamp, timestamp + 1)
+        return hits[0] if hits else None
+
+    def prune(self, before: float, idle_before: float = 0.0, keep: Iterable[int] = ()):
+        """Sendungen entfernen, die vor `before` geendet haben; Sender, die seit
+        `idle_before` weder geladen noch abgefragt wurden, ganz verwerfen
+        (ausser denen in `keep`)"""
+        if idle_before:
+            keep = set(keep)
+            for stream_id in [sid for sid, ch in self._channels.items()
+                              if ch.used < idle_before and sid not in keep]:
+                del self._channels[stream_id]
+        for channel in self._channels.values():
+            i = 0
+            while i < len(channel.entries) and channel.entries[i].stop_timestamp <= before:
+                i += 1
+            if i:
+                del channel.entries[:i]
+                del channel.starts[:i]
+
+
+def _dedupe(entries: list[EpgEntry]) -> list[EpgEntry]:
+    """Doppelte Startzeiten (Panels liefern Sendungen teils mehrfach) entfernen"""
+    result = []
+    last_start = None
+    for entry in entries:
+        if entry.start_timestamp != last_start:
+            result.append(entry)
+            last_start = entry.start_timestamp
+    return result
@@ -8,6 +8,7 @@ from PySide6.QtWidgets import (
 
 from xtream_api import LiveStream, VodStream, Series
 from favorites_manager import Favorite
+from task_scopes import SCOPE_POSTERS
 
 
 class FavoritesMixin:
@@ -23,7 +24,6 @@ class FavoritesMixin:
 
     def _load_favorites(self):
         """Laedt und zeigt Favoriten an, gefiltert nach aktuellem Typ-Filter."""
-        import asyncio
         ftype = getattr(self, "_current_fav_filter", None)
         is_grid = ftype in ("vod", "series")
 
@@ -74,7 +74,7 @@ class FavoritesMixin:
         self.status_bar.showMessage(f"{len(favorites)} {label}")
 
         if is_grid:
-            asyncio.ensure_future(self._load_item_posters())
+            self.task_scopes.spawn(SCOPE_POSTERS, self._load_item_posters())
 
     def _is_item_favorite(self, data, account_name: str) -> bool:
         """Prueft ob ein Item ein Favorit ist"""
@@ -133,13 +133,13 @@ class FavoritesMixin:
             )
         return None
 
-    def _update_current_list_item_display(self):
-        """Aktualisiert die Anzeige der aktuellen Liste (Stern-Markierung)"""
+    def _update_current_list_item_display(self, start: int = 0):
+        """Aktualisiert die Anzeige der aktuellen Liste (Stern-Markierung) ab Zeile `start`"""
         account = self.account_manager.get_selected()
         if not account or self.current_mode == "favorites":
             return
 
-        for i in range(self.channel_list.count()):
+        for i in range(start, self.channel_list.count()):
             item = self.channel_list.item(i)
             data = item.data(Qt.UserRole)
             if not data:
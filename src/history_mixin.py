@@ -10,6 +10,7 @@ from PySide6.QtWidgets import (
 )
 
 from watch_history_manager import WatchEntry
+from recorder import MANUAL_JOB, RecordingLimitError
 
 
 class HistoryMixin:
@@ -94,7 +95,8 @@ class HistoryMixin:
             return
 
         files = sorted(
-            [f for f in rec_dir.iterdir() if f.is_file() and f.suffix in (".mkv", ".mp4", ".ts")],
+            [f for f in rec_dir.iterdir()
+             if f.is_file() and f.suffix in (".mkv", ".mp4", ".ts") and not f.name.startswith(".")],
             key=lambda f: f.stat().st_mtime,
             reverse=True
         )
@@ -218,23 +220,40 @@ class HistoryMixin:
 
     def _toggle_recording(self):
         """Startet oder stoppt die Aufnahme (aufrufbar von beiden Record-Buttons)"""
-        if self.recorder.is_recording:
-            # Stoppen
-            filepath = self.recorder.stop()
-            if filepath and filepath.exists() and filepath.stat().st_size > 0:
-                self.status_bar.showMessage(f"Aufnahme gespeichert: {filepath.name}")
+        if self.recorder.is_job_running(MANUAL_JOB):
+            # Stoppen (geplante Aufnahmen laufen weiter)
+            filepath = self.recorder.stop(MANUAL_JOB)
+            if filepath:
+                self.status_bar.showMessage(f"Aufnahme wird abgeschlossen: {filepath.name}")
             else:
                 self.status_bar.showMessage("Aufnahme gestoppt")
             self._sync_record_buttons(False)
         else:
             # Starten
-            if not self._current_stream_url:
+            if not self._current_source_url:
+                self._sync_record_buttons(False)
+                return
+            try:
+                # Provider-URL: der lokale Timeshift-Ring wird beim Zappen geloescht
+                filepath = self.recorder.start(self._current_source_url, self._current_stream_title)
+            except (RecordingLimitError, OSError) as e:
+                self.status_bar.showMessage(f"Aufnahme nicht moeglich: {e}")
                 self._sync_record_buttons(False)
                 return
-            filepath = self.recorder.start(self._current_stream_url, self._current_stream_title)
             self.status_bar.showMessage(f"Aufnahme: {filepath.name}")
             self._sync_record_buttons(True)
 
+    def _on_recording_finished(self, job):
+        """Callback des Recorders, sobald eine Aufnahme fertig abgeschlossen ist."""
+        if job.status == "done":
+            self.status_bar.showMessage(f"Aufnahme gespeichert: {job.file.name}")
+        else:
+            self.status_bar.showMessage(f"Aufnahme unvollstaendig (Log: {job.log_file.name})")
+        if job.job_id == MANUAL_JOB:
+            self._update_record_button()
+        if self.current_mode == "recordings":
+            self._load_recordings()
+
     def _sync_record_buttons(self, recording: bool):
         """Synchronisiert den Aufnahme-Status in allen Buttons."""
         tip = "Aufnahme stoppen" if recording else "Aufnahme starten"
@@ -247,12 +266,12 @@ class HistoryMixin:
 
     def _update_record_button(self):
         """Aktualisiert das Aussehen des Aufnahme-Buttons"""
-        self._sync_record_buttons(self.recorder.is_recording)
+        self._sync_record_buttons(self.recorder.is_job_running(MANUAL_JOB))
 
     def _update_recording_status(self):
         """Aktualisiert den Aufnahme-Status in der Statusbar"""
         # Button-State synchronisieren falls ffmpeg unerwartet beendet
-        if self.btn_record.isChecked() and not self.recorder.is_recording:
+        if self.btn_record.isChecked() and not self.recorder.is_job_running(MANUAL_JOB):
             self._sync_record_buttons(False)
             self.status_bar.showMessage("Aufnahme beendet (ffmpeg gestoppt)")
             return
@@ -264,6 +283,8 @@ class HistoryMixin:
                 time_str = f"{hours}:{mins:02d}:{secs:02d}"
             else:
                 time_str = f"{mins:02d}:{secs:02d}"
+            more = len(self.recorder.running_jobs()) - 1
+            extra = f" (+{more} weitere)" if more > 0 else ""
             self.status_bar.showMessage(
-                f"\u23FA Aufnahme: {self.recorder.current_title} - seit {time_str}"
+                f"\u23FA Aufnahme: {self.recorder.current_title} - seit {time_str}{extra}"
             )
@@ -0,0 +1,115 @@
+"""
+Original-Bilddaten (kodiert, wie vom Server geliefert) fuer Poster und Logos:
+neue Groessen werden lokal daraus skaliert statt neu heruntergeladen
+"""
+import math
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QPixmap
+
+# Voruebergehende Fehler (Timeout, 5xx, Verbindung) erst nach dieser Zeit erneut versuchen
+FAILED_RETRY_S = 5 * 60
+# Hoechstens so viele gesperrte URLs merken (aelteste fallen zuerst)
+MAX_FAILED = 5000
+
+
+class ImageSourceCache:
+    """LRU ueber die kodierten Bilddaten, begrenzt auf `max_bytes`.
+
+    Kodierte JPEG/PNG-Daten sind um ein Vielfaches kleiner als dekodierte
+    Bilder; beim Neuskalieren wird im Worker-Thread dekodiert.
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[str, bytes] = OrderedDict()
+        self._total = 0
+        self._failed: OrderedDict[str, float] = OrderedDict()  # URL -> gesperrt bis (monotonic)
+
+    def get(self, url: str) -> Optional[bytes]:
+        data = self._data.get(url)
+        if data is not None:
+            self._data.move_to_end(url)
+        return data
+
+    def put(self, url: str, data: bytes):
+        old = self._data.pop(url, None)
+        if old is not None:
+            self._total -= len(old)
+        if len(data) > self.max_bytes:
+            return
+        self._data[url] = data
+        self._total += len(data)
+        while self._total > self.max_bytes:
+            _, dropped = self._data.popitem(last=False)
+            self._total -= len(dropped)
+
+    def mark_failed(self, url: str, permanent: bool = False):
+        """Nicht erneut laden: dauerhaft (404, nicht dekodierbar) oder fuer FAILED_RETRY_S."""
+        self._failed.pop(url, None)
+        self._failed[url] = math.inf if permanent else time.monotonic() + FAILED_RETRY_S
+        while len(self._failed) > MAX_FAILED:
+            self._failed.popitem(last=False)
+
+    def failed(self, url: str) -> bool:
+        until = self._failed.get(url)
+        if until is None:
+            return False
+        if time.monotonic() < until:
+            return True
+        del self._failed[url]
+        return False
+
+
+class PixmapCache:
+    """LRU ueber skalierte Pixmaps (Schluessel: URL + Groesse), begrenzt auf `max_bytes`.
+
+    None-Eintraege (Bild nicht ladbar) zaehlen nur als Schluessel.
+    Gleiche Schnittstelle wie ein dict: `key in cache`, `cache[key]`, `cache[key] = pixmap`.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._items: OrderedDict[str, Optional[QPixmap]] = OrderedDict()
+        self._total = 0
+
+    @staticmethod
+    def _cost(pixmap: Optional[QPixmap]) -> int:
+        if pixmap is None:
+            return 64
+        return max(64, pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, key: str) -> Optional[QPixmap]:
+        pixmap = self._items[key]
+        self._items.move_to_end(key)
+        return pixmap
+
+    def __setitem__(self, key: str, pixmap: Optional[QPixmap]):
+        if key in self._items:
+            self._total -= self._cost(self._items.pop(key))
+        self._items[key] = pixmap
+        self._total += self._cost(pixmap)
+        while self._total > self.max_bytes and len(self._items) > 1:
+            _, dropped = self._items.popitem(last=False)
+            self._total -= self._cost(dropped)
+
+    def clear(self):
+        self._items.clear()
+        self._total = 0
+
+
+def decode_scaled(data: bytes, w: int, h: int) -> Optional[QImage]:
+    """Dekodiert und skaliert (KeepAspectRatio); QImage ist im Worker-Thread sicher."""
+    image = QImage.fromData(data)
+    if image.isNull():
+        return None
+    return image.scaled(w, h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
@@ -0,0 +1,45 @@
+"""
+JSON-Dekodierung: nutzt orjson oder msgspec wenn installiert, sonst die Standardbibliothek
+"""
+import json
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    _MSGSPEC_AVAILABLE = True
+except ImportError:
+    _MSGSPEC_AVAILABLE = False
+
+if _MSGSPEC_AVAILABLE:
+    _msgspec_decoder = msgspec.json.Decoder()
+
+
+def backend() -> str:
+    """Name des aktiven Decoders (fuer Diagnose/Benchmarks)"""
+    if _ORJSON_AVAILABLE:
+        return "orjson"
+    if _MSGSPEC_AVAILABLE:
+        return "msgspec"
+    return "json"
+
+
+def loads(body: bytes):
+    """Dekodiert einen JSON-Body. Leerer Body -> None (wie aiohttp resp.json()).
+
+    Fehler werden einheitlich als ValueError gemeldet.
+    """
+    if not body.strip():
+        return None
+    if _ORJSON_AVAILABLE:
+        return orjson.loads(body)  # orjson.JSONDecodeError ist ein ValueError
+    if _MSGSPEC_AVAILABLE:
+        try:
+            return _msgspec_decoder.decode(body)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+    return json.loads(body.decode("utf-8", errors="replace"))
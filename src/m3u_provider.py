@@ -6,11 +6,14 @@ import re
 import asyncio
 import aiohttp
 import ssl
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 from urllib.parse import urlparse
 
-from xtream_api import Category, LiveStream, VodStream, Series, EpgEntry
+from compute_executor import gc_paused, run_compute
+from xtream_api import (
+    Category, EpgEntry, LiveCatalog, VodCatalog, SeriesCatalog,
+)
 
 # Dateiendungen die als VOD erkannt werden
 _VOD_EXTENSIONS = {".mp4", ".mkv", ".avi", ".mov"}
@@ -20,7 +23,7 @@ _HTTP_HEADERS = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class _ParsedStream:
     name: str
     url: str
@@ -31,6 +34,194 @@ class _ParsedStream:
     stream_id: int = 0
 
 
+@dataclass
+class _M3uData:
+    live_categories: list[Category] = field(default_factory=list)
+    live_streams: dict[str, LiveCatalog] = field(default_factory=dict)
+    vod_categories: list[Category] = field(default_factory=list)
+    vod_streams: dict[str, VodCatalog] = field(default_factory=dict)
+    url_map: dict[int, str] = field(default_factory=dict)
+
+
+# Eintraege je Freigabe-Schritt in _parse_and_build bzw. je Teil der URL-Tabelle
+# beim Rueckweg aus dem Prozess-Pool
+_RELEASE_CHUNK = 5000
+_URL_MAP_CHUNK = 5000
+
+
+def _iter_lines(text: str):
+    """Zeilen einzeln liefern: text.splitlines() haelt bei grossen Playlists die
+    GIL am Stueck (>100 ms) und laesst die GUI-Loop im Thread-Modus stocken"""
+    start = 0
+    end = len(text)
+    while start < end:
+        stop = text.find("\n", start)
+        if stop < 0:
+            stop = end
+        yield text[start:stop]
+        start = stop + 1
+
+
+def _parse_m3u(text: str) -> list[_ParsedStream]:
+    """Parst M3U-Text in eine Liste von Streams"""
+    streams: list[_ParsedStream] = []
+    current_info: dict | None = None
+
+    for line in _iter_lines(text):
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.startswith("#EXTINF:"):
+            current_info = _parse_extinf(line)
+        elif not line.startswith("#") and current_info is not None:
+            # Stream-URL
+            url = line
+            name = current_info.get("name", "Unbekannt")
+            group = current_info.get("group", "Allgemein")
+            logo = current_info.get("logo", "")
+            tvg_id = current_info.get("tvg_id", "")
+
+            # VOD-Erkennung anhand Dateiendung (URL-Pfad ohne Query/Pseudo-Parameter)
+            url_path = urlparse(url.lower()).path.split("&")[0]
+            is_vod = any(url_path.endswith(ext) for ext in _VOD_EXTENSIONS)
+
+            streams.append(_ParsedStream(
+                name=name,
+                url=url,
+                group=group,
+                logo=logo,
+                tvg_id=tvg_id,
+                is_vod=is_vod,
+            ))
+            current_info = None
+
+    return streams
+
+def _parse_extinf(line: str) -> dict:
+    """Parst eine #EXTINF-Zeile"""
+    info: dict = {}
+
+    # tvg-id
+    m = re.search(r'tvg-id=["\']([^"\']*)["\']', line)
+    info["tvg_id"] = m.group(1) if m else ""
+
+    # tvg-logo
+    m = re.search(r'tvg-logo=["\']([^"\']*)["\']', line)
+    info["logo"] = m.group(1) if m else ""
+
+    # group-title (einfache und doppelte Anführungszeichen)
+    m = re.search(r'group-title=["\']([^"\']*)["\']', line)
+    info["group"] = m.group(1).strip() if m else "Allgemein"
+
+    # Kanal-Name (nach dem letzten Komma)
+    m = re.search(r',\s*(.+)$', line)
+    info["name"] = m.group(1).strip() if m else "Unbekannt"
+
+    return info
+
+
+def _build_data(streams: list[_ParsedStream]) -> _M3uData:
+    """Baut Kategorien und Stream-Kataloge aus geparsten Daten"""
+    data = _M3uData()
+
+    live_groups: dict[str, list[_ParsedStream]] = {}
+    vod_groups: dict[str, list[_ParsedStream]] = {}
+
+    # Streams nach Gruppe und Typ sortieren
+    stream_id = 1
+    for s in streams:
+        s.stream_id = stream_id
+        data.url_map[stream_id] = s.url
+        stream_id += 1
+
+        if s.is_vod:
+            vod_groups.setdefault(s.group, []).append(s)
+        else:
+            live_groups.setdefault(s.group, []).append(s)
+
+    # Live-Kategorien + Streams aufbauen
+    for cat_idx, (group_name, group_streams) in enumerate(sorted(live_groups.items()), start=1):
+        cat_id = str(cat_idx)
+        data.live_categories.append(Category(
+            category_id=cat_id,
+            category_name=group_name,
+        ))
+        data.live_streams[cat_id] = LiveCatalog.from_columns(
+            stream_id=[s.stream_id for s in group_streams],
+            name=[s.name for s in group_streams],
+            stream_icon=[s.logo for s in group_streams],
+            epg_channel_id=[s.tvg_id for s in group_streams],
+            category_id=[cat_id] * len(group_streams),
+        )
+
+    # VOD-Kategorien + Streams aufbauen
+    cat_offset = len(data.live_categories)
+    for cat_idx, (group_name, group_streams) in enumerate(sorted(vod_groups.items()), start=cat_offset + 1):
+        cat_id = str(cat_idx)
+        data.vod_categories.append(Category(
+            category_id=cat_id,
+            category_name=group_name,
+        ))
+        data.vod_streams[cat_id] = VodCatalog.from_columns(
+            stream_id=[s.stream_id for s in group_streams],
+            name=[s.name for s in group_streams],
+            stream_icon=[s.logo for s in group_streams],
+            category_id=[cat_id] * len(group_streams),
+            container_extension=[_container_extension(s.url) for s in group_streams],
+        )
+
+    return data
+
+
+def _parse_and_build(text: str) -> _M3uData:
+    """Parsen + Aufbau in einem Schritt (laeuft im Compute-Executor)"""
+    with gc_paused():
+        streams = _parse_m3u(text)
+        if not streams:
+            raise ValueError("Keine Kanaele in der Playlist gefunden")
+        data = _build_data(streams)
+        # Zwischenobjekte stueckweise freigeben: die ganze Liste auf einmal haelt
+        # die GIL bei 300k Eintraegen ~35 ms am Stueck
+        while streams:
+            del streams[-_RELEASE_CHUNK:]
+        return data
+
+
+def _split_data(data: _M3uData) -> list[tuple]:
+    """Zerlegt _M3uData fuer den Prozess-Pool in einzeln picklebare Teile"""
+    parts: list[tuple] = [("categories", data.live_categories, data.vod_categories)]
+    parts.extend(("live", cat_id, catalog) for cat_id, catalog in data.live_streams.items())
+    parts.extend(("vod", cat_id, catalog) for cat_id, catalog in data.vod_streams.items())
+    urls = list(data.url_map.items())
+    for start in range(0, len(urls), _URL_MAP_CHUNK):
+        parts.append(("urls", urls[start:start + _URL_MAP_CHUNK]))
+    return parts
+
+
+def _join_data(parts: list[tuple]) -> _M3uData:
+    data = _M3uData()
+    # Verarbeitete Teile sofort freigeben statt die ganze Liste am Stueck
+    parts.reverse()
+    while parts:
+        part = parts.pop()
+        kind = part[0]
+        if kind == "categories":
+            data.live_categories, data.vod_categories = part[1], part[2]
+        elif kind == "live":
+            data.live_streams[part[1]] = part[2]
+        elif kind == "vod":
+            data.vod_streams[part[1]] = part[2]
+        else:
+            data.url_map.update(part[1])
+    return data
+
+
+def _container_extension(url: str) -> str:
+    path = urlparse(url).path
+    return path.rsplit(".", 1)[-1] if "." in path else "mp4"
+
+
 class M3uCredsBridge:
     """Bridge-Klasse mit gleichen URL-Methoden wie XtreamCredentials"""
 
@@ -59,8 +250,8 @@ class M3uProvider:
         self._url = url
         self.creds = M3uCredsBridge(name)
 
-        self._live_streams: dict[str, list[LiveStream]] = {}  # cat_id -> streams
-        self._vod_streams: dict[str, list[VodStream]] = {}
+        self._live_streams: dict[str, LiveCatalog] = {}  # cat_id -> streams
+        self._vod_streams: dict[str, VodCatalog] = {}
         self._live_categories: list[Category] = []
         self._vod_categories: list[Category] = []
 
@@ -92,130 +283,16 @@ class M3uProvider:
         if text.startswith("\ufeff"):
             text = text[1:]
 
-        streams = self._parse_m3u(text)
-        if not streams:
-            raise ValueError("Keine Kanaele in der Playlist gefunden")
-        self._build_data(streams)
-
-    def _parse_m3u(self, text: str) -> list[_ParsedStream]:
-        """Parst M3U-Text in eine Liste von Streams"""
-        lines = text.splitlines()
-        streams: list[_ParsedStream] = []
-        current_info: dict | None = None
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            if line.startswith("#EXTINF:"):
-                current_info = self._parse_extinf(line)
-            elif not line.startswith("#") and current_info is not None:
-                # Stream-URL
-                url = line
-                name = current_info.get("name", "Unbekannt")
-                group = current_info.get("group", "Allgemein")
-                logo = current_info.get("logo", "")
-                tvg_id = current_info.get("tvg_id", "")
-
-                # VOD-Erkennung anhand Dateiendung (URL-Pfad ohne Query/Pseudo-Parameter)
-                url_path = urlparse(url.lower()).path.split("&")[0]
-                is_vod = any(url_path.endswith(ext) for ext in _VOD_EXTENSIONS)
-
-                streams.append(_ParsedStream(
-                    name=name,
-                    url=url,
-                    group=group,
-                    logo=logo,
-                    tvg_id=tvg_id,
-                    is_vod=is_vod,
-                ))
-                current_info = None
-
-        return streams
-
-    @staticmethod
-    def _parse_extinf(line: str) -> dict:
-        """Parst eine #EXTINF-Zeile"""
-        info: dict = {}
-
-        # tvg-id
-        m = re.search(r'tvg-id=["\']([^"\']*)["\']', line)
-        info["tvg_id"] = m.group(1) if m else ""
-
-        # tvg-logo
-        m = re.search(r'tvg-logo=["\']([^"\']*)["\']', line)
-        info["logo"] = m.group(1) if m else ""
-
-        # group-title (einfache und doppelte Anführungszeichen)
-        m = re.search(r'group-title=["\']([^"\']*)["\']', line)
-        info["group"] = m.group(1).strip() if m else "Allgemein"
-
-        # Kanal-Name (nach dem letzten Komma)
-        m = re.search(r',\s*(.+)$', line)
-        info["name"] = m.group(1).strip() if m else "Unbekannt"
-
-        return info
-
-    def _build_data(self, streams: list[_ParsedStream]):
-        """Baut Kategorien und Stream-Listen aus geparsten Daten"""
-        self._live_streams.clear()
-        self._vod_streams.clear()
-        self._live_categories.clear()
-        self._vod_categories.clear()
-        self.creds._url_map.clear()
-
-        live_groups: dict[str, list[_ParsedStream]] = {}
-        vod_groups: dict[str, list[_ParsedStream]] = {}
-
-        # Streams nach Gruppe und Typ sortieren
-        stream_id = 1
-        for s in streams:
-            s.stream_id = stream_id
-            self.creds._url_map[stream_id] = s.url
-            stream_id += 1
-
-            if s.is_vod:
-                vod_groups.setdefault(s.group, []).append(s)
-            else:
-                live_groups.setdefault(s.group, []).append(s)
-
-        # Live-Kategorien + Streams aufbauen
-        for cat_idx, (group_name, group_streams) in enumerate(sorted(live_groups.items()), start=1):
-            cat_id = str(cat_idx)
-            self._live_categories.append(Category(
-                category_id=cat_id,
-                category_name=group_name,
-            ))
-            self._live_streams[cat_id] = [
-                LiveStream(
-                    stream_id=s.stream_id,
-                    name=s.name,
-                    stream_icon=s.logo,
-                    epg_channel_id=s.tvg_id,
-                    category_id=cat_id,
-                )
-                for s in group_streams
-            ]
-
-        # VOD-Kategorien + Streams aufbauen
-        cat_offset = len(self._live_categories)
-        for cat_idx, (group_name, group_streams) in enumerate(sorted(vod_groups.items()), start=cat_offset + 1):
-            cat_id = str(cat_idx)
-            self._vod_categories.append(Category(
-                category_id=cat_id,
-                category_name=group_name,
-            ))
-            self._vod_streams[cat_id] = [
-                VodStream(
-                    stream_id=s.stream_id,
-                    name=s.name,
-                    stream_icon=s.logo,
-                    category_id=cat_id,
-                    container_extension=urlparse(s.url).path.rsplit(".", 1)[-1] if "." in urlparse(s.url).path else "mp4",
-                )
-                for s in group_streams
-            ]
+        await self.load_text(text)
+
+    async def load_text(self, text: str):
+        """Parst eine bereits geladene Playlist (ausserhalb der GUI-Loop)"""
+        data = await run_compute(_parse_and_build, text, split=_split_data, join=_join_data)
+        self._live_categories = data.live_categories
+        self._live_streams = data.live_streams
+        self._vod_categories = data.vod_categories
+        self._vod_streams = data.vod_streams
+        self.creds._url_map = data.url_map
 
     # --- Gleiche Schnittstelle wie XtreamAPI ---
 
@@ -228,30 +305,24 @@ class M3uProvider:
     async def get_live_categories(self) -> list[Category]:
         return self._live_categories
 
-    async def get_live_streams(self, category_id: Optional[str] = None) -> list[LiveStream]:
+    async def get_live_streams(self, category_id: Optional[str] = None) -> LiveCatalog:
         if category_id:
-            return self._live_streams.get(category_id, [])
-        all_streams = []
-        for streams in self._live_streams.values():
-            all_streams.extend(streams)
-        return all_streams
+            return self._live_streams.get(category_id, LiveCatalog())
+        return LiveCatalog.concat(self._live_streams.values())
 
     async def get_vod_categories(self) -> list[Category]:
         return self._vod_categories
 
-    async def get_vod_streams(self, category_id: Optional[str] = None) -> list[VodStream]:
+    async def get_vod_streams(self, category_id: Optional[str] = None) -> VodCatalog:
         if category_id:
-            return self._vod_streams.get(category_id, [])
-        all_streams = []
-        for streams in self._vod_streams.values():
-            all_streams.extend(streams)
-        return all_streams
+            return self._vod_streams.get(category_id, VodCatalog())
+        return VodCatalog.concat(self._vod_streams.values())
 
     async def get_series_categories(self) -> list[Category]:
         return []
 
-    async def get_series(self, category_id: Optional[str] = None) -> list[Series]:
-        return []
+    async def get_series(self, category_id: Optional[str] = None) -> SeriesCatalog:
+        return SeriesCatalog()
 
     async def get_short_epg(self, stream_id: int, limit: int = 2) -> list[EpgEntry]:
         return []
@@ -262,5 +333,8 @@ class M3uProvider:
     async def get_vod_info(self, vod_id: int) -> dict:
         return {}
 
+    async def get_series_info(self, series_id: int) -> dict:
+        return {}
+
     async def get_series_info_parsed(self, series_id: int) -> dict:
         return {"info": {}, "seasons": [], "episodes": {}}
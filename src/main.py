@@ -3,8 +3,12 @@
 MF IPTV Player
 Verwendet PySide6 und mpv
 """
+import startup_trace  # als erstes: Zeitbasis der Startmessung
+startup_trace.begin("imports")
+
 import sys
 import os
+import multiprocessing
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QPalette, QColor, QIcon
@@ -13,6 +17,8 @@ import asyncio
 
 from main_window import MainWindow
 
+startup_trace.end("imports")
+
 
 def _base_path() -> str:
     """Gibt den Basispfad zurueck (PyInstaller-kompatibel)."""
@@ -153,6 +159,7 @@ def setup_dark_theme(app: QApplication):
 
 
 def main():
+    startup_trace.begin("qapplication")
     app = QApplication(sys.argv)
     app.setApplicationName("MF IPTV Player")
     app.setOrganizationName("IPTVApp")
@@ -167,18 +174,26 @@ def main():
     else:
         icon_path = os.path.join(base, "icon.svg")
     app.setWindowIcon(QIcon(icon_path))
+    startup_trace.end("qapplication")
 
-    setup_dark_theme(app)
+    with startup_trace.phase("theme"):
+        setup_dark_theme(app)
 
     loop = qasync.QEventLoop(app)
     asyncio.set_event_loop(loop)
 
-    window = MainWindow()
-    window.show()
+    with startup_trace.phase("main_window"):
+        window = MainWindow()
+        window.show()
+    startup_trace.instant("window_shown")
+    startup_trace.arm_timeout()
 
     with loop:
         loop.run_forever()
 
 
 if __name__ == "__main__":
+    # Gefrorene Windows-Builds: Prozess-Pool-Worker (compute_executor) starten
+    # sonst erneut die ganze Anwendung
+    multiprocessing.freeze_support()
     main()
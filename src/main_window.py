@@ -4,13 +4,13 @@ Erbt von allen Mixin-Klassen, die jeweils einen Funktionsbereich abdecken.
 """
 import asyncio
 import platform
+from collections import OrderedDict
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QStackedWidget,
     QDialog, QVBoxLayout, QLabel, QProgressBar, QPushButton, QTextEdit, QApplication,
 )
 from PySide6.QtCore import Qt, QEvent, QTimer
-from PySide6.QtGui import QPixmap
 
 from xtream_api import XtreamAPI, Category
 from account_manager import AccountManager
@@ -19,6 +19,7 @@ from watch_history_manager import WatchHistoryManager
 from hidden_categories_manager import HiddenCategoriesManager
 from recorder import StreamRecorder
 from session_manager import SessionManager
+from stream_health import StreamHealthTracker
 
 from ui_builder import UiBuilderMixin
 from playback_mixin import PlaybackMixin
@@ -33,10 +34,22 @@ from stream_controls_mixin import StreamControlsMixin
 from account_mixin import AccountMixin
 from pip_mixin import PipMixin
 from channel_context_mixin import ChannelContextMixin
-from updater import UpdateChecker
 from app_settings import AppSettings
 from schedule_manager import ScheduleManager
+from recording_scheduler import RecordingScheduler
+from timeshift_buffer import TimeshiftBuffer
 from schedule_mixin import ScheduleMixin
+from detail_cache import DetailCache
+from image_source_cache import ImageSourceCache, PixmapCache
+from epg_store import EpgStore
+from epg_refresher import EpgRefresher
+import compute_executor
+import startup_trace
+import async_profiler
+from task_scopes import TaskScopes, SCOPE_POSTERS
+
+# Update-Pruefung nach dem Start verzoegern (Importe + Netzwerk nicht im Startpfad)
+UPDATE_CHECK_DELAY_S = 5.0
 
 
 class MainWindow(
@@ -67,8 +80,29 @@ class MainWindow(
         self.history_manager = WatchHistoryManager()
         self.hidden_categories_manager = HiddenCategoriesManager()
         self.session_manager = SessionManager()
-        self.recorder = StreamRecorder()
+        compute_executor.configure(self.app_settings.get("compute_executor", "thread"))
+        async_profiler.install(asyncio.get_event_loop(), self.app_settings.get("async_profile", False))
+        self.task_scopes = TaskScopes()
+        self.recorder = StreamRecorder(
+            max_concurrent=self.app_settings.get("recording_max_concurrent", 4),
+            bandwidth_budget_kbps=self.app_settings.get("recording_bandwidth_kbps", 0),
+            segmented=self.app_settings.get("recording_mode", "segmented") == "segmented",
+            on_finished=self._on_recording_finished,
+        )
         self.schedule_manager = ScheduleManager()
+        self._scheduled_jobs_started: set[str] = set()  # in dieser Sitzung gestartete Aufnahmen
+        self.recording_scheduler = RecordingScheduler(
+            self.schedule_manager,
+            on_due=self._check_scheduled_recordings,
+            pre_roll=self.app_settings.get("recording_pre_roll_s", 0),
+            post_roll=self.app_settings.get("recording_post_roll_s", 0),
+        )
+        self.stream_health = StreamHealthTracker()
+        self.timeshift_buffer = TimeshiftBuffer(
+            max_seconds=self.app_settings.get("local_timeshift_max_minutes", 60) * 60,
+            max_bytes=self.app_settings.get("local_timeshift_max_mb", 2048) * 1024 * 1024,
+        )
+        self.timeshift_buffer.cleanup_stale()
         self._editing_account_index = -1  # -1 = neu anlegen, >=0 = bearbeiten
         self.api: XtreamAPI | None = None
         self.current_mode = "live"  # live, vod, series, favorites, history, search
@@ -87,11 +121,28 @@ class MainWindow(
 
         # EPG Cache
         self._epg_cache: dict = {}
+        # Zeitlich indizierte Sendungen (Programmfuehrer, vollstaendiges EPG)
+        self.epg_store = EpgStore()
+        self._epg_grid_dialog = None
+        # Kurz-EPG fuer Favoriten/zuletzt gesehene Sender im Hintergrund aktuell halten
+        self.epg_refresher = EpgRefresher(
+            self.epg_store,
+            fetch=self._fetch_short_epg,
+            targets=self._epg_refresh_targets,
+            on_updated=self._on_epg_refreshed,
+            interval=self.app_settings.get("epg_refresh_interval_min", 15) * 60,
+        )
         self._current_epg_stream_id: int | None = None
         self._current_epg_has_catchup: bool = False
+        self._local_timeshift = False  # Wiedergabe laeuft ueber den lokalen TimeshiftBuffer
+        self._local_ts_generation = 0
+        self._local_snapshot_end = 0.0
         self._detail_prev_entry = None
         self._detail_now_entry = None
         self._detail_next_entry = None
+        self._overlay_now_entry = None   # JETZT/DANACH fuer den Hover-Overlay (EPG-Panel)
+        self._overlay_next_entry = None
+        self._detail_future_entries = []
 
         # Favoriten-Filter
         self._current_fav_filter = None  # None = Alle, "live"/"vod"/"series" = gefiltert
@@ -106,6 +157,8 @@ class MainWindow(
         self._current_stream_title: str = ""
         self._current_container_ext: str = ""
         self._current_stream_url: str = ""
+        self._current_source_url: str = ""  # Provider-URL (bei lokalem Timeshift nicht der Ring)
+        self._current_stream_ext: str = ""  # Container-Format des Live-Streams ("m3u8"/"ts")
 
         # Timeshift-Zustand
         self._timeshift_active = False
@@ -115,27 +168,70 @@ class MainWindow(
         # Reconnect-Zustand
         self._reconnect_attempt = 0
         self._max_reconnect_attempts = 5
+        self._reconnect_started_at: float = 0.0
+        self._reconnect_next_ext: str = ""
         self._stream_starting = False  # Schutzphase: end-file waehrend Start ignorieren
 
         # EPG-Zustand
         self._initial_epg_loaded = False
 
         # Poster-Cache
-        self._image_cache: dict[str, QPixmap | None] = {}
+        self._image_cache = PixmapCache(
+            max_bytes=self.app_settings.get("pixmap_cache_mb", 64) * 1024 * 1024
+        )
+        self._image_sources = ImageSourceCache(
+            max_bytes=self.app_settings.get("image_source_cache_mb", 128) * 1024 * 1024
+        )
         self._poster_load_generation = 0
-
-        self._update_checker = UpdateChecker()
+        self._posters_rendered_w = 0
+
+        # VOD/Serien-Kategorie: Sortier-Index des Katalogs, sortierte Ansicht, eingefuegte Zeilen
+        self._items_category_id: str | None = None
+        self._items_sort_index = None
+        self._sort_indexes: OrderedDict = OrderedDict()
+        self._items_view = None
+        self._items_shown = 0
+        self._poster_rescale_timer = QTimer()
+        self._poster_rescale_timer.setSingleShot(True)
+        self._poster_rescale_timer.setInterval(200)
+        self._poster_rescale_timer.timeout.connect(
+            lambda: self.task_scopes.spawn(SCOPE_POSTERS, self._load_item_posters())
+        )
+
+        # VOD-/Serien-Details: Cache + Vorladen der Nachbarn im Grid
+        self.detail_cache = DetailCache(ttl=self.app_settings.get("detail_cache_ttl_h", 24) * 3600)
+        self.detail_cache.cleanup_expired()
+        self._detail_prefetch_generation = 0
+        self._detail_prefetch_timer = QTimer()
+        self._detail_prefetch_timer.setSingleShot(True)
+        self._detail_prefetch_timer.setInterval(250)
+        self._detail_prefetch_timer.timeout.connect(self._prefetch_neighbour_details)
+
+        # Detailseiten werden erst beim ersten Oeffnen gebaut (_ensure_*_detail_page)
+        self._current_series = None
+        self._current_vod = None
+
+        # TMDB-Bewertungen (Cache + Hintergrund-Anreicherung ganzer VOD-Kategorien);
+        # der Dienst samt Cache-Datei wird erst beim ersten Zugriff geladen
+        self._tmdb_service = None
+        self._tmdb_enriched_categories: set[str] = set()
+
+        self._update_checker = None
         self._update_release_info = None
 
         self.setMinimumSize(920, 600)
         self.resize(1400, 900)  # Vernuenftige Restore-Groesse fuer Fensterleisten-Doppelklick
-        self._setup_ui()
-        self._setup_statusbar()
-        self._load_initial_account()
+        with startup_trace.phase("build_ui"):
+            self._setup_ui()
+            self._setup_statusbar()
+        with startup_trace.phase("account_load"):
+            self._load_initial_account()
         self.showMaximized()
 
         asyncio.ensure_future(self._check_for_updates())
         asyncio.ensure_future(self._schedule_checker_loop())
+        asyncio.ensure_future(self.epg_refresher.run())
+        asyncio.ensure_future(self.recorder.recover_orphans())
 
     def _setup_ui(self):
         central = QWidget()
@@ -154,13 +250,19 @@ class MainWindow(
         self.content_stack = QStackedWidget()
         main_layout.addWidget(self.content_stack)
 
-        # Seiten erstellen
-        self.settings_page = self._create_settings_page()
+        # Seiten erstellen (Einstellungen erst beim ersten Oeffnen, _ensure_settings_page)
+        self.settings_page = None
         self.main_page = self._create_main_page()
 
-        self.content_stack.addWidget(self.settings_page)
         self.content_stack.addWidget(self.main_page)
 
+    @property
+    def tmdb_service(self):
+        if self._tmdb_service is None:
+            from tmdb_service import TmdbService
+            self._tmdb_service = TmdbService()
+        return self._tmdb_service
+
     def eventFilter(self, obj, event):
         if event.type() == QEvent.Resize:
             if self.buffering_overlay.parentWidget() is obj:
@@ -233,17 +335,28 @@ class MainWindow(
 
     def closeEvent(self, event):
         self._save_current_position()
-        if self.recorder.is_recording:
-            self.recorder.stop()
+        self.recorder.stop_all()
+        self.stream_health.flush()
+        self.timeshift_buffer.stop()
         self.stream_info_timer.stop()
         self.controls_timer.stop()
         self.player.cleanup()
+        self.task_scopes.cancel_all()
+        compute_executor.get_executor().shutdown()
+        async_profiler.dump()
+        if self._tmdb_service is not None:
+            self._tmdb_service.flush()
+            asyncio.ensure_future(self._tmdb_service.close())
         super().closeEvent(event)
 
     # ── Auto-Update ──────────────────────────────────────────
 
     async def _check_for_updates(self):
+        # Erst nach dem Start pruefen: Fenster und Kategorien haben Vorrang
+        await asyncio.sleep(UPDATE_CHECK_DELAY_S)
         try:
+            from updater import UpdateChecker
+            self._update_checker = UpdateChecker()
             info = await self._update_checker.check_for_update()
         except Exception:
             return
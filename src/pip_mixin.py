@@ -1,7 +1,7 @@
 """
 PiP-Modus & Loading-Overlay
 """
-import asyncio
+from task_scopes import SCOPE_ITEMS
 
 
 class PipMixin:
@@ -128,4 +128,4 @@ class PipMixin:
             self.vod_categories = []
         elif self.current_mode == "series":
             self.series_categories = []
-        asyncio.ensure_future(self._load_categories())
+        self.task_scopes.spawn(SCOPE_ITEMS, self._load_categories())
@@ -1,5 +1,5 @@
 """
-Plattformabhaengige Pfade fuer Config und Aufnahmen
+Plattformabhaengige Pfade fuer Config, Cache und Aufnahmen
 """
 import os
 import sys
@@ -28,3 +28,18 @@ def get_recordings_dir() -> Path:
     if sys.platform == "win32":
         return Path.home() / "Videos" / "IPTV"
     return Path.home() / "Aufnahmen" / "IPTV"
+
+
+def get_cache_dir() -> Path:
+    """Gibt das Cache-Verzeichnis zurueck und erstellt es bei Bedarf.
+    Windows: %LOCALAPPDATA%/iptv-app/cache
+    Linux:   ~/.cache/iptv-app
+    """
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+        cache_dir = base / "iptv-app" / "cache"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+        cache_dir = base / "iptv-app"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
@@ -2,15 +2,21 @@
 Wiedergabe: Stream-Steuerung, Timeshift, Buffering, Player-Maximierung, Info-Overlay
 """
 import asyncio
+import time
 import aiohttp
 from datetime import datetime
+from typing import Optional
 
 from PySide6.QtCore import Qt, Slot, QTimer
 from PySide6.QtWidgets import QListWidgetItem
 
-from xtream_api import LiveStream, VodStream, Series, EpgEntry
+from xtream_api import XtreamAPI, LiveStream, VodStream, Series, EpgEntry
 from watch_history_manager import WatchEntry
 from favorites_manager import Favorite
+from stream_health import failure_class, FAILURE_STALL
+from recorder import MANUAL_JOB
+from timeshift_buffer import SEGMENT_SECONDS
+from task_scopes import SCOPE_EPG
 
 
 class PlaybackMixin:
@@ -41,10 +47,10 @@ class PlaybackMixin:
                 QMessageBox.Yes | QMessageBox.No,
             )
             if reply == QMessageBox.Yes:
-                if rec.status == "recording" or self.recorder.is_recording:
-                    self.recorder.stop()
-                    self._sync_record_buttons(False)
+                if rec.status == "recording":
+                    self.recorder.stop(rec.id)
                 self.schedule_manager.remove(rec.id)
+                self.recording_scheduler.reschedule()
                 self._load_recordings()
             return
 
@@ -57,9 +63,9 @@ class PlaybackMixin:
             self._current_epg_stream_id = data.stream_id
             self._current_epg_has_catchup = getattr(data, 'tv_archive', False)
             self.epg_channel_name.setText(data.name)
-            asyncio.ensure_future(self._load_epg(data.stream_id))
-            url = self.api.creds.stream_url(data.stream_id)
-            self._play_stream(url, data.name, "live", data.stream_id, icon=data.stream_icon)
+            self.task_scopes.spawn(SCOPE_EPG, self._load_epg(data.stream_id))
+            self._play_live_channel(data.stream_id, data.name, icon=data.stream_icon,
+                                    tv_archive=bool(data.tv_archive))
             QTimer.singleShot(350, self._show_info_overlay_zap)
             if data.category_id:
                 account = self.account_manager.get_selected()
@@ -76,8 +82,7 @@ class PlaybackMixin:
 
         elif isinstance(data, WatchEntry):
             if data.stream_type == "live":
-                url = self.api.creds.stream_url(data.stream_id)
-                self._play_stream(url, data.title, "live", data.stream_id, icon=data.icon)
+                self._play_live_channel(data.stream_id, data.title, icon=data.icon)
             elif data.stream_type == "vod":
                 vod = VodStream(
                     stream_id=data.stream_id, name=data.title,
@@ -88,8 +93,7 @@ class PlaybackMixin:
 
         elif isinstance(data, Favorite):
             if data.type == "live":
-                url = self.api.creds.stream_url(data.id)
-                self._play_stream(url, data.name, "live", data.id, icon=data.icon or "")
+                self._play_live_channel(data.id, data.name, icon=data.icon or "")
             elif data.type == "vod":
                 vod = VodStream(
                     stream_id=data.id, name=data.name,
@@ -101,8 +105,122 @@ class PlaybackMixin:
                 s = Series(series_id=data.id, name=data.name, cover=data.icon)
                 self._show_series_detail(s)
 
-    def _play_stream(self, url: str, title: str, stream_type: str = "live", stream_id: int = None, icon: str = "", container_extension: str = ""):
-        """Spielt einen Stream im integrierten Player ab"""
+    def _health_key(self, stream_id) -> str:
+        """Schluessel fuer den Gesundheits-Score eines Senders (pro Account)."""
+        account = self.account_manager.get_selected()
+        return f"{account.name if account else ''}:{stream_id}"
+
+    def _live_stream_url(self, stream_id: int) -> tuple[str, str]:
+        """Live-URL im Format mit dem besten Gesundheits-Score. Gibt (url, format) zurueck.
+
+        M3U-Playlists haben pro Sender genau eine URL: Format "" (kein Format-Fallback).
+        """
+        if not isinstance(self.api, XtreamAPI):
+            return self.api.creds.stream_url(stream_id), ""
+        ext = self.stream_health.preferred_format(self._health_key(stream_id))
+        return self.api.creds.stream_url(stream_id, extension=ext), ext
+
+    def _play_live_channel(self, stream_id: int, title: str, icon: str = "",
+                           tv_archive: Optional[bool] = None):
+        """Spielt einen Live-Sender im bevorzugten Container-Format ab.
+
+        Ohne Provider-Catchup und mit aktiviertem lokalem Timeshift laeuft der
+        Sender ueber den TimeshiftBuffer (mpv spielt aus dem lokalen Ring).
+        tv_archive=None: unbekannt (Favoriten/Verlauf speichern das Flag nicht),
+        wird dann im Live-Katalog nachgeschlagen.
+        """
+        if self.app_settings.get("local_timeshift_enabled", False) and not tv_archive:
+            asyncio.ensure_future(self._play_live_buffered(
+                stream_id, title, icon, lookup_archive=tv_archive is None))
+            return
+        url, ext = self._live_stream_url(stream_id)
+        self._play_stream(url, title, "live", stream_id, icon=icon, stream_ext=ext)
+
+    async def _lookup_tv_archive(self, stream_id: int) -> bool:
+        """Catchup-Flag eines Senders aus dem Live-Gesamtkatalog (wird mit der Suche geteilt)"""
+        catalog = self._search_cache_live
+        if not catalog:
+            api = self.api
+            try:
+                catalog = await api.get_live_streams()
+            except Exception:
+                return False
+            if api is not self.api:
+                return False  # Account inzwischen gewechselt
+            self._search_cache_live = catalog
+        try:
+            index = catalog.column("stream_id").index(stream_id)
+        except ValueError:
+            return False
+        return bool(catalog.column("tv_archive")[index])
+
+    async def _play_live_buffered(self, stream_id: int, title: str, icon: str,
+                                  lookup_archive: bool = False):
+        """Startet den lokalen Timeshift-Puffer und spielt daraus ab (Fallback: direkt).
+
+        Mit `lookup_archive` wird vorher geprueft, ob der Sender Provider-Catchup
+        hat; dann wird wie gewohnt direkt abgespielt.
+        """
+        self._local_ts_generation += 1
+        generation = self._local_ts_generation
+        url, ext = self._live_stream_url(stream_id)
+        if lookup_archive and await self._lookup_tv_archive(stream_id):
+            if generation == self._local_ts_generation:
+                self._play_stream(url, title, "live", stream_id, icon=icon, stream_ext=ext)
+            return
+        self.status_bar.showMessage(f"Timeshift-Puffer wird aufgebaut: {title}")
+        playlist = await self.timeshift_buffer.start(url, stream_id)
+        if generation != self._local_ts_generation:
+            return  # inzwischen anderer Sender gewaehlt oder gestoppt
+        if playlist is None:
+            self._play_stream(url, title, "live", stream_id, icon=icon, stream_ext=ext)
+            return
+        self._local_timeshift = True
+        self._play_stream(str(playlist), title, "live", stream_id, icon=icon, source_url=url)
+
+    def _stop_local_timeshift(self):
+        self._local_ts_generation += 1
+        self._local_timeshift = False
+        if self.timeshift_buffer.active or self.timeshift_buffer.stream_key is not None:
+            self.timeshift_buffer.stop()
+
+    def _timeshift_available(self) -> bool:
+        """Zurueckspulen moeglich: Provider-Catchup oder lokaler Timeshift-Puffer"""
+        return self._current_epg_has_catchup or self._local_timeshift
+
+    def _timeshift_url(self, stream_id: int, start: datetime, duration_min: int) -> str:
+        """URL fuer zeitversetzte Wiedergabe ab `start`.
+
+        Mit lokalem Puffer eine abgeschlossene Playlist aus dem Ring (Start auf
+        Segmentgrenze gerundet), sonst die Catchup-URL des Providers.
+        """
+        if self._local_timeshift and stream_id == self.timeshift_buffer.stream_key:
+            path, _ = self.timeshift_buffer.snapshot(start.timestamp())
+            self._local_snapshot_end = self.timeshift_buffer.window()[1]
+            return str(path)
+        return self.api.creds.catchup_url(stream_id, start, duration_min)
+
+    def _continue_local_timeshift(self):
+        """Ende der Momentaufnahme erreicht: mit neueren Segmenten weiterspielen oder live."""
+        if not self._local_timeshift or not self._timeshift_active:
+            return
+        _, live_end = self.timeshift_buffer.window()
+        resume_ts = self._local_snapshot_end
+        if live_end - resume_ts < 2 * SEGMENT_SECONDS:
+            self._go_live()
+            return
+        path, actual_start = self.timeshift_buffer.snapshot(resume_ts)
+        self._local_snapshot_end = live_end
+        self._timeshift_start_ts = actual_start
+        self.player.play(str(path))
+
+    def _play_stream(self, url: str, title: str, stream_type: str = "live", stream_id: int = None, icon: str = "", container_extension: str = "", stream_ext: str = "",
+                     source_url: str = ""):
+        """Spielt einen Stream im integrierten Player ab.
+
+        source_url: Provider-URL, wenn `url` der lokale Timeshift-Ring ist
+        (Aufnahmen laufen immer vom Provider).
+        """
         # Reconnect-Zustand zuruecksetzen
         self._stream_starting = True  # end-file waehrend Verbindungsaufbau ignorieren
         self._vod_eof_received = False  # Reset: Buffering-Overlay wieder erlauben
@@ -128,6 +246,11 @@ class PlaybackMixin:
             self.player_channel_logo.hide()
         # else: gleicher Sender (Catchup/Seek) → icon + Logo behalten
 
+        if not (self._local_timeshift and stream_type == "live"
+                and stream_id == self.timeshift_buffer.stream_key):
+            # Anderer Sender oder direkte Wiedergabe: Puffer (auch im Aufbau) verwerfen
+            self._stop_local_timeshift()
+
         self._current_stream_type = stream_type
         self._current_playing_stream_id = stream_id
 
@@ -137,6 +260,8 @@ class PlaybackMixin:
         self._current_stream_title = title
         self._current_container_ext = container_extension
         self._current_stream_url = url
+        self._current_source_url = source_url or url
+        self._current_stream_ext = stream_ext  # "" = kein Format-Fallback (VOD, Catchup, M3U)
         self._timeshift_active = False
         self._timeshift_paused_at = 0
         self._timeshift_start_ts = 0.0
@@ -177,6 +302,8 @@ class PlaybackMixin:
                 container_extension=container_extension,
             )
             self.history_manager.add_or_update(entry)
+        if stream_type == "live":
+            self.epg_refresher.poke()
 
     def _stop_playback(self):
         """Stoppt die Wiedergabe und versteckt den Player"""
@@ -186,9 +313,11 @@ class PlaybackMixin:
         self._reconnect_timer.stop()
         self._buffering_watchdog.stop()
         self._save_current_position()
-        if self.recorder.is_recording:
-            self.recorder.stop()
+        if self.recorder.is_job_running(MANUAL_JOB):
+            # Nur die manuelle Aufnahme haengt am Player; geplante laufen weiter
+            self.recorder.stop(MANUAL_JOB)
             self._update_record_button()
+        self._stop_local_timeshift()
         self.player.stop()
         self.buffering_overlay.hide()
         self.info_overlay.hide()
@@ -200,6 +329,8 @@ class PlaybackMixin:
         self._current_stream_type = None
         self._current_playing_stream_id = None
         self._current_stream_url = ""
+        self._current_source_url = ""
+        self._current_stream_ext = ""
         self._timeshift_active = False
         self._timeshift_paused_at = 0
         if self._player_maximized:
@@ -250,6 +381,14 @@ class PlaybackMixin:
             self._stream_start_timer.stop()
             if self._current_stream_type == "vod":
                 self._vod_has_played = True  # Stream hat tatsächlich gespielt
+            if self._current_stream_ext and (self._stream_starting or self._reconnect_attempt > 0):
+                recovered_after = 0.0
+                if self._reconnect_attempt > 0:
+                    recovered_after = time.monotonic() - self._reconnect_started_at
+                self.stream_health.record_success(
+                    self._health_key(self._current_playing_stream_id),
+                    self._current_stream_ext, recovered_after,
+                )
             if self._reconnect_attempt > 0:
                 self.status_bar.showMessage(f"Verbunden: {self._current_stream_title}", 4000)
             self._reconnect_attempt = 0
@@ -264,7 +403,7 @@ class PlaybackMixin:
     def _toggle_play_pause(self):
         """Play/Pause umschalten - mit Timeshift fuer Catchup-Sender"""
         if (self._current_stream_type == "live"
-                and self._current_epg_has_catchup
+                and self._timeshift_available()
                 and not self._timeshift_active):
             if self.player.is_playing:
                 # Pause bei Live mit Catchup: Timestamp merken
@@ -292,7 +431,7 @@ class PlaybackMixin:
         now = datetime.now().timestamp()
         duration_min = max(1, int((now - start_timestamp) / 60))
         start = datetime.fromtimestamp(start_timestamp)
-        url = self.api.creds.catchup_url(stream_id, start, duration_min)
+        url = self._timeshift_url(stream_id, start, duration_min)
 
         self._timeshift_active = True
         self._timeshift_start_ts = start_timestamp
@@ -309,11 +448,17 @@ class PlaybackMixin:
             return
 
         stream_id = self._current_playing_stream_id
-        url = self.api.creds.stream_url(stream_id)
+        if self._local_timeshift:
+            url, ext = str(self.timeshift_buffer.live_playlist), ""
+        else:
+            url, ext = self._live_stream_url(stream_id)
+            self._current_source_url = url
 
         self._timeshift_active = False
         self._timeshift_paused_at = 0
         self._timeshift_start_ts = 0.0
+        self._current_stream_url = url
+        self._current_stream_ext = ext
         self.player.play(url)
         self.btn_play_pause.setText("\u2759\u2759")
         self._update_seek_controls_visibility()
@@ -341,7 +486,7 @@ class PlaybackMixin:
     def _skip_seconds(self, seconds: int):
         """Spult vor/zurueck - startet Timeshift bei Live-Catchup-Sendern"""
         if (self._current_stream_type == "live"
-                and self._current_epg_has_catchup
+                and self._timeshift_available()
                 and not self._timeshift_active
                 and seconds < 0):
             # Zurueckspulen bei Live → Timeshift starten
@@ -377,7 +522,7 @@ class PlaybackMixin:
         """Blendet Seek-Controls je nach Stream-Typ ein/aus"""
         is_vod = self._current_stream_type == "vod"
         is_live = self._current_stream_type == "live"
-        is_catchup_live = is_live and self._current_epg_has_catchup
+        is_catchup_live = is_live and self._timeshift_available()
         show_seek = is_vod or self._timeshift_active
         # Skip-Buttons auch bei Catchup-Live-Sendern zeigen
         self.btn_skip_back.setVisible(show_seek or is_catchup_live)
@@ -518,8 +663,8 @@ class PlaybackMixin:
             return
         self._info_overlay_timer.stop()
         self.overlay_channel_name.setText(self._current_stream_title)
-        now = self._detail_now_entry
-        nxt = self._detail_next_entry
+        now = self._overlay_now_entry
+        nxt = self._overlay_next_entry
         self.overlay_now_title.setText(now.title if now else "")
         self.overlay_next_title.setText(nxt.title if nxt else "")
         parent = self.info_overlay.parentWidget()
@@ -573,7 +718,7 @@ class PlaybackMixin:
                 elif entry.start_timestamp > now_ts and next_entry is None:
                     next_entry = entry
 
-        has_catchup_live = (self._current_epg_has_catchup
+        has_catchup_live = (self._timeshift_available()
                             and self._current_stream_type == "live")
 
         if current_entry:
@@ -657,7 +802,7 @@ class PlaybackMixin:
                 if not self.api or not self._current_playing_stream_id:
                     return
                 remaining = max(1, int((entry.stop_timestamp - seek_to) / 60))
-                url = self.api.creds.catchup_url(
+                url = self._timeshift_url(
                     self._current_playing_stream_id, datetime.fromtimestamp(seek_to), remaining)
                 self._timeshift_start_ts = seek_to
                 self._play_stream(url, self._current_stream_title or "", "live",
@@ -678,7 +823,7 @@ class PlaybackMixin:
             return
         seek_to = min(target_ts, now_ts - 10)
         remaining = max(1, int((entry.stop_timestamp - seek_to) / 60))
-        url = self.api.creds.catchup_url(
+        url = self._timeshift_url(
             self._current_playing_stream_id, datetime.fromtimestamp(seek_to), remaining)
         self._timeshift_start_ts = seek_to
         self._play_stream(url, self._current_stream_title or "", "live", self._current_playing_stream_id)
@@ -709,7 +854,7 @@ class PlaybackMixin:
 
         is_vod = self._current_stream_type == "vod"
         is_live = self._current_stream_type == "live"
-        has_catchup = self._current_epg_has_catchup
+        has_catchup = self._timeshift_available()
         timeshift = self._timeshift_active
 
         # Play/Pause
@@ -808,7 +953,7 @@ class PlaybackMixin:
                 if not self.api or not self._current_playing_stream_id:
                     return
                 remaining = max(1, int((entry.stop_timestamp - seek_to) / 60))
-                url = self.api.creds.catchup_url(
+                url = self._timeshift_url(
                     self._current_playing_stream_id, datetime.fromtimestamp(seek_to), remaining)
                 self._timeshift_start_ts = seek_to
                 self._play_stream(url, self._current_stream_title or "", "live",
@@ -829,7 +974,7 @@ class PlaybackMixin:
             return
         seek_to = min(target_ts, now_ts - 10)
         remaining = max(1, int((entry.stop_timestamp - seek_to) / 60))
-        url = self.api.creds.catchup_url(
+        url = self._timeshift_url(
             self._current_playing_stream_id, datetime.fromtimestamp(seek_to), remaining)
         self._timeshift_start_ts = seek_to
         self._play_stream(url, self._current_stream_title or "", "live",
@@ -850,7 +995,10 @@ class PlaybackMixin:
                 if entry.start_timestamp <= now_ts <= entry.stop_timestamp:
                     current_entry = entry
                     break
-        has_catchup = self._current_epg_has_catchup
+            else:
+                # Programmgrenze: der EpgStore haelt auch neuere Daten des Refreshers
+                current_entry = self.epg_store.at(self._current_playing_stream_id, now_ts)
+        has_catchup = self._timeshift_available()
         self.live_epg_catchup_btn.setVisible(has_catchup)
         if current_entry:
             duration = current_entry.stop_timestamp - current_entry.start_timestamp
@@ -917,8 +1065,12 @@ class PlaybackMixin:
             return
         if self._stream_starting:
             return
+        if self._local_timeshift and self._timeshift_active and reason == 'eof':
+            # Momentaufnahme des lokalen Puffers zu Ende gespielt
+            QTimer.singleShot(0, self._continue_local_timeshift)
+            return
         if self._current_stream_type == "live" and reason in ('error', 'eof', 'unknown'):
-            self._schedule_reconnect()
+            self._schedule_reconnect(failure_class(reason))
         elif self._current_stream_type == "vod" and reason == 'error':
             self.buffering_overlay.hide()
             self.status_bar.showMessage("Fehler: Video konnte nicht geladen werden")
@@ -950,17 +1102,28 @@ class PlaybackMixin:
             # Film-Detailansicht
             self.channel_stack.setCurrentIndex(2)
 
-    def _schedule_reconnect(self):
-        """Plant den naechsten Reconnect-Versuch"""
+    def _schedule_reconnect(self, failure: str):
+        """Plant den naechsten Reconnect-Versuch.
+
+        Backoff (exponentiell mit Jitter) und Format-Fallback (.m3u8 <-> .ts) haengen von
+        der Fehlerklasse und dem Gesundheits-Score des Senders ab (StreamHealthTracker).
+        """
         self._buffering_watchdog.stop()
         self._reconnect_timer.stop()
+        key = self._health_key(self._current_playing_stream_id)
+        if self._reconnect_attempt == 0:
+            self._reconnect_started_at = time.monotonic()
+        self.stream_health.record_failure(key, self._current_stream_ext, failure)
         if self._reconnect_attempt >= self._max_reconnect_attempts:
             self._on_stream_error_final()
             return
         self._reconnect_attempt += 1
-        delay = min(3000 * self._reconnect_attempt, 10000)
+        delay, self._reconnect_next_ext = self.stream_health.next_attempt(
+            key, failure, self._reconnect_attempt, self._current_stream_ext
+        )
+        hint = " (instabile Verbindung)" if self.stream_health.in_storm else ""
         self.status_bar.showMessage(
-            f"Stream unterbrochen – Verbindungsversuch {self._reconnect_attempt}/{self._max_reconnect_attempts} ..."
+            f"Stream unterbrochen – Verbindungsversuch {self._reconnect_attempt}/{self._max_reconnect_attempts}{hint} ..."
         )
         self._reconnect_timer.start(delay)
 
@@ -977,6 +1140,16 @@ class PlaybackMixin:
         """
         if not self._current_stream_url or not self._current_stream_type:
             return
+        ext = self._reconnect_next_ext
+        if (ext and self._current_stream_ext and ext != self._current_stream_ext
+                and self.api and self._current_playing_stream_id is not None
+                and not self._timeshift_active):
+            # Alternatives Container-Format probieren
+            self._current_stream_url = self.api.creds.stream_url(
+                self._current_playing_stream_id, extension=ext
+            )
+            self._current_source_url = self._current_stream_url
+            self._current_stream_ext = ext
         self._stream_starting = True
         self._stream_start_timer.start(8000)
         self.player.play(self._current_stream_url)
@@ -984,7 +1157,7 @@ class PlaybackMixin:
     def _on_buffering_timeout(self):
         """Watchdog: Stream buffert zu lange → Reconnect"""
         if self._current_stream_type == "live":
-            self._schedule_reconnect()
+            self._schedule_reconnect(FAILURE_STALL)
 
     def _on_stream_error_final(self):
         """Alle Reconnect-Versuche gescheitert"""
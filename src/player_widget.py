@@ -9,11 +9,22 @@ import mpv
 
 import sys
 
-try:
-    import dbus
-    _DBUS_AVAILABLE = True
-except ImportError:
-    _DBUS_AVAILABLE = False
+# dbus erst beim ersten Abspielen importieren (nicht im Startpfad)
+_dbus = None
+_DBUS_AVAILABLE = None
+
+
+def _load_dbus():
+    """Gibt das dbus-Modul zurueck oder None, wenn es nicht installiert ist"""
+    global _dbus, _DBUS_AVAILABLE
+    if _DBUS_AVAILABLE is None:
+        try:
+            import dbus
+            _dbus = dbus
+            _DBUS_AVAILABLE = True
+        except ImportError:
+            _DBUS_AVAILABLE = False
+    return _dbus
 
 if sys.platform == 'win32':
     import ctypes
@@ -302,7 +313,8 @@ class MpvPlayerWidget(QOpenGLWidget):
                 _ES_CONTINUOUS | _ES_DISPLAY_REQUIRED | _ES_SYSTEM_REQUIRED
             )
             return
-        if not _DBUS_AVAILABLE:
+        dbus = _load_dbus()
+        if dbus is None:
             return
         # Bereits aktiv → nicht doppelt inhibiten
         if self._screensaver_inhibitions or self._logind_fd is not None:
@@ -349,7 +361,8 @@ class MpvPlayerWidget(QOpenGLWidget):
         if sys.platform == 'win32':
             ctypes.windll.kernel32.SetThreadExecutionState(_ES_CONTINUOUS)
             return
-        if not _DBUS_AVAILABLE:
+        dbus = _load_dbus()
+        if dbus is None:
             return
 
         # ScreenSaver-Cookies aufheben
@@ -0,0 +1,124 @@
+"""
+Poster-Grid: Bewertungs-Badges als vorgerenderte Sprites, die der Delegate beim
+Zeichnen ueber das (unveraenderte, geteilte) Poster legt
+"""
+from PySide6.QtCore import Qt, QRect
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPixmap
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+from xtream_api import VodStream, Series
+
+_BADGE_MARGIN = 4
+_BADGE_PADDING = 3
+
+
+def rating_text(data) -> str:
+    """Anzuzeigende Bewertung eines VOD/Serien-Items ("" = kein Badge)"""
+    if not isinstance(data, (VodStream, Series)):
+        return ""
+    rating_str = data.rating
+    if rating_str and rating_str not in ("0", "0.0", ""):
+        try:
+            val = float(rating_str)
+            if val > 0:
+                return f"{val:.1f}"
+        except (ValueError, TypeError):
+            pass
+    return ""
+
+
+def _badge_color(rating: str) -> QColor:
+    try:
+        val = float(rating)
+    except ValueError:
+        return QColor(80, 80, 80)
+    if val >= 7.0:
+        return QColor(46, 160, 67)   # Grün
+    if val >= 5.0:
+        return QColor(200, 140, 20)  # Orange
+    return QColor(200, 50, 50)       # Rot
+
+
+class BadgeSpriteCache:
+    """Ein gerendertes Badge pro (Bewertung, Schriftgroesse, Pixel-Ratio)."""
+
+    def __init__(self):
+        self._sprites: dict[tuple[str, int, float], QPixmap] = {}
+
+    @staticmethod
+    def point_size(poster_height: int) -> int:
+        return max(7, min(10, poster_height // 22))
+
+    def get(self, rating: str, point_size: int, dpr: float = 1.0) -> QPixmap:
+        key = (rating, point_size, dpr)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = self._render(rating, point_size, dpr)
+            self._sprites[key] = sprite
+        return sprite
+
+    def clear(self):
+        self._sprites.clear()
+
+    @staticmethod
+    def _render(rating: str, point_size: int, dpr: float) -> QPixmap:
+        font = QFont()
+        font.setPointSize(point_size)
+        font.setBold(True)
+        fm = QFontMetrics(font)
+        text = f"★ {rating}"
+        badge_w = fm.horizontalAdvance(text) + _BADGE_PADDING * 2
+        badge_h = fm.height() + _BADGE_PADDING * 2
+
+        sprite = QPixmap(round(badge_w * dpr), round(badge_h * dpr))
+        sprite.setDevicePixelRatio(dpr)
+        sprite.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(sprite)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(font)
+
+        painter.setOpacity(0.85)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(_badge_color(rating))
+        painter.drawRoundedRect(0, 0, badge_w, badge_h, 3, 3)
+
+        painter.setOpacity(1.0)
+        painter.setPen(QColor(255, 255, 255))
+        painter.drawText(_BADGE_PADDING, _BADGE_PADDING + fm.ascent(), text)
+        painter.end()
+        return sprite
+
+
+class PosterItemDelegate(QStyledItemDelegate):
+    """Zeichnet Items wie gewohnt und legt bei VOD/Serien das Bewertungs-Badge
+    oben links auf das Poster. Das Poster selbst wird nie kopiert."""
+
+    def __init__(self, parent=None, sprites: BadgeSpriteCache | None = None):
+        super().__init__(parent)
+        self.sprites = sprites or BadgeSpriteCache()
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index):
+        super().paint(painter, option, index)
+
+        rating = rating_text(index.data(Qt.UserRole))
+        if not rating:
+            return
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        if opt.icon.isNull():
+            return  # Badge erst, wenn das Poster geladen ist
+
+        widget = opt.widget
+        style = widget.style() if widget else None
+        if style is None:
+            return
+        deco = style.subElementRect(QStyle.SubElement.SE_ItemViewItemDecoration, opt, widget)
+        # Tatsaechliche Postergroesse (KeepAspectRatio) innerhalb des Icon-Rechtecks
+        size = opt.icon.actualSize(opt.decorationSize)
+        poster = QRect(0, 0, size.width(), size.height())
+        poster.moveCenter(deco.center())
+
+        sprite = self.sprites.get(
+            rating, BadgeSpriteCache.point_size(size.height()), painter.device().devicePixelRatioF()
+        )
+        painter.drawPixmap(poster.left() + _BADGE_MARGIN, poster.top() + _BADGE_MARGIN, sprite)
@@ -1,19 +1,41 @@
 """
-Stream-Aufnahme mit ffmpeg
+Stream-Aufnahme mit ffmpeg: mehrere gleichzeitige Aufnahmen, verwaltet pro Job
 """
+import asyncio
+import shutil
 import subprocess
 import signal
 import sys
 import os
 import re
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from platform_utils import get_recordings_dir
 
 _IS_WIN = sys.platform == "win32"
 
+# Job-ID der manuellen Aufnahme (Aufnahme-Button im Player)
+MANUAL_JOB = "manual"
+
+# Angenommene Bitrate eines Streams, solange noch nicht gemessen (kbit/s)
+DEFAULT_BITRATE_KBPS = 8000
+
+# Segment-Modus: Laenge eines MPEG-TS-Segments und Endung des Teile-Verzeichnisses
+SEGMENT_SECONDS = 60
+PARTS_SUFFIX = ".parts"
+
+# Neustart nach unerwartetem ffmpeg-Ende (nur Segment-Modus): Wartezeit verdoppelt
+# sich bis RETRY_MAX_DELAY_S; lief ffmpeg mindestens RETRY_RESET_S, zaehlt der
+# naechste Abbruch wieder als erster Versuch
+RETRY_DELAY_S = 5.0
+RETRY_MAX_DELAY_S = 120.0
+RETRY_RESET_S = 120.0
+# Reagiert ffmpeg so lange nicht auf SIGINT, wird es beendet
+STOP_KILL_AFTER_S = 8.0
+
 
 def _find_ffmpeg() -> str:
     """Sucht ffmpeg: neben der EXE (PyInstaller), dann im PATH."""
@@ -26,40 +48,216 @@ def _find_ffmpeg() -> str:
     return "ffmpeg"
 
 
+class RecordingLimitError(RuntimeError):
+    """Aufnahme kann nicht starten (zu viele Jobs oder Bandbreiten-Budget erschoepft)"""
+
+
+class RecordingJob:
+    """Eine ffmpeg-Aufnahme; der Prozess wird von StreamRecorder._supervise ueberwacht"""
+
+    def __init__(self, job_id: str, url: str, title: str, file: Path, log_file: Path,
+                 segmented: bool = True, retries: int = 0):
+        self.job_id = job_id
+        self.url = url
+        self.title = title
+        self.file = file
+        self.log_file = log_file
+        self.segmented = segmented
+        self.retries = retries
+        self.segment_start = 0  # Nummer des ersten Segments dieses ffmpeg-Laufs
+        self.start_time = datetime.now()
+        self.status = "recording"  # "recording", "finalizing", "done", "failed"
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.stop_requested = asyncio.Event()
+
+    @property
+    def parts_dir(self) -> Path:
+        """Verzeichnis der MPEG-TS-Segmente (nur im Segment-Modus)"""
+        return self.file.with_suffix(PARTS_SUFFIX)
+
+    @property
+    def is_running(self) -> bool:
+        return self.status == "recording"
+
+    def bytes_written(self) -> int:
+        try:
+            if self.segmented:
+                return sum(p.stat().st_size for p in self.parts_dir.glob("seg_*.ts"))
+            return self.file.stat().st_size
+        except OSError:
+            return 0
+
+    @property
+    def bitrate_kbps(self) -> int:
+        """Gemessene Bitrate anhand der Dateigroesse (Fallback: DEFAULT_BITRATE_KBPS)"""
+        elapsed = (datetime.now() - self.start_time).total_seconds()
+        size = self.bytes_written()
+        if elapsed < 10 or size <= 0:
+            return DEFAULT_BITRATE_KBPS
+        return int(size * 8 / 1000 / elapsed)
+
+    def ffmpeg_args(self) -> list[str]:
+        args = [
+            _find_ffmpeg(),
+            "-nostdin",
+            "-extension_picky", "0",
+            "-reconnect", "1",
+            "-reconnect_streamed", "1",
+            "-reconnect_delay_max", "5",
+            "-i", self.url,
+            "-map", "0:v?",
+            "-map", "0:a?",
+            "-c", "copy",
+            "-y",
+        ]
+        if self.segmented:
+            # Rollende MPEG-TS-Segmente: jedes abgeschlossene Segment ist abspielbar,
+            # ein Absturz kostet hoechstens das letzte Segment
+            args += [
+                "-f", "segment",
+                "-segment_time", str(SEGMENT_SECONDS),
+                "-segment_format", "mpegts",
+                "-segment_start_number", str(self.segment_start),
+                "-reset_timestamps", "0",
+                str(self.parts_dir / "seg_%05d.ts"),
+            ]
+        else:
+            args.append(str(self.file))
+        return args
+
+    def send_stop(self):
+        """SIGINT an ffmpeg (Datei/Segment wird sauber abgeschlossen), blockiert nicht."""
+        self.stop_requested.set()
+        if not self.process or self.process.returncode is not None:
+            return
+        try:
+            if _IS_WIN:
+                self.process.terminate()
+            else:
+                os.killpg(self.process.pid, signal.SIGINT)
+        except (ProcessLookupError, OSError):
+            pass
+
+    def process_alive(self) -> bool:
+        """Laeuft ffmpeg noch? Auch ohne laufende Event-Loop abfragbar (App-Ende)."""
+        if not self.process or self.process.returncode is not None:
+            return False
+        if _IS_WIN:
+            return False  # send_stop() beendet dort sofort per terminate()
+        try:
+            os.killpg(self.process.pid, 0)
+        except (ProcessLookupError, OSError):
+            return False
+        return True
+
+    def kill(self):
+        if not self.process or self.process.returncode is not None:
+            return
+        try:
+            if _IS_WIN:
+                self.process.kill()
+            else:
+                os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, OSError):
+            pass
+
+
 class StreamRecorder:
-    """Nimmt Streams verlustfrei mit ffmpeg auf"""
+    """Nimmt Streams verlustfrei mit ffmpeg auf – mehrere Jobs parallel.
 
-    def __init__(self, output_dir: Optional[Path] = None):
+    Jeder Job hat eine ID (MANUAL_JOB fuer den Aufnahme-Button, die ID der
+    ScheduledRecording fuer geplante Aufnahmen). Neue Jobs werden abgelehnt,
+    wenn max_concurrent erreicht ist oder das Bandbreiten-Budget (kbit/s,
+    0 = unbegrenzt) nicht mehr reicht.
+
+    Die ffmpeg-Prozesse laufen ueber asyncio; start() und stop() blockieren
+    nie. Im Segment-Modus werden die Teile nach dem Stoppen im Hintergrund
+    zu MKV zusammengefuegt, danach wird on_finished(job) aufgerufen.
+    """
+
+    def __init__(self, output_dir: Optional[Path] = None,
+                 max_concurrent: int = 4, bandwidth_budget_kbps: int = 0,
+                 segmented: bool = True,
+                 on_finished: Optional[Callable[[RecordingJob], None]] = None):
         if output_dir is None:
             output_dir = get_recordings_dir()
         self.output_dir = output_dir
-        self._process: Optional[subprocess.Popen] = None
-        self._current_title: str = ""
-        self._current_file: Optional[Path] = None
-        self._start_time: Optional[datetime] = None
-        self._log_file: Optional[Path] = None
-        self._log_fh = None
+        self.max_concurrent = max_concurrent
+        self.bandwidth_budget_kbps = bandwidth_budget_kbps
+        self.segmented = segmented
+        self.on_finished = on_finished
+        self.jobs: dict[str, RecordingJob] = {}
+        # Gestoppte Jobs, deren ffmpeg noch schreibt oder die noch zusammengefuegt werden
+        self._stopping: set[RecordingJob] = set()
+        self._finalizing: set[Path] = set()
 
     @property
     def is_recording(self) -> bool:
-        return self._process is not None and self._process.poll() is None
+        return any(job.is_running for job in self.jobs.values())
+
+    def is_job_running(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        return job is not None and job.is_running
+
+    def running_jobs(self) -> list[RecordingJob]:
+        return [job for job in self.jobs.values() if job.is_running]
+
+    def _primary_job(self) -> Optional[RecordingJob]:
+        """Manuelle Aufnahme, sonst die zuletzt gestartete laufende Aufnahme"""
+        if self.is_job_running(MANUAL_JOB):
+            return self.jobs[MANUAL_JOB]
+        running = self.running_jobs()
+        return max(running, key=lambda j: j.start_time) if running else None
 
     @property
     def current_title(self) -> str:
-        return self._current_title
+        job = self._primary_job()
+        return job.title if job else ""
 
     @property
     def current_file(self) -> Optional[Path]:
-        return self._current_file
+        job = self._primary_job()
+        return job.file if job else None
 
     @property
     def start_time(self) -> Optional[datetime]:
-        return self._start_time
+        job = self._primary_job()
+        return job.start_time if job else None
+
+    @property
+    def bandwidth_used_kbps(self) -> int:
+        return sum(job.bitrate_kbps for job in self.running_jobs())
+
+    def reap(self):
+        """Entfernt beendete Jobs aus der Job-Liste."""
+        for job_id, job in list(self.jobs.items()):
+            if job.status != "recording":
+                del self.jobs[job_id]
+
+    def _check_limits(self):
+        """Gestoppte Jobs zaehlen mit, bis ffmpeg beendet (Bandbreite) bzw. die
+        Aufnahme abgeschlossen ist (Anzahl)"""
+        running = self.running_jobs()
+        flushing = [job for job in self._stopping if job.is_running]
+        finishing = [job for job in self._stopping if job.status == "finalizing"]
+        if len(running) + len(flushing) + len(finishing) >= self.max_concurrent:
+            raise RecordingLimitError(f"maximal {self.max_concurrent} gleichzeitige Aufnahmen")
+        budget = self.bandwidth_budget_kbps
+        used = self.bandwidth_used_kbps + sum(job.bitrate_kbps for job in flushing)
+        if budget > 0 and used + DEFAULT_BITRATE_KBPS > budget:
+            raise RecordingLimitError(f"Bandbreiten-Budget von {budget} kbit/s erschoepft")
 
-    def start(self, url: str, title: str) -> Path:
-        """Startet die Aufnahme. Gibt den Dateipfad zurueck."""
-        if self.is_recording:
-            self.stop()
+    def start(self, url: str, title: str, job_id: str = MANUAL_JOB, retries: int = 0) -> Path:
+        """Startet eine Aufnahme als Job `job_id`. Gibt den Dateipfad zurueck.
+
+        Ein laufender Job mit gleicher ID wird vorher beendet; andere Jobs laufen weiter.
+        Im Segment-Modus wird ffmpeg nach unerwartetem Ende bis zu `retries` Mal
+        mit Backoff neu gestartet und schreibt in dieselbe Aufnahme weiter.
+        """
+        if self.is_job_running(job_id):
+            self.stop(job_id)
+        self.reap()
+        self._check_limits()
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -67,96 +265,213 @@ class StreamRecorder:
         safe_title = re.sub(r'[^\w\s\-]', '', title).strip().replace(' ', '_')
         if not safe_title:
             safe_title = "Aufnahme"
-        now = datetime.now()
-        timestamp = now.strftime('%Y%m%d_%H%M%S')
-        filename = f"{safe_title}_{timestamp}.mkv"
-        self._current_file = self.output_dir / filename
-        self._current_title = title
-        self._start_time = now
-
-        # Log-Datei fuer ffmpeg stderr (Debugging)
-        self._log_file = self.output_dir / f".ffmpeg_{timestamp}.log"
-
-        self._log_fh = open(self._log_file, "w")
-
-        # Plattformabhaengige Prozess-Erstellung
-        popen_kwargs = dict(
-            stdin=subprocess.DEVNULL,
-            stdout=subprocess.DEVNULL,
-            stderr=self._log_fh,
-        )
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        file = self.output_dir / f"{safe_title}_{timestamp}.mkv"
+        counter = 2
+        while file.exists() or file.with_suffix(PARTS_SUFFIX).exists():
+            # Gleicher Titel in derselben Sekunde (parallele Aufnahmen)
+            file = self.output_dir / f"{safe_title}-{counter}_{timestamp}.mkv"
+            counter += 1
+
+        # Log-Datei fuer ffmpeg stderr (Debugging), pro Job
+        log_file = self.output_dir / f".ffmpeg_{timestamp}_{file.stem}.log"
+
+        job = RecordingJob(job_id, url, title, file, log_file, segmented=self.segmented,
+                           retries=retries)
+        if job.segmented:
+            job.parts_dir.mkdir()
+        self.jobs[job_id] = job
+        asyncio.ensure_future(self._supervise(job))
+        return file
+
+    def stop(self, job_id: str = MANUAL_JOB) -> Optional[Path]:
+        """Stoppt den Job `job_id` ohne zu warten. Gibt den (kuenftigen) Dateipfad zurueck."""
+        job = self.jobs.pop(job_id, None)
+        if not job:
+            return None
+        if job.status in ("recording", "finalizing"):
+            self._stopping.add(job)  # bis _supervise die Aufnahme abschliesst
+        job.send_stop()
+        return job.file
+
+    def stop_all(self, timeout: float = STOP_KILL_AFTER_S):
+        """Stoppt alle Jobs beim Beenden der App und wartet bis zu `timeout`
+        Sekunden auf ffmpeg; was dann noch laeuft, wird beendet. Blockiert,
+        weil die Event-Loop danach endet und der Watchdog aus _supervise nicht
+        mehr zum Zug kommt (Segmente schliesst recover_orphans beim naechsten Start ab)."""
+        jobs = list(self.jobs.values())
+        for job_id in list(self.jobs):
+            self.stop(job_id)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and any(job.process_alive() for job in jobs):
+            time.sleep(0.05)
+        for job in jobs:
+            job.kill()
+
+    async def _supervise(self, job: RecordingJob):
+        """Startet ffmpeg, wartet auf dessen Ende und schliesst die Aufnahme ab."""
+        popen_kwargs = {}
         if _IS_WIN:
             popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
         else:
-            popen_kwargs["preexec_fn"] = os.setpgrp
-
-        self._process = subprocess.Popen(
-            [
-                _find_ffmpeg(),
-                "-nostdin",
-                "-extension_picky", "0",
-                "-reconnect", "1",
-                "-reconnect_streamed", "1",
-                "-reconnect_delay_max", "5",
-                "-i", url,
-                "-map", "0:v?",
-                "-map", "0:a?",
-                "-c", "copy",
-                "-y",
-                str(self._current_file),
-            ],
-            **popen_kwargs,
-        )
-
-        return self._current_file
-
-    def stop(self) -> Optional[Path]:
-        """Stoppt die Aufnahme. Gibt den Dateipfad zurueck."""
-        if not self._process:
-            return None
+            popen_kwargs["start_new_session"] = True
 
-        filepath = self._current_file
-
-        try:
-            if _IS_WIN:
-                self._process.terminate()
-            else:
-                os.killpg(self._process.pid, signal.SIGINT)
-            self._process.wait(timeout=8)
-        except subprocess.TimeoutExpired:
+        attempt = 0
+        first_run = True
+        while True:
             try:
-                if _IS_WIN:
-                    self._process.kill()
-                else:
-                    os.killpg(self._process.pid, signal.SIGKILL)
-                self._process.wait(timeout=3)
-            except Exception:
-                pass
-        except Exception:
+                with open(job.log_file, "w" if first_run else "a") as log_fh:
+                    job.process = await asyncio.create_subprocess_exec(
+                        *job.ffmpeg_args(),
+                        stdin=asyncio.subprocess.DEVNULL,
+                        stdout=asyncio.subprocess.DEVNULL,
+                        stderr=log_fh,
+                        **popen_kwargs,
+                    )
+            except (OSError, NotImplementedError) as e:
+                with open(job.log_file, "a") as log_fh:
+                    log_fh.write(f"ffmpeg konnte nicht gestartet werden: {e}\n")
+                if first_run:
+                    job.status = "failed"
+                    self._stopping.discard(job)
+                    self._notify(job)
+                    return
+                break  # bisherige Segmente trotzdem abschliessen
+            first_run = False
+
+            if job.stop_requested.is_set():
+                # stop() kam, bevor der Prozess lief
+                job.send_stop()
+            watchdog = asyncio.ensure_future(self._kill_after_stop(job))
+            started = time.monotonic()
+            returncode = await job.process.wait()
+            watchdog.cancel()
+
+            if job.stop_requested.is_set() or not job.segmented:
+                break
+            if time.monotonic() - started >= RETRY_RESET_S:
+                attempt = 0
+            attempt += 1
+            if attempt > job.retries:
+                break
+            delay = min(RETRY_DELAY_S * 2 ** (attempt - 1), RETRY_MAX_DELAY_S)
+            with open(job.log_file, "a") as log_fh:
+                log_fh.write(f"ffmpeg beendet (Code {returncode}), Neustart "
+                             f"{attempt}/{job.retries} in {delay:.0f} s\n")
             try:
-                self._process.kill()
-                self._process.wait(timeout=3)
-            except Exception:
+                await asyncio.wait_for(job.stop_requested.wait(), timeout=delay)
+                break  # waehrend des Wartens gestoppt
+            except asyncio.TimeoutError:
                 pass
+            job.segment_start = _next_segment_number(job.parts_dir)
 
-        self._process = None
-        self._current_title = ""
-        self._start_time = None
+        if job.segmented:
+            job.status = "finalizing"
+            result = await self._finalize(job.parts_dir, job.file, job.log_file)
+            ok = result is not None
+            if ok:
+                job.file = result  # .ts, falls der Remux gescheitert ist
+        else:
+            ok = job.file.exists() and job.file.stat().st_size > 0
+        job.status = "done" if ok else "failed"
 
-        # Log-Handle schliessen
-        if self._log_fh:
+        if ok and job.log_file.exists():
             try:
-                self._log_fh.close()
-            except Exception:
+                job.log_file.unlink()
+            except OSError:
                 pass
-            self._log_fh = None
+        self._stopping.discard(job)
+        self._notify(job)
+
+    async def _kill_after_stop(self, job: RecordingJob):
+        """Reagiert ffmpeg nicht innerhalb von STOP_KILL_AFTER_S auf SIGINT, wird es beendet."""
+        await job.stop_requested.wait()
+        await asyncio.sleep(STOP_KILL_AFTER_S)
+        job.kill()
+
+    def _notify(self, job: RecordingJob):
+        if self.on_finished:
+            self.on_finished(job)
+
+    async def _finalize(self, parts_dir: Path, target: Path, log_file: Path) -> Optional[Path]:
+        """Fuegt die Segmente zu einer MKV zusammen (Remux ohne Neukodierung).
+
+        Scheitert der Remux, werden die Segmente byteweise zu einer .ts-Datei
+        verbunden – MPEG-TS bleibt so in jedem Fall abspielbar. Gibt die
+        fertige Datei zurueck (MKV oder .ts), None ohne verwertbare Segmente.
+        """
+        self._finalizing.add(parts_dir)
+        try:
+            segments = [p for p in sorted(parts_dir.glob("seg_*.ts")) if p.stat().st_size > 0]
+            if not segments:
+                await asyncio.to_thread(shutil.rmtree, parts_dir, True)
+                return None
 
-        # Log-Datei aufraeumen
-        if self._log_file and self._log_file.exists():
+            concat_list = parts_dir / "concat.txt"
+            concat_list.write_text(
+                "".join(f"file '{p.name}'\n" for p in segments), encoding="utf-8"
+            )
+            tmp = target.with_name(f".{target.stem}.remux.mkv")
             try:
-                self._log_file.unlink()
-            except Exception:
-                pass
-            self._log_file = None
+                with open(log_file, "a") as log_fh:
+                    proc = await asyncio.create_subprocess_exec(
+                        _find_ffmpeg(), "-nostdin",
+                        "-f", "concat", "-safe", "0", "-i", str(concat_list),
+                        "-map", "0:v?", "-map", "0:a?",
+                        "-c", "copy", "-y", str(tmp),
+                        stdin=asyncio.subprocess.DEVNULL,
+                        stdout=asyncio.subprocess.DEVNULL,
+                        stderr=log_fh,
+                    )
+                returncode = await proc.wait()
+            except (OSError, NotImplementedError):
+                returncode = -1
+
+            if returncode == 0 and tmp.exists() and tmp.stat().st_size > 0:
+                tmp.replace(target)
+                result = target
+            else:
+                tmp.unlink(missing_ok=True)
+                result = target.with_suffix(".ts")
+                try:
+                    await asyncio.to_thread(_concat_segments, segments, result)
+                except OSError:
+                    # Segmente behalten: recover_orphans versucht es spaeter erneut
+                    return None
+            await asyncio.to_thread(shutil.rmtree, parts_dir, True)
+            return result
+        finally:
+            self._finalizing.discard(parts_dir)
+
+    async def recover_orphans(self):
+        """Schliesst Segment-Verzeichnisse ab, die ein Absturz zurueckgelassen hat."""
+        if not self.output_dir.exists():
+            return
+        jobs = [*self.jobs.values(), *self._stopping]
+        active = {job.parts_dir for job in jobs} | self._finalizing
+        for parts_dir in sorted(self.output_dir.glob(f"*{PARTS_SUFFIX}")):
+            if not parts_dir.is_dir() or parts_dir in active:
+                continue
+            target = parts_dir.with_suffix(".mkv")
+            log_file = self.output_dir / f".ffmpeg_recover_{target.stem}.log"
+            if await self._finalize(parts_dir, target, log_file) is not None and log_file.exists():
+                log_file.unlink()
+
+
+def _next_segment_number(parts_dir: Path) -> int:
+    """Nummer nach dem hoechsten vorhandenen seg_NNNNN.ts (Fortsetzung nach Neustart)"""
+    numbers = []
+    for p in parts_dir.glob("seg_*.ts"):
+        try:
+            numbers.append(int(p.stem[4:]))
+        except ValueError:
+            pass
+    return max(numbers, default=-1) + 1
+
 
-        return filepath
+def _concat_segments(segments: list[Path], target: Path):
+    """Verbindet MPEG-TS-Segmente byteweise (laeuft im Worker-Thread)."""
+    with open(target, "wb") as out:
+        for seg in segments:
+            with open(seg, "rb") as f:
+                shutil.copyfileobj(f, out)
@@ -0,0 +1,106 @@
+"""
+Zeitplaner fuer geplante Aufnahmen: schlaeft genau bis zum naechsten Start/Stopp
+"""
+import asyncio
+import heapq
+import logging
+import time
+from typing import Callable, Optional
+
+from schedule_manager import ScheduleManager, ScheduledRecording
+
+logger = logging.getLogger(__name__)
+
+# Maximale Schlafdauer solange Ereignisse anstehen: asyncio misst monoton,
+# nach Standby oder Uhr-Spruengen wird so spaetestens nach 60s neu geprueft
+_MAX_SLEEP_S = 60.0
+# Nach einem Fehler in on_due erst nach dieser Zeit erneut pruefen (sonst
+# wird ein faelliges, fehlschlagendes Ereignis in einer Schleife wiederholt)
+_ERROR_RETRY_S = 10.0
+
+EVENT_START = "start"
+EVENT_STOP = "stop"
+
+
+class RecordingScheduler:
+    """Haelt die naechsten Start-/Stopp-Zeitpunkte in einem Heap.
+
+    `on_due(now)` wird aufgerufen, sobald ein Ereignis faellig ist; danach wird
+    der Heap aus dem ScheduleManager neu aufgebaut. Ohne geplante Aufnahmen
+    wartet die Schleife ausschliesslich auf reschedule() (keine Wakeups).
+    """
+
+    def __init__(self, schedule_manager: ScheduleManager,
+                 on_due: Callable[[float], None],
+                 pre_roll: float = 0.0, post_roll: float = 0.0):
+        self.schedule_manager = schedule_manager
+        self.on_due = on_due
+        self.pre_roll = pre_roll
+        self.post_roll = post_roll
+        self._heap: list[tuple[float, str, str]] = []
+        self._wakeup = asyncio.Event()
+
+    def start_time(self, rec: ScheduledRecording) -> float:
+        return rec.start_timestamp - self.pre_roll
+
+    def stop_time(self, rec: ScheduledRecording) -> float:
+        return rec.end_timestamp + self.post_roll
+
+    def reschedule(self):
+        """Heap neu aufbauen (nach Hinzufuegen/Entfernen/Statuswechsel) und Schleife wecken."""
+        heap = []
+        for rec in self.schedule_manager.get_active():
+            if rec.status == "pending":
+                heap.append((self.start_time(rec), EVENT_START, rec.id))
+            heap.append((self.stop_time(rec), EVENT_STOP, rec.id))
+        heapq.heapify(heap)
+        self._heap = heap
+        self._wakeup.set()
+
+    def next_event(self) -> Optional[tuple[float, str, str]]:
+        return self._heap[0] if self._heap else None
+
+    async def _check_due(self):
+        """on_due + reschedule; ein Fehler (z.B. aus recorder.start) darf die
+        Schleife nicht beenden, sonst startet keine spaetere Aufnahme mehr"""
+        try:
+            self.on_due(time.time())
+            self.reschedule()
+            return
+        except Exception:
+            logger.exception("Fehler beim Pruefen geplanter Aufnahmen")
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=_ERROR_RETRY_S)
+        except asyncio.TimeoutError:
+            pass
+        try:
+            self.reschedule()
+        except Exception:
+            logger.exception("Zeitplan konnte nicht neu aufgebaut werden")
+
+    async def run(self):
+        # Verpasste Aufnahmen (App war beendet) sofort nachholen bzw. abschliessen
+        try:
+            self.reschedule()
+        except Exception:
+            logger.exception("Zeitplan konnte nicht aufgebaut werden")
+        await self._check_due()
+        while True:
+            self._wakeup.clear()
+            event = self.next_event()
+            if event is None:
+                await self._wakeup.wait()
+                continue
+
+            delay = event[0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=min(delay, _MAX_SLEEP_S))
+                    continue  # reschedule() hat geweckt: Heap ist neu
+                except asyncio.TimeoutError:
+                    pass
+
+            # Faellig oder Zwischen-Wakeup: on_due prueft anhand der Wanduhr,
+            # ob etwas zu tun ist (Uhr-Sprung, abgestuerzter ffmpeg-Job)
+            await self._check_due()
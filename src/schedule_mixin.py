@@ -1,7 +1,6 @@
 """
 Geplante Aufnahmen: Background-Checker, Planungs-Dialog
 """
-import asyncio
 import uuid
 from datetime import datetime
 
@@ -12,51 +11,75 @@ from PySide6.QtWidgets import (
 )
 
 from schedule_manager import ScheduledRecording
+from recorder import RecordingLimitError
+
+# Neustarts von ffmpeg je geplanter Aufnahme, bevor sie als fehlgeschlagen gilt
+SCHEDULED_RECORDING_RETRIES = 5
 
 
 class ScheduleMixin:
 
     async def _schedule_checker_loop(self):
-        """Laeuft im Hintergrund, prueft alle 30s ob Aufnahmen faellig sind."""
-        while True:
-            await asyncio.sleep(30)
-            self._check_scheduled_recordings()
+        """Laeuft im Hintergrund und startet/stoppt Aufnahmen zum exakten Zeitpunkt."""
+        await self.recording_scheduler.run()
 
-    def _check_scheduled_recordings(self):
-        now = datetime.now().timestamp()
+    def _check_scheduled_recordings(self, now: float | None = None):
+        if now is None:
+            now = datetime.now().timestamp()
+        scheduler = self.recording_scheduler
         changed = False
 
         for rec in self.schedule_manager.get_all():
-            if rec.status == "pending" and rec.start_timestamp <= now < rec.end_timestamp:
-                if not self.recorder.is_recording:
-                    display = rec.channel_name
-                    if rec.epg_title:
-                        display += f" \u2013 {rec.epg_title}"
-                    self.recorder.start(rec.stream_url, display)
-                    self._sync_record_buttons(True)
-                    self.status_bar.showMessage(f"\u23FA Geplante Aufnahme gestartet: {display}")
-                else:
-                    self.status_bar.showMessage(
-                        f"Geplante Aufnahme konnte nicht starten (andere Aufnahme laeuft): {rec.channel_name}"
-                    )
-                    rec.status = "failed"
-                    changed = True
-                    continue
-                rec.status = "recording"
+            start_at, stop_at = scheduler.start_time(rec), scheduler.stop_time(rec)
+            if rec.status == "pending" and start_at <= now < stop_at:
+                rec.status = "recording" if self._start_scheduled_job(rec) else "failed"
                 changed = True
 
-            elif rec.status == "recording" and now >= rec.end_timestamp:
-                self.recorder.stop()
-                self._sync_record_buttons(False)
+            elif rec.status == "pending" and now >= stop_at:
+                # Zeitfenster komplett verpasst (App beendet, Standby)
+                rec.status = "failed"
+                changed = True
+                self.status_bar.showMessage(f"Geplante Aufnahme verpasst: {rec.channel_name}")
+
+            elif rec.status == "recording" and now >= stop_at:
+                self.recorder.stop(rec.id)
                 rec.status = "done"
                 changed = True
                 self.status_bar.showMessage(f"Geplante Aufnahme beendet: {rec.channel_name}")
 
+            elif rec.status == "recording" and not self.recorder.is_job_running(rec.id):
+                if rec.id in self._scheduled_jobs_started:
+                    # Der Recorder hat nach SCHEDULED_RECORDING_RETRIES Neustarts aufgegeben
+                    rec.status = "failed"
+                    changed = True
+                    self.status_bar.showMessage(f"Geplante Aufnahme abgebrochen: {rec.channel_name}")
+                elif not self._start_scheduled_job(rec):
+                    # App-Neustart waehrend der Aufnahme und Start scheitert
+                    rec.status = "failed"
+                    changed = True
+
         if changed:
             self.schedule_manager.save()
             if self.current_mode == "recordings":
                 self._load_recordings()
 
+    def _start_scheduled_job(self, rec: ScheduledRecording) -> bool:
+        """Startet die Aufnahme als eigenen Job (laeuft parallel zu anderen Aufnahmen)."""
+        display = rec.channel_name
+        if rec.epg_title:
+            display += f" \u2013 {rec.epg_title}"
+        try:
+            self.recorder.start(rec.stream_url, display, job_id=rec.id,
+                                retries=SCHEDULED_RECORDING_RETRIES)
+        except (RecordingLimitError, OSError) as e:
+            self.status_bar.showMessage(
+                f"Geplante Aufnahme konnte nicht starten ({e}): {rec.channel_name}"
+            )
+            return False
+        self._scheduled_jobs_started.add(rec.id)
+        self.status_bar.showMessage(f"\u23FA Geplante Aufnahme gestartet: {display}")
+        return True
+
     def _open_schedule_dialog(self, channel_name: str, stream_url: str,
                                start_ts: float, end_ts: float, epg_title: str = ""):
         """Oeffnet den Dialog zum Planen einer Aufnahme."""
@@ -139,8 +162,8 @@ class ScheduleMixin:
             account = self.account_manager.get_selected()
             now = time.time()
 
-            if s_ts <= now < e_ts:
-                # Sofort starten – keine Verzögerung durch Checker
+            if s_ts - self.recording_scheduler.pre_roll <= now < e_ts:
+                # Sofort starten (auch innerhalb des Vorlaufs) – keine Verzögerung durch Checker
                 rec = ScheduledRecording(
                     id=str(uuid.uuid4()),
                     channel_name=channel_name,
@@ -151,13 +174,10 @@ class ScheduleMixin:
                     epg_title=epg_title,
                     status="recording",
                 )
+                if not self._start_scheduled_job(rec):
+                    rec.status = "failed"
                 self.schedule_manager.add(rec)
-                display = channel_name
-                if epg_title:
-                    display += f" \u2013 {epg_title}"
-                self.recorder.start(stream_url, display)
-                self._sync_record_buttons(True)
-                self.status_bar.showMessage(f"\u23FA Aufnahme gestartet: {display}")
+                self.recording_scheduler.reschedule()
             else:
                 rec = ScheduledRecording(
                     id=str(uuid.uuid4()),
@@ -170,6 +190,7 @@ class ScheduleMixin:
                     status="pending",
                 )
                 self.schedule_manager.add(rec)
+                self.recording_scheduler.reschedule()
                 start_str = start_dt.dateTime().toString("HH:mm")
                 self.status_bar.showMessage(
                     f"Aufnahme geplant: {channel_name} um {start_str}"
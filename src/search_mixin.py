@@ -1,12 +1,15 @@
 """
 Suche: Text-Eingabe, Ausfuehrung, Ergebnis-Anzeige
 """
-import asyncio
-
 from PySide6.QtWidgets import QListWidgetItem
 
 from PySide6.QtCore import Qt
 
+from xtream_api import SeriesCatalog
+from compute_executor import run_compute
+from async_profiler import operation
+from task_scopes import SCOPE_SEARCH
+
 
 class SearchMixin:
 
@@ -24,8 +27,22 @@ class SearchMixin:
             return
         if self.current_mode != "search":
             self._switch_mode("search")
-        asyncio.ensure_future(self._perform_search(query))
+        self.task_scopes.spawn(SCOPE_SEARCH, self._perform_search(query))
+
+    def _reset_search_cache(self):
+        """Suchkataloge verwerfen (Account-Wechsel, Aktualisieren); auch das
+        Catchup-Nachschlagen der Wiedergabe nutzt den Live-Katalog"""
+        self._search_cache_live = []
+        self._search_cache_vod = []
+        self._search_cache_series = []
+        self._search_cache_loaded = False
+
+    @staticmethod
+    async def _search_in(cache, query_lower: str):
+        """Filtert einen Katalog, grosse Kataloge im Worker statt in der GUI-Loop"""
+        return await run_compute(cache.search, query_lower, size=len(cache), in_thread=True)
 
+    @operation
     async def _perform_search(self, query: str):
         """Durchsucht alle Streams nach dem Suchbegriff"""
         self._show_loading("Suche laeuft...")
@@ -40,38 +57,29 @@ class SearchMixin:
                 try:
                     self._search_cache_series = await self.api.get_series()
                 except Exception:
-                    self._search_cache_series = []
+                    self._search_cache_series = SeriesCatalog()
                 self._search_cache_loaded = True
 
             # Live-Streams filtern
-            for item in self._search_cache_live:
-                if not item.name:
-                    continue
-                if query_lower in item.name.lower():
-                    name = f"[Live] {item.name}"
-                    if item.tv_archive:
-                        name += "  \u25C2\u25C2"
-                    list_item = QListWidgetItem(name)
-                    list_item.setData(Qt.UserRole, item)
-                    self.channel_list.addItem(list_item)
+            for item in await self._search_in(self._search_cache_live, query_lower):
+                name = f"[Live] {item.name}"
+                if item.tv_archive:
+                    name += "  \u25C2\u25C2"
+                list_item = QListWidgetItem(name)
+                list_item.setData(Qt.UserRole, item)
+                self.channel_list.addItem(list_item)
 
             # VOD filtern
-            for item in self._search_cache_vod:
-                if not item.name:
-                    continue
-                if query_lower in item.name.lower():
-                    list_item = QListWidgetItem(f"[Film] {item.name}")
-                    list_item.setData(Qt.UserRole, item)
-                    self.channel_list.addItem(list_item)
+            for item in await self._search_in(self._search_cache_vod, query_lower):
+                list_item = QListWidgetItem(f"[Film] {item.name}")
+                list_item.setData(Qt.UserRole, item)
+                self.channel_list.addItem(list_item)
 
             # Serien filtern
-            for item in self._search_cache_series:
-                if not item.name:
-                    continue
-                if query_lower in item.name.lower():
-                    list_item = QListWidgetItem(f"[Serie] {item.name}")
-                    list_item.setData(Qt.UserRole, item)
-                    self.channel_list.addItem(list_item)
+            for item in await self._search_in(self._search_cache_series, query_lower):
+                list_item = QListWidgetItem(f"[Serie] {item.name}")
+                list_item.setData(Qt.UserRole, item)
+                self.channel_list.addItem(list_item)
 
             count = self.channel_list.count()
             self._hide_loading(f"{count} Treffer fuer \"{query}\"")
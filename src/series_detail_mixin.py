@@ -1,7 +1,6 @@
 """
 Serien-Details: Staffeln, Episoden, Cover-Laden
 """
-import asyncio
 import aiohttp
 
 from PySide6.QtCore import Qt, Slot, QTimer, QSize
@@ -9,13 +8,19 @@ from PySide6.QtWidgets import (
     QListWidgetItem, QWidget, QHBoxLayout, QVBoxLayout, QLabel, QSizePolicy
 )
 
-from xtream_api import Series
+from xtream_api import Series, parse_series_info
+from detail_cache import KIND_SERIES
+from task_scopes import SCOPE_DETAIL
+
+# Groesse des Covers in der Detailansicht (auch fuer das Vorladen)
+SERIES_COVER_SIZE = (200, 300)
 
 
 class SeriesDetailMixin:
 
     def _show_series_detail(self, series: Series):
         """Zeigt die Serien-Detailansicht an"""
+        self._ensure_series_detail_page()
         self._current_series = series
         if series.category_id:
             account = self.account_manager.get_selected()
@@ -52,13 +57,13 @@ class SeriesDetailMixin:
         self.channel_area.setMaximumWidth(16777215)
 
         self.channel_stack.setCurrentIndex(1)
-        asyncio.ensure_future(self._load_series_detail(series))
+        self.task_scopes.spawn(SCOPE_DETAIL, self._load_series_detail(series))
 
     async def _load_series_detail(self, series: Series):
         """Laedt Serien-Details asynchron"""
         self._show_loading("Lade Serien-Informationen...")
         try:
-            data = await self.api.get_series_info_parsed(series.series_id)
+            data = parse_series_info(await self._fetch_series_info(series))
             self._series_data = data
 
             # Info aktualisieren (API liefert oft ausfuehrlichere Daten)
@@ -112,17 +117,29 @@ class SeriesDetailMixin:
             self.btn_series_trailer.show()
 
             # Cover laden
-            cover_url = info.get("cover", "") or series.cover
+            cover_url = self._series_cover_url(series, info)
             if cover_url:
-                asyncio.ensure_future(self._load_series_cover(cover_url))
+                self.task_scopes.spawn(SCOPE_DETAIL, self._load_series_cover(cover_url), replace=False)
 
         except Exception as e:
             self._hide_loading(f"Fehler: {e}")
 
+    async def _fetch_series_info(self, series: Series) -> dict:
+        """Rohe get_series_info-Antwort ueber den Detail-Cache (Speicher/Platte)"""
+        api = self.api
+        return await self.detail_cache.fetch(
+            self._detail_cache_account(), KIND_SERIES, series.series_id,
+            lambda: api.get_series_info(series.series_id),
+        )
+
+    @staticmethod
+    def _series_cover_url(series: Series, info: dict) -> str:
+        return info.get("cover", "") or series.cover
+
     async def _load_series_cover(self, url: str):
         """Laedt das Serien-Cover asynchron"""
         async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            pixmap = await self._fetch_poster(session, url, 200, 300)
+            pixmap = await self._fetch_poster(session, url, *SERIES_COVER_SIZE)
             if pixmap:
                 self.series_cover_label.setPixmap(pixmap)
                 self.series_cover_label.setText("")
@@ -240,6 +257,8 @@ class SeriesDetailMixin:
 
     def _series_back(self):
         """Zurueck zur Kanalliste"""
+        if self.task_scopes.cancel(SCOPE_DETAIL):
+            self.loading_bar.hide()
         self.channel_stack.setCurrentIndex(0)
         # Exakt gespeicherten Zustand wiederherstellen
         min_w = getattr(self, "_series_channel_area_min", 0)
@@ -0,0 +1,144 @@
+"""
+Sortierung von VOD-/Serien-Kategorien: Schluessel einmal pro Kategorie vorberechnen,
+sortierte Reihenfolgen je Sortiermodus cachen
+"""
+from array import array
+from datetime import datetime
+from typing import Optional
+
+from catalog import Catalog
+
+# Reihenfolge wie in der Sortier-Auswahl (sort_combo)
+SORT_DEFAULT = 0
+SORT_ADDED = 1
+SORT_RATING = 2
+SORT_NAME_ASC = 3
+SORT_NAME_DESC = 4
+
+
+def rating_value(rating: str) -> float:
+    try:
+        return float(rating) if rating else 0.0
+    except ValueError:
+        return 0.0
+
+
+def added_value(added: str) -> int:
+    """'added' als Unix-Zeit: Xtream liefert Sekunden als Text, manche Panels ein Datum"""
+    if not added:
+        return 0
+    try:
+        return int(added)
+    except ValueError:
+        pass
+    try:
+        return int(datetime.fromisoformat(added.strip()).timestamp())
+    except ValueError:
+        return 0
+
+
+# Schluesselspalte je Sortiermodus
+_MODE_FIELDS = {
+    SORT_ADDED: "added",
+    SORT_RATING: "rating",
+    SORT_NAME_ASC: "name",
+    SORT_NAME_DESC: "name",
+}
+
+
+def sort_keys(catalog: Catalog, field: str, scores: Optional[dict] = None):
+    """Sortierschluessel einer Spalte (Name casefold, Bewertung als Zahl,
+    'added' als Zeitstempel)"""
+    column = catalog.column(field)
+    if field == "name":
+        return [name.casefold() for name in column]
+    if field == "rating":
+        keys = array("d", map(rating_value, column))
+        if scores:
+            # TMDB-Bewertung statt Anbieter-Bewertung, wo vorhanden
+            tmdb = catalog.column("tmdb")
+            keys = array("d", (scores.get(t, r) for t, r in zip(tmdb, keys)))
+        return keys
+    if field == "added":
+        return array("q", map(added_value, column))
+    raise KeyError(field)
+
+
+def compute_order(catalog: Catalog, mode: int, keys=None,
+                  scores: Optional[dict] = None) -> tuple[array, object]:
+    """Reihenfolge fuer `mode` berechnen, ohne einen SortIndex zu veraendern
+    (laeuft im Worker). `keys`: bereits bekannte Schluessel des Modus oder None.
+    Liefert (Reihenfolge, Schluessel)."""
+    field = _MODE_FIELDS.get(mode)
+    if field is None:
+        return array("q", range(len(catalog))), None
+    if keys is None:
+        keys = sort_keys(catalog, field, scores)
+    # sorted(reverse=True) bleibt stabil: gleiche Schluessel behalten die
+    # Katalog-Reihenfolge, auch bei Z-A
+    reverse = mode != SORT_NAME_ASC
+    order = array("q", sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse))
+    return order, keys
+
+
+class SortIndex:
+    """Sortierschluessel und Reihenfolgen fuer einen Katalog.
+
+    Die Schluessel werden beim ersten Bedarf einmal berechnet, jede
+    Reihenfolge einmal pro Sortiermodus. Ein Wechsel der Sortierung ordnet
+    danach nur noch die Ansicht um. Der Zustand wird nur im GUI-Thread
+    geaendert: Worker rechnen mit compute_order() auf einer Momentaufnahme
+    (order_args), das Ergebnis uebernimmt remember_order().
+    """
+
+    def __init__(self, catalog: Catalog):
+        self.catalog = catalog
+        self._keys: dict[str, object] = {}
+        self._orders: dict[int, array] = {}
+        self._scores: Optional[dict] = None
+
+    def __len__(self) -> int:
+        return len(self.catalog)
+
+    def set_scores(self, scores: Optional[dict]):
+        """Externe Bewertungen (tmdb_id -> Wert) setzen; verwirft nur die Bewertungs-Reihenfolge."""
+        scores = scores or None
+        if scores == self._scores:
+            return
+        self._scores = scores
+        self._keys.pop("rating", None)
+        self._orders.pop(SORT_RATING, None)
+
+    def has_order(self, mode: int) -> bool:
+        return mode == SORT_DEFAULT or mode in self._orders
+
+    def order_args(self, mode: int) -> tuple:
+        """Argumente fuer compute_order(): Katalog, Modus, bekannte Schluessel, Bewertungen"""
+        return self.catalog, mode, self._keys.get(_MODE_FIELDS.get(mode)), self._scores
+
+    def remember_order(self, mode: int, order: array, keys=None,
+                       scores: Optional[dict] = None) -> bool:
+        """Im Worker berechnete Reihenfolge uebernehmen. Verworfen, wenn sich die
+        Bewertungen seit order_args() geaendert haben."""
+        if mode == SORT_RATING and scores != self._scores:
+            return False
+        field = _MODE_FIELDS.get(mode)
+        if field is not None and keys is not None:
+            self._keys.setdefault(field, keys)
+        self._orders.setdefault(mode, order)
+        return True
+
+    def order(self, mode: int) -> array:
+        """Zeilennummern in Sortier-Reihenfolge (gecacht)."""
+        order = self._orders.get(mode)
+        if order is None:
+            args = self.order_args(mode)
+            order, keys = compute_order(*args)
+            self.remember_order(mode, order, keys, args[3])
+        return order
+
+    def view(self, mode: int) -> Catalog:
+        """Katalog-Ansicht in Sortier-Reihenfolge (teilt die Spalten)."""
+        if mode == SORT_DEFAULT:
+            return self.catalog
+        return self.catalog.take(self.order(mode))
@@ -0,0 +1,127 @@
+"""
+Startzeit-Messung: Phasen vom Programmstart bis zum ersten Poster als
+Chrome-Trace (chrome://tracing, ui.perfetto.dev)
+
+Nur aktiv mit gesetzter Umgebungsvariable, sonst sind alle Aufrufe No-ops:
+    IPTV_STARTUP_TRACE=<datei.json>   Trace nach dem letzten Meilenstein schreiben
+    IPTV_STARTUP_TRACE_EXIT=1         App danach beenden (Benchmarks)
+    IPTV_STARTUP_TRACE_TIMEOUT=<s>    spaetestens nach so vielen Sekunden schreiben (Standard 60)
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# Zeitbasis: Import dieses Moduls (main.py importiert es als erstes)
+_T0 = time.perf_counter()
+_T0_UNIX = time.time()
+
+TRACE_PATH = os.environ.get("IPTV_STARTUP_TRACE", "")
+EXIT_AFTER = os.environ.get("IPTV_STARTUP_TRACE_EXIT", "") not in ("", "0")
+
+# Mit dem Ende dieser Phase ist der Start abgeschlossen
+FINAL_PHASE = "first_poster"
+
+# Spuren im Trace: synchroner Aufbau und asynchrones Nachladen getrennt,
+# damit sich ueberlappende Phasen nicht falsch verschachteln
+_TRACKS = {"main": 1, "async": 2}
+
+_open: dict[str, tuple[float, int]] = {}
+_done: set[str] = set()
+_events: list[dict] = []
+_finished = False
+
+
+def enabled() -> bool:
+    return bool(TRACE_PATH) and not _finished
+
+
+def _now_us() -> float:
+    return (time.perf_counter() - _T0) * 1e6
+
+
+def begin(name: str, track: str = "main"):
+    """Phase beginnen; jede Phase wird nur beim ersten Mal gemessen"""
+    if not enabled() or name in _open or name in _done:
+        return
+    _open[name] = (_now_us(), _TRACKS[track])
+
+
+def end(name: str, **args):
+    """Phase beenden (ohne vorheriges begin() wirkungslos)"""
+    if not enabled() or name not in _open:
+        return
+    start, tid = _open.pop(name)
+    _done.add(name)
+    _events.append({
+        "name": name, "cat": "startup", "ph": "X", "pid": os.getpid(), "tid": tid,
+        "ts": round(start, 1), "dur": round(_now_us() - start, 1), "args": args,
+    })
+    if name == FINAL_PHASE:
+        finish()
+
+
+@contextmanager
+def phase(name: str, track: str = "main"):
+    begin(name, track)
+    try:
+        yield
+    finally:
+        end(name)
+
+
+def instant(name: str, **args):
+    """Zeitpunkt ohne Dauer (z.B. 'Fenster sichtbar')"""
+    if not enabled() or name in _done:
+        return
+    _done.add(name)
+    _events.append({
+        "name": name, "cat": "startup", "ph": "i", "s": "p", "pid": os.getpid(),
+        "tid": _TRACKS["main"], "ts": round(_now_us(), 1), "args": args,
+    })
+
+
+def arm_timeout():
+    """Trace spaetestens nach IPTV_STARTUP_TRACE_TIMEOUT Sekunden schreiben (QApplication noetig)"""
+    if not enabled():
+        return
+    from PySide6.QtCore import QTimer
+    timeout_s = float(os.environ.get("IPTV_STARTUP_TRACE_TIMEOUT", "60"))
+    QTimer.singleShot(int(timeout_s * 1000), lambda: finish(timed_out=True))
+
+
+def finish(timed_out: bool = False):
+    """Trace schreiben; offene Phasen gelten als nicht erreicht"""
+    global _finished
+    if not enabled():
+        return
+    _finished = True
+    pid = os.getpid()
+    meta = [
+        {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "MF IPTV Player"}},
+    ] + [
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": track}}
+        for track, tid in _TRACKS.items()
+    ]
+    trace = {
+        "traceEvents": meta + _events,
+        "displayTimeUnit": "ms",
+        "otherData": {
+            "t0_unix": _T0_UNIX,
+            "timed_out": timed_out,
+            "unfinished": sorted(_open),
+        },
+    }
+    try:
+        with open(TRACE_PATH, "w", encoding="utf-8") as f:
+            json.dump(trace, f, indent=1)
+    except OSError:
+        pass
+    if EXIT_AFTER:
+        from PySide6.QtCore import QTimer
+        from PySide6.QtWidgets import QApplication
+
+        def quit_app():
+            QApplication.closeAllWindows()
+            QApplication.quit()
+        QTimer.singleShot(0, quit_app)
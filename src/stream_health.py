@@ -0,0 +1,211 @@
+"""
+Stream-Gesundheit: Reconnect-Strategie, Format-Fallback und Kennzahlen pro Sender
+"""
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Optional
+
+from platform_utils import get_config_dir
+
+
+# Container-Formate fuer Live-Streams in Fallback-Reihenfolge
+LIVE_FORMATS = ("m3u8", "ts")
+
+# Fehlerklassen: Basis-Verzoegerung (ms) und ab welchem Versuch das Format gewechselt wird
+FAILURE_HTTP = "http"     # mpv end-file 'error' (HTTP-Fehler, Verbindung abgelehnt)
+FAILURE_EOF = "eof"       # Demuxer-EOF (Server beendet Verbindung)
+FAILURE_STALL = "stall"   # Buffering-Watchdog (keine Daten mehr)
+
+_BACKOFF_BASE_MS = {FAILURE_HTTP: 1500, FAILURE_EOF: 500, FAILURE_STALL: 1000}
+_SWITCH_FORMAT_AFTER = {FAILURE_HTTP: 1, FAILURE_EOF: 3, FAILURE_STALL: 2}
+_BACKOFF_MAX_MS = 20000
+
+# Reconnect-Sturm: so viele Reconnects innerhalb des Fensters
+_STORM_WINDOW_S = 120
+_STORM_THRESHOLD = 6
+
+# Gewichtung der Score-Glaettung (EWMA)
+_SCORE_ALPHA = 0.25
+
+# Gebuendeltes Speichern: so lange nach der letzten Aenderung
+_SAVE_DELAY_S = 5.0
+# Gespeicherte Sender: laenger nicht gesehene fallen heraus, hoechstens so viele
+MAX_CHANNELS = 500
+MAX_AGE_S = 90 * 24 * 3600
+
+
+def failure_class(reason: str) -> str:
+    """Ordnet einen mpv end-file-Grund einer Fehlerklasse zu."""
+    if reason == "error":
+        return FAILURE_HTTP
+    if reason == "stall":
+        return FAILURE_STALL
+    return FAILURE_EOF
+
+
+@dataclass
+class ChannelHealth:
+    scores: dict = field(default_factory=dict)  # Format -> Score 0.0-1.0
+    failures: int = 0
+    recoveries: int = 0
+    last_failure: float = 0.0
+    last_seen: float = 0.0
+
+
+class StreamHealthTracker:
+    """Fuehrt einen Gesundheits-Score pro Sender und Format und plant Reconnects."""
+
+    def __init__(self, config_path: Optional[Path] = None):
+        if config_path is None:
+            config_path = get_config_dir() / "stream_health.json"
+        self.config_path = config_path
+        self.channels: dict[str, ChannelHealth] = {}
+        self._reconnect_times: list[float] = []
+        self._storms = 0
+        self._recovery_durations: list[float] = []
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._load()
+
+    def _load(self):
+        if not self.config_path.exists():
+            return
+        try:
+            with open(self.config_path) as f:
+                data = json.load(f)
+            self.channels = {
+                key: ChannelHealth(**value) for key, value in data.get("channels", {}).items()
+            }
+            now = time.time()
+            for health in self.channels.values():
+                if not health.last_seen:
+                    health.last_seen = now  # Eintraege aelterer Versionen: ab jetzt altern lassen
+        except (json.JSONDecodeError, TypeError, AttributeError):
+            self.channels = {}
+
+    def save(self):
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        self._prune()
+        data = {"channels": {key: asdict(h) for key, h in self.channels.items()}}
+        with open(self.config_path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    def _schedule_save(self):
+        """Speichert gebuendelt (_SAVE_DELAY_S nach der letzten Aenderung) statt bei jedem Zap."""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save()
+            return
+        self._save_handle = loop.call_later(_SAVE_DELAY_S, self.save)
+
+    def flush(self):
+        """Ausstehende Aenderungen sofort schreiben (beim Beenden)."""
+        if self._save_handle is not None:
+            self.save()
+
+    def _prune(self):
+        """Lange nicht gesehene Sender verwerfen, Anzahl auf MAX_CHANNELS begrenzen."""
+        cutoff = time.time() - MAX_AGE_S
+        recent = [(key, h) for key, h in self.channels.items() if h.last_seen >= cutoff]
+        if len(recent) > MAX_CHANNELS:
+            recent.sort(key=lambda item: item[1].last_seen, reverse=True)
+            recent = recent[:MAX_CHANNELS]
+        if len(recent) != len(self.channels):
+            self.channels = dict(recent)
+
+    def _channel(self, key: str) -> ChannelHealth:
+        health = self.channels.get(key)
+        if health is None:
+            health = ChannelHealth()
+            self.channels[key] = health
+        health.last_seen = time.time()
+        return health
+
+    def preferred_format(self, key: str) -> str:
+        """Format mit dem besten Score; bei Gleichstand gilt die Fallback-Reihenfolge."""
+        scores = self.channels[key].scores if key in self.channels else {}
+        return max(LIVE_FORMATS, key=lambda ext: (scores.get(ext, 0.5), -LIVE_FORMATS.index(ext)))
+
+    def score(self, key: str, ext: str) -> float:
+        health = self.channels.get(key)
+        return health.scores.get(ext, 0.5) if health else 0.5
+
+    def _update_score(self, key: str, ext: str, ok: bool):
+        health = self._channel(key)
+        old = health.scores.get(ext, 0.5)
+        health.scores[ext] = round((1 - _SCORE_ALPHA) * old + _SCORE_ALPHA * (1.0 if ok else 0.0), 4)
+
+    def record_failure(self, key: str, ext: str, failure: str):
+        """Verbindungsabbruch registrieren (Score senken, Sturm-Erkennung)."""
+        now = time.time()
+        health = self._channel(key)
+        health.failures += 1
+        health.last_failure = now
+        if ext:
+            self._update_score(key, ext, False)
+        self._reconnect_times = [t for t in self._reconnect_times if now - t < _STORM_WINDOW_S]
+        self._reconnect_times.append(now)
+        if len(self._reconnect_times) == _STORM_THRESHOLD:
+            self._storms += 1
+        self._schedule_save()
+
+    def record_success(self, key: str, ext: str, recovered_after: float = 0.0):
+        """Stream laeuft (wieder). recovered_after > 0 = Dauer der Unterbrechung in Sekunden."""
+        if ext:
+            self._update_score(key, ext, True)
+        if recovered_after > 0:
+            self._channel(key).recoveries += 1
+            self._recovery_durations = (self._recovery_durations + [recovered_after])[-50:]
+        self._schedule_save()
+
+    def next_attempt(self, key: str, failure: str, attempt: int, current_ext: str) -> tuple[int, str]:
+        """Berechnet (Verzoegerung in ms, Format) fuer Reconnect-Versuch `attempt` (1-basiert).
+
+        Exponentielles Backoff mit Jitter je Fehlerklasse; ab einer klassenabhaengigen
+        Anzahl Versuche wird abwechselnd das alternative Container-Format probiert.
+        """
+        base = _BACKOFF_BASE_MS.get(failure, 1000)
+        ceiling = min(_BACKOFF_MAX_MS, base * (2 ** (attempt - 1)))
+        delay = int(ceiling / 2 + random.uniform(0, ceiling / 2))
+
+        if self.in_storm:
+            # Viele Abbrueche in kurzer Zeit: Server nicht zusaetzlich belasten
+            delay = min(_BACKOFF_MAX_MS * 2, delay * 2)
+
+        ext = current_ext
+        switch_after = _SWITCH_FORMAT_AFTER.get(failure, 2)
+        if attempt >= switch_after and current_ext:
+            # Format mit besserem Score zuerst, sonst reihum wechseln
+            others = [e for e in LIVE_FORMATS if e != current_ext]
+            best_other = max(others, key=lambda e: self.score(key, e))
+            if self.score(key, best_other) >= self.score(key, current_ext) or attempt > switch_after:
+                ext = best_other
+        return delay, ext
+
+    @property
+    def in_storm(self) -> bool:
+        now = time.time()
+        recent = [t for t in self._reconnect_times if now - t < _STORM_WINDOW_S]
+        return len(recent) >= _STORM_THRESHOLD
+
+    def metrics(self) -> dict:
+        """Kennzahlen fuer Diagnose/Stream-Info."""
+        now = time.time()
+        recent = [t for t in self._reconnect_times if now - t < _STORM_WINDOW_S]
+        durations = self._recovery_durations
+        return {
+            "reconnects_recent": len(recent),
+            "reconnect_storms": self._storms,
+            "in_storm": len(recent) >= _STORM_THRESHOLD,
+            "recoveries": sum(h.recoveries for h in self.channels.values()),
+            "failures": sum(h.failures for h in self.channels.values()),
+            "avg_recovery_s": round(sum(durations) / len(durations), 2) if durations else 0.0,
+        }
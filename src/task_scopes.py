@@ -0,0 +1,90 @@
+"""
+Hintergrund-Aufgaben je UI-Bereich (Kanalliste, Poster, EPG, Suche, Detailseite)
+
+Eine neue Aufgabe bricht die noch laufenden desselben Bereichs ab, damit
+veraltete Ladevorgaenge (schneller Kategorie- oder Moduswechsel) nicht spaet
+die Oberflaeche ueberschreiben. Je Bereich laesst sich die Zahl gleichzeitig
+laufender Aufgaben begrenzen; in_flight() liefert die laufenden Aufgaben je
+Bereich fuer Diagnosezwecke.
+"""
+import asyncio
+from collections import defaultdict
+from typing import Coroutine, Optional
+
+SCOPE_ITEMS = "items"        # Kategorien und Inhalte der Kanalliste
+SCOPE_POSTERS = "posters"    # Poster/Logos der Kanalliste
+SCOPE_EPG = "epg"            # Kurz-EPG des gewaehlten Senders
+SCOPE_SEARCH = "search"
+SCOPE_DETAIL = "detail"      # Film-/Serien-Detailseite inkl. Cover und Bewertungen
+
+# Max. gleichzeitig laufende Aufgaben je Bereich (nicht aufgefuehrt: unbegrenzt)
+SCOPE_LIMITS = {
+    SCOPE_POSTERS: 2,
+    SCOPE_DETAIL: 3,
+}
+
+
+def _current_task() -> Optional[asyncio.Task]:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+
+class TaskScopes:
+    def __init__(self, limits: Optional[dict[str, int]] = None):
+        self._limits = dict(SCOPE_LIMITS if limits is None else limits)
+        self._tasks: dict[str, set[asyncio.Task]] = defaultdict(set)
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def spawn(self, scope: str, coro: Coroutine, replace: bool = True) -> asyncio.Task:
+        """Startet `coro` im Bereich `scope`.
+
+        replace=True: laufende Aufgaben des Bereichs vorher abbrechen (neuer
+        Inhalt ersetzt den alten); False: zusaetzlich starten (z.B. naechste
+        Poster-Seite, Cover zur Detailseite).
+        """
+        if replace:
+            self.cancel(scope)
+        limit = self._limits.get(scope)
+        if limit:
+            limited = self._limited(scope, limit, coro)
+            # Profiler (async_profiler) benennt Aufgaben nach __qualname__:
+            # den Namen der eigentlichen Coroutine statt "TaskScopes._limited"
+            limited.__name__ = getattr(coro, "__name__", limited.__name__)
+            limited.__qualname__ = getattr(coro, "__qualname__", limited.__qualname__)
+            coro = limited
+        task = asyncio.ensure_future(coro)
+        tasks = self._tasks[scope]
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        return task
+
+    async def _limited(self, scope: str, limit: int, coro: Coroutine):
+        sem = self._semaphores.get(scope)
+        if sem is None:
+            sem = self._semaphores[scope] = asyncio.Semaphore(limit)
+        try:
+            async with sem:
+                return await coro
+        finally:
+            # Beim Warten abgebrochen: Coroutine nie gestartet, ohne Warnung schliessen
+            coro.close()
+
+    def cancel(self, *scopes: str) -> int:
+        """Bricht die laufenden Aufgaben der Bereiche ab (nie die aufrufende
+        Aufgabe selbst); liefert die Anzahl abgebrochener Aufgaben"""
+        current = _current_task()
+        cancelled = 0
+        for scope in scopes:
+            for task in list(self._tasks.get(scope, ())):
+                if task is not current and task.cancel():
+                    cancelled += 1
+        return cancelled
+
+    def cancel_all(self) -> int:
+        return self.cancel(*list(self._tasks))
+
+    def in_flight(self) -> dict[str, int]:
+        """Laufende Aufgaben je Bereich (nur Bereiche mit mindestens einer)"""
+        return {scope: len(tasks) for scope, tasks in self._tasks.items() if tasks}
@@ -0,0 +1,338 @@
+"""
+Lokaler Timeshift-Puffer: ffmpeg schreibt den Live-Sender als HLS-Segmente in einen
+begrenzten Ring auf der Platte, mpv spielt daraus (Pause, Zurueckspulen, von Anfang)
+"""
+import asyncio
+import math
+import os
+import shutil
+import signal
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from platform_utils import get_cache_dir
+from recorder import _find_ffmpeg
+
+_IS_WIN = sys.platform == "win32"
+
+# Segmentlaenge in Sekunden (bestimmt auch die Genauigkeit beim Zurueckspulen)
+SEGMENT_SECONDS = 2
+
+LIVE_PLAYLIST = "live.m3u8"
+SNAPSHOT_PLAYLIST = "snapshot.m3u8"
+
+# Mindestanzahl Segmente im Ring, bevor mpv startet bzw. bevor gekuerzt wird
+_MIN_SEGMENTS = 3
+
+# Eintraege in der ffmpeg-Playlist: nur das juengste Stueck, der Ring selbst wird
+# hier verwaltet (ffmpeg loescht keine Segmente)
+_HLS_LIST_SIZE = 30
+
+# Puffer-Verzeichnisse, die so lange unveraendert sind, gehoeren keiner laufenden Instanz
+_STALE_AFTER_S = 300
+
+
+@dataclass
+class _Segment:
+    name: str
+    duration: float
+    start_ts: float  # Wanduhr-Zeit des Segmentanfangs
+    size: int
+    discontinuity: bool = False
+
+
+class TimeshiftBuffer:
+    """Ringpuffer aus HLS-Segmenten fuer genau einen Live-Sender.
+
+    Die Segmente werden wiederverwendet wie ein Ring: sobald das Fenster
+    `max_seconds` oder `max_bytes` ueberschreitet, werden die aeltesten
+    Segmente geloescht. mpv spielt live aus live.m3u8; fuer Pause und
+    Zurueckspulen wird eine abgeschlossene Momentaufnahme (snapshot.m3u8)
+    geschrieben, in der mpv frei spulen kann.
+    """
+
+    def __init__(self, base_dir: Optional[Path] = None,
+                 max_seconds: int = 3600, max_bytes: int = 2 * 1024 ** 3):
+        if base_dir is None:
+            base_dir = get_cache_dir() / "timeshift"
+        self.base_dir = base_dir
+        self.max_seconds = max_seconds
+        self.max_bytes = max_bytes
+        self.stream_key = None
+        self._segments: list[_Segment] = []
+        self._run_seq = -1  # Nummer des zuletzt uebernommenen Segments im aktuellen ffmpeg-Lauf
+        self._media_sequence = 0
+        self._run = 0
+        self._session = 0  # je start(); ein abgeloester start() gibt auf
+        self._total_bytes = 0
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._task: Optional[asyncio.Task] = None
+        self._dir: Optional[Path] = None
+
+    @property
+    def active(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def live_playlist(self) -> Optional[Path]:
+        return self._dir / LIVE_PLAYLIST if self._dir else None
+
+    def window(self) -> tuple[float, float]:
+        """Zeitfenster (Wanduhr) das im Puffer liegt"""
+        if not self._segments:
+            return 0.0, 0.0
+        last = self._segments[-1]
+        return self._segments[0].start_ts, last.start_ts + last.duration
+
+    async def start(self, url: str, stream_key, timeout: float = 15.0) -> Optional[Path]:
+        """Startet den Puffer fuer `url` und wartet, bis genug Segmente fuer mpv da sind.
+
+        Gibt den Pfad der Live-Playlist zurueck oder None, wenn ffmpeg keinen
+        Stream liefert (dann direkt abspielen).
+        """
+        self.stop()
+        session = self._session
+        self.stream_key = stream_key
+        self._dir = self.base_dir / f"{os.getpid()}_{int(time.time() * 1000)}"
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._task = asyncio.ensure_future(self._supervise(url, self._dir))
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and self.active:
+            if len(self._segments) >= _MIN_SEGMENTS:
+                return self.live_playlist
+            await asyncio.sleep(0.25)
+            if self._session != session:
+                return None  # inzwischen gestoppt oder neuer Sender: dessen Puffer nicht anfassen
+        if self._session == session:
+            self.stop()
+        return None
+
+    def stop(self):
+        """Beendet ffmpeg und verwirft den Puffer (blockiert nicht)."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._terminate()
+        if self._dir:
+            asyncio.ensure_future(asyncio.to_thread(shutil.rmtree, self._dir, True))
+        self._dir = None
+        self.stream_key = None
+        self._session += 1
+        self._segments = []
+        self._run_seq = -1
+        self._media_sequence = 0
+        self._run = 0
+        self._total_bytes = 0
+
+    def cleanup_stale(self):
+        """Entfernt Puffer-Verzeichnisse frueherer Sitzungen (Absturz).
+
+        Verzeichnisse anderer laufender Instanzen werden laufend beschrieben
+        (neue Segmente) und bleiben deshalb unangetastet.
+        """
+        if not self.base_dir.exists():
+            return
+        now = time.time()
+        for path in self.base_dir.iterdir():
+            if not path.is_dir() or path == self._dir:
+                continue
+            try:
+                if now - path.stat().st_mtime < _STALE_AFTER_S:
+                    continue
+            except OSError:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+
+    def snapshot(self, start_ts: float) -> tuple[Path, float]:
+        """Schreibt eine abgeschlossene Playlist ab dem Segment, das `start_ts` enthaelt.
+
+        Gibt (Pfad, tatsaechlicher Startzeitpunkt) zurueck; liegt `start_ts` vor dem
+        Puffer, beginnt die Playlist beim aeltesten Segment.
+        """
+        segments = self._segments
+        first = 0
+        for i, seg in enumerate(segments):
+            if seg.start_ts + seg.duration > start_ts:
+                first = i
+                break
+        else:
+            first = max(0, len(segments) - 1)
+        path = self._dir / SNAPSHOT_PLAYLIST
+        self._write_playlist(path, segments[first:], self._media_sequence + first, ended=True)
+        return path, segments[first].start_ts if segments else start_ts
+
+    # ── ffmpeg-Ueberwachung ───────────────────────────────────────────
+
+    async def _supervise(self, url: str, directory: Path):
+        """ffmpeg laufen lassen und bei Abbruch mit Backoff neu starten."""
+        delay = 1.0
+        try:
+            while True:
+                self._run += 1
+                self._run_seq = -1
+                await self._spawn(url, directory)
+                while True:
+                    try:
+                        await asyncio.wait_for(self._process.wait(), timeout=SEGMENT_SECONDS)
+                        break
+                    except asyncio.TimeoutError:
+                        if self._collect(directory):
+                            delay = 1.0
+                self._collect(directory)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+        finally:
+            self._terminate()
+
+    async def _spawn(self, url: str, directory: Path):
+        run = self._run
+        popen_kwargs = {}
+        if _IS_WIN:
+            import subprocess
+            popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            popen_kwargs["start_new_session"] = True
+        self._process = await asyncio.create_subprocess_exec(
+            _find_ffmpeg(),
+            "-nostdin",
+            "-loglevel", "error",
+            "-extension_picky", "0",
+            "-reconnect", "1",
+            "-reconnect_streamed", "1",
+            "-reconnect_delay_max", "5",
+            "-i", url,
+            "-map", "0:v?",
+            "-map", "0:a?",
+            "-c", "copy",
+            "-f", "hls",
+            "-hls_time", str(SEGMENT_SECONDS),
+            # Kurze Liste (ohne delete_segments): der Ring wird hier verwaltet
+            "-hls_list_size", str(_HLS_LIST_SIZE),
+            "-hls_flags", "program_date_time+omit_endlist",
+            "-hls_segment_filename", str(directory / f"r{run}_%06d.ts"),
+            str(directory / f"run{run}.m3u8"),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+            **popen_kwargs,
+        )
+
+    def _terminate(self):
+        proc = self._process
+        self._process = None
+        if not proc or proc.returncode is not None:
+            return
+        try:
+            if _IS_WIN:
+                proc.kill()
+            else:
+                os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, OSError):
+            pass
+
+    # ── Ring-Verwaltung ──────────────────────────────────────────────
+
+    def _collect(self, directory: Path) -> bool:
+        """Neue Segmente aus der ffmpeg-Playlist uebernehmen. True wenn neue dazukamen."""
+        run_playlist = directory / f"run{self._run}.m3u8"
+        try:
+            lines = run_playlist.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return False
+
+        added = False
+        first_of_run = self._run_seq < 0
+        duration = 0.0
+        program_ts = None
+        for line in lines:
+            if line.startswith("#EXTINF:"):
+                try:
+                    duration = float(line[8:].split(",", 1)[0])
+                except ValueError:
+                    duration = float(SEGMENT_SECONDS)
+            elif line.startswith("#EXT-X-PROGRAM-DATE-TIME:"):
+                program_ts = _parse_program_date(line.split(":", 1)[1])
+            elif line and not line.startswith("#"):
+                name = line.strip()
+                seq = _segment_number(name)
+                if seq > self._run_seq:
+                    try:
+                        size = (directory / name).stat().st_size
+                    except OSError:
+                        size = 0
+                    if program_ts is None:
+                        prev = self._segments[-1] if self._segments else None
+                        program_ts = prev.start_ts + prev.duration if prev else time.time() - duration
+                    self._segments.append(_Segment(
+                        name, duration, program_ts, size,
+                        discontinuity=first_of_run and bool(self._segments),
+                    ))
+                    self._run_seq = seq
+                    self._total_bytes += size
+                    first_of_run = False
+                    added = True
+                program_ts = None
+
+        if added:
+            self._trim(directory)
+            self._write_playlist(directory / LIVE_PLAYLIST, self._segments,
+                                 self._media_sequence, ended=False)
+        return added
+
+    def _trim(self, directory: Path):
+        """Aelteste Segmente loeschen bis Zeit- und Platz-Grenze eingehalten sind."""
+        while len(self._segments) > _MIN_SEGMENTS:
+            start, end = self.window()
+            if end - start <= self.max_seconds and self._total_bytes <= self.max_bytes:
+                break
+            seg = self._segments.pop(0)
+            self._total_bytes -= seg.size
+            self._media_sequence += 1
+            try:
+                (directory / seg.name).unlink()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _write_playlist(path: Path, segments: list[_Segment], media_sequence: int, ended: bool):
+        target = max((s.duration for s in segments), default=SEGMENT_SECONDS)
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{math.ceil(target)}",
+            f"#EXT-X-MEDIA-SEQUENCE:{media_sequence}",
+        ]
+        if ended:
+            lines.append("#EXT-X-PLAYLIST-TYPE:VOD")
+        for seg in segments:
+            if seg.discontinuity:
+                lines.append("#EXT-X-DISCONTINUITY")
+            lines.append(f"#EXTINF:{seg.duration:.3f},")
+            lines.append(seg.name)
+        if ended:
+            lines.append("#EXT-X-ENDLIST")
+        # Atomar ersetzen, damit mpv nie eine halbe Playlist liest
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        tmp.replace(path)
+
+
+def _segment_number(name: str) -> int:
+    """Laufende Nummer aus "r<lauf>_<nummer>.ts" (-1 wenn unlesbar)"""
+    try:
+        return int(name.rsplit("_", 1)[1].split(".", 1)[0])
+    except (IndexError, ValueError):
+        return -1
+
+
+def _parse_program_date(value: str) -> Optional[float]:
+    """EXT-X-PROGRAM-DATE-TIME (ISO 8601) als Unix-Zeitstempel"""
+    try:
+        return datetime.fromisoformat(value.strip()).timestamp()
+    except ValueError:
+        return None
@@ -0,0 +1,237 @@
+"""
+TMDB-Anreicherung: Bewertungen und Beschreibungen mit persistentem Cache,
+gemeinsamer HTTP-Session und Ratenbegrenzung
+
+Konfiguration ueber Umgebungsvariablen:
+    TMDB_API_KEY  API-Schluessel (v3)
+    TMDB_API_URL  Basis-URL, z.B. ein lokaler Stand-in fuer Tests/Offline-Betrieb
+"""
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import aiohttp
+
+from platform_utils import get_cache_dir
+
+DEFAULT_API_URL = "https://api.themoviedb.org/3"
+
+# Felder, die aus der TMDB-Antwort behalten werden
+_KEPT_FIELDS = ("vote_average", "vote_count", "overview")
+# Obergrenze fuer den Cache auf der Platte (aelteste Eintraege fallen zuerst)
+MAX_CACHE_ENTRIES = 20000
+
+
+class TmdbService:
+    """Holt Film-Daten von TMDB und cacht sie pro (tmdb_id, Sprache).
+
+    Alle Requests laufen ueber eine gemeinsame Session (Keep-Alive) und
+    einen einfachen Ratenbegrenzer (`max_per_second`, hoechstens
+    `max_concurrent` gleichzeitig). Antwortet TMDB mit 429, wird die in
+    Retry-After genannte Zeit gewartet. Auch "nicht gefunden" wird gecacht,
+    damit fehlende IDs nicht bei jedem Oeffnen erneut angefragt werden.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 language: str = "de-DE", cache_file: Optional[Path] = None,
+                 ttl: float = 7 * 24 * 3600, max_per_second: float = 20.0,
+                 max_concurrent: int = 4):
+        self.api_key = api_key if api_key is not None else os.environ.get("TMDB_API_KEY", "")
+        env_url = os.environ.get("TMDB_API_URL", "")
+        self.base_url = (base_url or env_url or DEFAULT_API_URL).rstrip("/")
+        self.language = language
+        self.cache_file = cache_file or get_cache_dir() / "tmdb_cache.json"
+        self.ttl = ttl
+        self._interval = 1.0 / max_per_second
+        self._max_concurrent = max_concurrent
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._next_slot = 0.0
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._cache: dict[str, dict] = {}
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._load_cache()
+
+    @property
+    def available(self) -> bool:
+        """True mit API-Schluessel oder eigener Basis-URL (lokaler Stand-in)."""
+        return bool(self.api_key) or self.base_url != DEFAULT_API_URL
+
+    def _key(self, tmdb_id) -> str:
+        return f"{tmdb_id}|{self.language}"
+
+    # ── Cache ───────────────────────────────────────────────────────
+
+    def _load_cache(self):
+        try:
+            if self.cache_file.exists():
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    cache = json.load(f)
+                self._cache = cache if isinstance(cache, dict) else {}
+        except Exception:
+            self._cache = {}
+        self._prune()
+
+    def _prune(self):
+        """Abgelaufene Eintraege verwerfen, dann auf MAX_CACHE_ENTRIES begrenzen."""
+        now = time.time()
+        expired = [k for k, e in self._cache.items()
+                   if not isinstance(e, dict) or now - e.get("stored", 0) > self.ttl]
+        for key in expired:
+            del self._cache[key]
+        excess = len(self._cache) - MAX_CACHE_ENTRIES
+        if excess > 0:
+            oldest = sorted(self._cache, key=lambda k: self._cache[k].get("stored", 0))
+            for key in oldest[:excess]:
+                del self._cache[key]
+
+    def _write_cache(self, snapshot: dict):
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            tmp.replace(self.cache_file)
+        except OSError:
+            pass
+
+    def _schedule_save(self):
+        """Schreibt den Cache gebuendelt (2s nach der letzten Aenderung) im Hintergrund."""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._save_handle = loop.call_later(2.0, self._save_now)
+
+    def _save_now(self):
+        self._save_handle = None
+        self._prune()
+        snapshot = dict(self._cache)
+        asyncio.ensure_future(asyncio.to_thread(self._write_cache, snapshot))
+
+    def cached(self, tmdb_id) -> Optional[dict]:
+        """Gueltiger Cache-Eintrag oder None (leeres dict = bei TMDB nicht gefunden)."""
+        if not tmdb_id:
+            return None
+        entry = self._cache.get(self._key(tmdb_id))
+        if entry is None or time.time() - entry.get("stored", 0) > self.ttl:
+            return None
+        return entry.get("data", {})
+
+    def cached_scores(self, tmdb_ids: Iterable[str]) -> dict[str, float]:
+        """tmdb_id -> vote_average fuer alle IDs mit bekannter Bewertung."""
+        scores = {}
+        for tmdb_id in tmdb_ids:
+            data = self.cached(tmdb_id)
+            if data and data.get("vote_count", 0) > 0:
+                scores[tmdb_id] = float(data.get("vote_average", 0) or 0)
+        return scores
+
+    # ── Requests ────────────────────────────────────────────────────
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(limit=self._max_concurrent),
+            )
+        return self._session
+
+    async def _wait_for_slot(self):
+        """Verteilt Requests gleichmaessig (hoechstens max_per_second)."""
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def movie(self, tmdb_id) -> Optional[dict]:
+        """Film-Daten (vote_average, vote_count, overview) oder None bei Fehler.
+
+        Ein leeres dict bedeutet: bei TMDB nicht vorhanden.
+        """
+        if not tmdb_id or not self.available:
+            return None
+        tmdb_id = str(tmdb_id)
+        data = self.cached(tmdb_id)
+        if data is not None:
+            return data
+        task = self._inflight.get(tmdb_id)
+        if task is None:
+            task = asyncio.ensure_future(self._request_movie(tmdb_id))
+            self._inflight[tmdb_id] = task
+            task.add_done_callback(lambda t: self._inflight.pop(tmdb_id, None))
+        return await asyncio.shield(task)
+
+    async def _request_movie(self, tmdb_id: str) -> Optional[dict]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrent)
+        params = {"language": self.language}
+        if self.api_key:
+            params["api_key"] = self.api_key
+        url = f"{self.base_url}/movie/{tmdb_id}"
+
+        async with self._semaphore:
+            for _ in range(3):
+                await self._wait_for_slot()
+                try:
+                    async with self._get_session().get(url, params=params) as resp:
+                        if resp.status == 429:
+                            retry_after = resp.headers.get("Retry-After", "1")
+                            delay = float(retry_after) if retry_after.isdigit() else 1.0
+                            self._next_slot = time.monotonic() + delay
+                            continue
+                        if resp.status == 404:
+                            data = {}
+                        elif resp.status != 200:
+                            return None
+                        else:
+                            raw = await resp.json(content_type=None)
+                            if not isinstance(raw, dict):
+                                return None
+                            data = {k: raw.get(k) for k in _KEPT_FIELDS if k in raw}
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                    return None
+                self._cache[self._key(tmdb_id)] = {"stored": time.time(), "data": data}
+                self._schedule_save()
+                return data
+        return None
+
+    async def enrich(self, tmdb_ids: Iterable[str],
+                     should_continue: Callable[[], bool] = lambda: True) -> int:
+        """Laedt fehlende Eintraege fuer viele IDs (z.B. eine ganze VOD-Kategorie).
+
+        Laeuft im Hintergrund; `should_continue()` wird vor jedem Block
+        geprueft, damit ein Kategoriewechsel den Durchlauf beendet.
+        Gibt die Anzahl neu geladener Eintraege zurueck.
+        """
+        missing = [i for i in dict.fromkeys(tmdb_ids) if i and self.cached(i) is None]
+        if not missing or not self.available:
+            return 0
+        loaded = 0
+        batch = self._max_concurrent * 4
+        for start in range(0, len(missing), batch):
+            if not should_continue():
+                break
+            results = await asyncio.gather(
+                *[self.movie(i) for i in missing[start:start + batch]],
+                return_exceptions=True,
+            )
+            loaded += sum(1 for r in results if isinstance(r, dict))
+        return loaded
+
+    def flush(self):
+        """Ausstehende Cache-Aenderungen sofort schreiben (beim Beenden)."""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+            self._prune()
+            self._write_cache(dict(self._cache))
+
+    async def close(self):
+        self.flush()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -9,12 +9,16 @@ from PySide6.QtWidgets import (
     QPushButton, QLineEdit, QLabel, QSlider,
     QFrame, QStatusBar, QGroupBox, QScrollArea, QSplitter,
     QProgressBar, QAbstractItemView, QScroller, QMenu, QTextEdit,
-    QSizePolicy
+    QSizePolicy, QCheckBox
 )
 from PySide6.QtCore import Qt, QSize, Slot, QTimer
 from PySide6.QtGui import QPixmap, QFont
 
 from flow_layout import FlowLayout
+from poster_delegate import PosterItemDelegate
+
+# Anzahl der DANACH-Zeilen im Kanal-Detailpanel
+DETAIL_FUTURE_ENTRIES = 3
 
 
 class UiBuilderMixin:
@@ -375,10 +379,28 @@ class UiBuilderMixin:
         self.lbl_hwdec_hint.hide()
         layout.addWidget(self.lbl_hwdec_hint)
 
+        self.chk_local_timeshift = QCheckBox("Lokaler Timeshift-Puffer fuer Sender ohne Catchup")
+        self.chk_local_timeshift.setStyleSheet("font-size: 13px; color: #ccc;")
+        self.chk_local_timeshift.setToolTip(
+            "Puffert den laufenden Sender auf der Festplatte (max. 60 Min. / 2 GB),\n"
+            "damit Pause, Zurueckspulen und 'Von Anfang' auch ohne Provider-Archiv gehen."
+        )
+        self.chk_local_timeshift.setChecked(self.app_settings.get("local_timeshift_enabled", False))
+        self.chk_local_timeshift.toggled.connect(self._on_local_timeshift_changed)
+        layout.addWidget(self.chk_local_timeshift)
+
         layout.addStretch()
 
         return page
 
+    def _ensure_settings_page(self):
+        """Baut die Einstellungsseite beim ersten Oeffnen"""
+        if self.settings_page is None:
+            self.settings_page = self._create_settings_page()
+            self.content_stack.addWidget(self.settings_page)
+            self._update_account_combo()
+        return self.settings_page
+
     def _create_main_page(self) -> QWidget:
         """Hauptseite mit Kanalliste und integriertem Player"""
         page = QWidget()
@@ -511,6 +533,25 @@ class UiBuilderMixin:
         self._current_category_index = -1
         self.category_btn.clicked.connect(self._toggle_category_list)
         _cat_row_layout.addWidget(self.category_btn, stretch=1)
+
+        # Programmfuehrer (Zeit x Sender) fuer die aktuelle Live-Kategorie
+        self.epg_grid_btn = QPushButton("\u25A6 Guide")
+        self.epg_grid_btn.setToolTip("Programmfuehrer fuer diese Kategorie")
+        self.epg_grid_btn.setCursor(Qt.PointingHandCursor)
+        self.epg_grid_btn.setStyleSheet("""
+            QPushButton {
+                padding: 8px 12px;
+                background: transparent;
+                border: none;
+                border-radius: 0;
+                color: #888;
+                font-size: 12px;
+            }
+            QPushButton:hover { color: white; background: #1c1c2c; }
+        """)
+        self.epg_grid_btn.clicked.connect(self._open_epg_grid)
+        self.epg_grid_btn.setVisible(self.current_mode == "live")
+        _cat_row_layout.addWidget(self.epg_grid_btn)
         cl_layout.addWidget(self.category_row)
 
         # Favoriten-Filter-Leiste (nur im Favoriten-Modus sichtbar)
@@ -695,9 +736,12 @@ class UiBuilderMixin:
         cl_layout.addWidget(self.channel_loading, stretch=1)
 
         self.channel_list = QListWidget()
+        self.channel_list.setItemDelegate(PosterItemDelegate(self.channel_list))
         self._apply_channel_list_style(grid_mode=False)
         self.channel_list.itemClicked.connect(self._on_channel_selected)
         self.channel_list.itemDoubleClicked.connect(self._on_channel_selected)
+        self.channel_list.currentRowChanged.connect(self._schedule_detail_prefetch)
+        self.channel_list.verticalScrollBar().valueChanged.connect(self._on_channel_list_scrolled)
         self.channel_list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.channel_list.customContextMenuRequested.connect(self._show_channel_context_menu)
         self.channel_list.viewport().installEventFilter(self)
@@ -733,16 +777,34 @@ class UiBuilderMixin:
 
         self.channel_stack.addWidget(channel_list_page)
 
-        # Seite 1: Serien-Detailansicht
-        self.series_detail_page = self._create_series_detail_page()
-        self.channel_stack.addWidget(self.series_detail_page)
-
-        # Seite 2: VOD-Detailansicht
-        self.vod_detail_page = self._create_vod_detail_page()
-        self.channel_stack.addWidget(self.vod_detail_page)
+        # Seite 1: Serien-Detailansicht, Seite 2: VOD-Detailansicht.
+        # Platzhalter halten die Indizes; gebaut wird beim ersten Oeffnen.
+        self.series_detail_page = None
+        self.vod_detail_page = None
+        self.channel_stack.addWidget(QWidget())
+        self.channel_stack.addWidget(QWidget())
 
         return self.channel_stack
 
+    def _replace_stack_placeholder(self, index: int, page: QWidget):
+        placeholder = self.channel_stack.widget(index)
+        was_current = self.channel_stack.currentIndex() == index
+        self.channel_stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.channel_stack.insertWidget(index, page)
+        if was_current:
+            self.channel_stack.setCurrentIndex(index)
+
+    def _ensure_series_detail_page(self):
+        if self.series_detail_page is None:
+            self.series_detail_page = self._create_series_detail_page()
+            self._replace_stack_placeholder(1, self.series_detail_page)
+
+    def _ensure_vod_detail_page(self):
+        if self.vod_detail_page is None:
+            self.vod_detail_page = self._create_vod_detail_page()
+            self._replace_stack_placeholder(2, self.vod_detail_page)
+
     def _create_channel_detail_panel(self) -> QWidget:
         """Modernes Kanal-Detailpanel: Hero-Bild, Logo, Name, EPG mit Fortschrittsbalken."""
         panel = QWidget()
@@ -917,6 +979,7 @@ class UiBuilderMixin:
             }
             QPushButton:hover { background: #c0392b; color: white; border-color: #c0392b; }
         """)
+        self.detail_now_rec_btn.clicked.connect(self._schedule_detail_now)
         self.detail_now_rec_btn.hide()
         now_time_row.addWidget(self.detail_now_rec_btn, alignment=Qt.AlignVCenter)
         now_lay.addLayout(now_time_row)
@@ -945,7 +1008,7 @@ class UiBuilderMixin:
 
         lay.addWidget(self.detail_now_section)
 
-        # ── DANACH-Bereich (dynamisch, bis zu 3 Eintraege) ────────────────────────
+        # ── DANACH-Bereich (feste Zeilen, werden nur befuellt/ein-/ausgeblendet) ──
         self.detail_future_section = QWidget()
         self.detail_future_section.setStyleSheet("background: transparent;")
         future_outer = QVBoxLayout(self.detail_future_section)
@@ -963,6 +1026,39 @@ class UiBuilderMixin:
         self.detail_future_layout = QVBoxLayout(self.detail_future_container)
         self.detail_future_layout.setContentsMargins(0, 0, 0, 0)
         self.detail_future_layout.setSpacing(8)
+        self._detail_future_rows = []  # (Widget, Titel, Zeit)
+        for i in range(DETAIL_FUTURE_ENTRIES):
+            entry_w = QWidget()
+            entry_lay = QVBoxLayout(entry_w)
+            entry_lay.setContentsMargins(0, 0, 0, 0)
+            entry_lay.setSpacing(2)
+            title_lbl = QLabel("")
+            title_lbl.setStyleSheet("font-size: 15px; color: #aaa;")
+            title_lbl.setWordWrap(True)
+            entry_lay.addWidget(title_lbl)
+            # Zeitzeile + 📹-Button
+            time_row = QHBoxLayout()
+            time_row.setSpacing(6)
+            time_lbl = QLabel("")
+            time_lbl.setStyleSheet("font-size: 12px; color: #555;")
+            time_row.addWidget(time_lbl, stretch=1)
+            rec_btn = QPushButton("\U0001F4F9")
+            rec_btn.setToolTip("Aufnahme planen")
+            rec_btn.setFixedHeight(26)
+            rec_btn.setStyleSheet("""
+                QPushButton {
+                    background: transparent; color: #666;
+                    border: 1px solid #333; border-radius: 3px;
+                    font-size: 15px; padding: 0 5px;
+                }
+                QPushButton:hover { background: #c0392b; color: white; border-color: #c0392b; }
+            """)
+            rec_btn.clicked.connect(lambda checked=False, i=i: self._schedule_detail_future(i))
+            time_row.addWidget(rec_btn, alignment=Qt.AlignVCenter)
+            entry_lay.addLayout(time_row)
+            entry_w.hide()
+            self.detail_future_layout.addWidget(entry_w)
+            self._detail_future_rows.append((entry_w, title_lbl, time_lbl))
         future_outer.addWidget(self.detail_future_container)
 
         self.detail_future_section.hide()
@@ -1297,7 +1393,6 @@ class UiBuilderMixin:
 
         # Serien-Daten-Cache
         self._series_data: dict | None = None
-        self._current_series = None
 
         return page
 
@@ -1511,7 +1606,6 @@ class UiBuilderMixin:
         self.vod_meta_label = QLabel("")
 
         # VOD-Daten-Cache
-        self._current_vod = None
         self._current_trailer_url: str = ""
 
         return page
@@ -1,19 +1,24 @@
 """
 VOD-Details: Film-Detailansicht, Poster, Ratings, Besetzung
 """
-import asyncio
 import aiohttp
 
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import QLabel, QWidget, QHBoxLayout
 
 from xtream_api import VodStream
+from detail_cache import KIND_VOD
+from task_scopes import SCOPE_DETAIL
+
+# Groesse des Covers in der Detailansicht (auch fuer das Vorladen)
+VOD_COVER_SIZE = (220, 330)
 
 
 class VodDetailMixin:
 
     def _show_vod_detail(self, vod: VodStream):
         """Zeigt die VOD-Detailansicht an"""
+        self._ensure_vod_detail_page()
         self._current_vod = vod
         if vod.category_id:
             account = self.account_manager.get_selected()
@@ -40,7 +45,7 @@ class VodDetailMixin:
         self._clear_cast_chips()
 
         self.channel_stack.setCurrentIndex(2)
-        asyncio.ensure_future(self._load_vod_detail(vod))
+        self.task_scopes.spawn(SCOPE_DETAIL, self._load_vod_detail(vod))
 
     def _clear_rating_badges(self):
         """Entfernt alle Rating-Badges"""
@@ -129,7 +134,7 @@ class VodDetailMixin:
         """Laedt VOD-Details asynchron"""
         self._show_loading("Lade Film-Informationen...")
         try:
-            data = await self.api.get_vod_info(vod.stream_id)
+            data = await self._fetch_vod_info(vod)
             info = data.get("info", {}) or {}
 
             # Plot
@@ -177,9 +182,9 @@ class VodDetailMixin:
                     pass
 
             # TMDB-Daten holen falls tmdb_id vorhanden
-            tmdb_id = info.get("tmdb_id", "") or info.get("tmdb", "")
+            tmdb_id = info.get("tmdb_id", "") or info.get("tmdb", "") or vod.tmdb
             if tmdb_id:
-                asyncio.ensure_future(self._fetch_tmdb_ratings(str(tmdb_id)))
+                self.task_scopes.spawn(SCOPE_DETAIL, self._fetch_tmdb_ratings(str(tmdb_id)), replace=False)
 
             # Genre-Tags
             genre = info.get("genre", "")
@@ -229,57 +234,59 @@ class VodDetailMixin:
             self.vod_loading_bar.hide()
 
             # Cover laden
-            cover_url = info.get("cover_big", "") or info.get("movie_image", "") or vod.stream_icon
+            cover_url = self._vod_cover_url(vod, info)
             if cover_url:
-                asyncio.ensure_future(self._load_vod_cover(cover_url))
+                self.task_scopes.spawn(SCOPE_DETAIL, self._load_vod_cover(cover_url), replace=False)
 
         except Exception as e:
             self._hide_loading(f"Fehler: {e}")
             self.vod_loading_bar.hide()
             if vod.stream_icon:
-                asyncio.ensure_future(self._load_vod_cover(vod.stream_icon))
+                self.task_scopes.spawn(SCOPE_DETAIL, self._load_vod_cover(vod.stream_icon), replace=False)
+
+    async def _fetch_vod_info(self, vod: VodStream) -> dict:
+        """get_vod_info ueber den Detail-Cache (Speicher/Platte)"""
+        api = self.api
+        return await self.detail_cache.fetch(
+            self._detail_cache_account(), KIND_VOD, vod.stream_id,
+            lambda: api.get_vod_info(vod.stream_id),
+        )
+
+    @staticmethod
+    def _vod_cover_url(vod: VodStream, info: dict) -> str:
+        return info.get("cover_big", "") or info.get("movie_image", "") or vod.stream_icon
 
     async def _fetch_tmdb_ratings(self, tmdb_id: str):
-        """Holt Bewertungen von TMDB - benoetigt TMDB_API_KEY Umgebungsvariable"""
-        import os
-        api_key = os.environ.get("TMDB_API_KEY", "")
-        if not api_key:
+        """Holt Bewertungen ueber den TMDB-Dienst (Cache, TMDB_API_KEY/TMDB_API_URL)"""
+        vod = self._current_vod
+        data = await self.tmdb_service.movie(tmdb_id)
+        if not data or self._current_vod is not vod:
             return
-        try:
-            url = f"https://api.themoviedb.org/3/movie/{tmdb_id}?api_key={api_key}&language=de-DE"
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                async with session.get(url) as resp:
-                    if resp.status != 200:
-                        return
-                    data = await resp.json()
-
-                    vote = data.get("vote_average", 0)
-                    vote_count = data.get("vote_count", 0)
-                    if vote and vote_count > 0:
-                        if vote >= 7:
-                            color = "#4caf50"
-                        elif vote >= 5:
-                            color = "#f0c040"
-                        else:
-                            color = "#f44336"
-                        self._add_rating_badge("TMDB", f"{vote:.1f}", color)
-
-                    # Plot updaten falls leer
-                    if not self.vod_plot_label.text():
-                        overview = data.get("overview", "")
-                        if overview:
-                            self.vod_plot_label.setText(overview)
-
-        except Exception:
-            pass
+
+        vote = data.get("vote_average", 0)
+        vote_count = data.get("vote_count", 0)
+        if vote and vote_count > 0:
+            if vote >= 7:
+                color = "#4caf50"
+            elif vote >= 5:
+                color = "#f0c040"
+            else:
+                color = "#f44336"
+            self._add_rating_badge("TMDB", f"{vote:.1f}", color)
+
+        # Plot updaten falls leer
+        if not self.vod_plot_label.text():
+            overview = data.get("overview", "")
+            if overview:
+                self.vod_plot_label.setText(overview)
 
     async def _load_vod_cover(self, url: str):
         """Laedt das VOD-Cover asynchron"""
         async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            pixmap = await self._fetch_poster(session, url, 220, 330)
+            pixmap = await self._fetch_poster(session, url, *VOD_COVER_SIZE)
             if pixmap:
                 scaled = pixmap.scaled(
-                    220, 330, Qt.KeepAspectRatio, Qt.SmoothTransformation
+                    *VOD_COVER_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation
                 )
                 self.vod_cover_label.setPixmap(scaled)
                 self.vod_cover_label.setText("")
@@ -312,6 +319,8 @@ class VodDetailMixin:
 
     def _vod_back(self):
         """Zurueck zur Filmliste"""
+        if self.task_scopes.cancel(SCOPE_DETAIL):
+            self.loading_bar.hide()
         self.channel_stack.setCurrentIndex(0)
 
     def _play_trailer(self):
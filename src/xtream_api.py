@@ -5,9 +5,22 @@ Basiert auf der myboard API-Implementierung
 import asyncio
 import aiohttp
 import base64
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
+
+import json_codec
+from catalog import Catalog
+from compute_executor import gc_paused, run_compute
+
+
+def _to_int(value) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
 
 
 def _decode_base64(value: str) -> str:
@@ -50,14 +63,14 @@ class XtreamCredentials:
         return f"{server}/timeshift/{self.username}/{self.password}/{duration_min}/{start_str}/{stream_id}.{extension}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Category:
     category_id: str
     category_name: str
     parent_id: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class LiveStream:
     stream_id: int
     name: str
@@ -68,7 +81,7 @@ class LiveStream:
     tv_archive_duration: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class VodStream:
     stream_id: int
     name: str
@@ -78,9 +91,10 @@ class VodStream:
     added: str = ""
     category_id: str = ""
     container_extension: str = "mp4"
+    tmdb: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Series:
     series_id: int
     name: str
@@ -92,7 +106,31 @@ class Series:
     category_id: str = ""
 
 
-@dataclass
+class LiveCatalog(Catalog):
+    row_type = LiveStream
+    fields = ("stream_id", "name", "stream_icon", "epg_channel_id", "category_id",
+              "tv_archive", "tv_archive_duration")
+    numeric = {"stream_id": "q", "tv_archive_duration": "l"}
+    interned = frozenset({"category_id"})
+
+
+class VodCatalog(Catalog):
+    row_type = VodStream
+    fields = ("stream_id", "name", "stream_icon", "rating", "rating_5based", "added",
+              "category_id", "container_extension", "tmdb")
+    numeric = {"stream_id": "q", "rating_5based": "d"}
+    interned = frozenset({"rating", "category_id", "container_extension"})
+
+
+class SeriesCatalog(Catalog):
+    row_type = Series
+    fields = ("series_id", "name", "cover", "plot", "rating", "rating_5based", "added",
+              "category_id")
+    numeric = {"series_id": "q", "rating_5based": "d"}
+    interned = frozenset({"rating", "category_id"})
+
+
+@dataclass(slots=True)
 class Episode:
     id: str
     episode_num: int
@@ -103,7 +141,7 @@ class Episode:
     plot: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class EpgEntry:
     title: str
     start_timestamp: int
@@ -111,9 +149,141 @@ class EpgEntry:
     description: str = ""
 
 
+# Ab dieser Body-Groesse wird im Compute-Executor dekodiert und gemappt,
+# damit die qasync-Eventloop (GUI) nicht blockiert
+_THREAD_DECODE_BYTES = 256 * 1024
+
+# Standard-Lebensdauer (Sekunden) zwischengespeicherter Antworten je Action.
+# 0 bzw. fehlend = nicht cachen; gleichzeitige identische Anfragen werden
+# trotzdem zusammengelegt.
+DEFAULT_CACHE_TTL = {
+    "get_short_epg": 60,
+    "get_simple_data_table": 300,
+    "get_vod_info": 600,
+    "get_series_info": 600,
+    "get_live_categories": 120,
+    "get_vod_categories": 120,
+    "get_series_categories": 120,
+    "get_live_streams": 120,
+    "get_vod_streams": 120,
+    "get_series": 120,
+}
+# Gesamtkataloge (ohne category_id) werden nie hier gecacht: sie sind gross und
+# werden als Catalog/SortIndex ohnehin von Suche und Kategorie-Ansicht gehalten.
+
+_CACHE_MAX_ENTRIES = 512
+
+
+def _rows(data) -> list[dict]:
+    return [r for r in (data or []) if isinstance(r, dict)] if isinstance(data, list) else []
+
+
+def _map_categories(data) -> list[Category]:
+    return [
+        Category(
+            category_id=str(c.get("category_id", "")),
+            category_name=c.get("category_name", ""),
+            parent_id=c.get("parent_id", 0)
+        )
+        for c in _rows(data)
+    ]
+
+
+def _map_live_streams(data) -> LiveCatalog:
+    rows = _rows(data)
+    return LiveCatalog.from_columns(
+        stream_id=[_to_int(s.get("stream_id")) for s in rows],
+        name=[s.get("name") or "" for s in rows],
+        stream_icon=[s.get("stream_icon") or "" for s in rows],
+        epg_channel_id=[s.get("epg_channel_id") or "" for s in rows],
+        category_id=[str(s.get("category_id", "")) for s in rows],
+        tv_archive=[bool(s.get("tv_archive", 0)) for s in rows],
+        tv_archive_duration=[_to_int(s.get("tv_archive_duration")) for s in rows],
+    )
+
+
+def _map_vod_streams(data) -> VodCatalog:
+    rows = _rows(data)
+    return VodCatalog.from_columns(
+        stream_id=[_to_int(s.get("stream_id")) for s in rows],
+        name=[s.get("name") or "" for s in rows],
+        stream_icon=[s.get("stream_icon") or "" for s in rows],
+        rating=[str(s.get("rating", "")) for s in rows],
+        rating_5based=[float(s.get("rating_5based", 0) or 0) for s in rows],
+        added=[str(s.get("added", "")) for s in rows],
+        category_id=[str(s.get("category_id", "")) for s in rows],
+        container_extension=[s.get("container_extension") or "mp4" for s in rows],
+        tmdb=[str(s.get("tmdb") or s.get("tmdb_id") or "") for s in rows],
+    )
+
+
+def _map_series(data) -> SeriesCatalog:
+    rows = _rows(data)
+    return SeriesCatalog.from_columns(
+        series_id=[_to_int(s.get("series_id")) for s in rows],
+        name=[s.get("name") or "" for s in rows],
+        cover=[s.get("cover") or "" for s in rows],
+        plot=[s.get("plot") or "" for s in rows],
+        rating=[str(s.get("rating", "")) for s in rows],
+        rating_5based=[float(s.get("rating_5based", 0) or 0) for s in rows],
+        added=[str(s.get("added", "")) for s in rows],
+        category_id=[str(s.get("category_id", "")) for s in rows],
+    )
+
+
+def _map_epg(data) -> list[EpgEntry]:
+    listings = data.get("epg_listings", []) if isinstance(data, dict) else []
+    return [
+        EpgEntry(
+            title=_decode_base64(e.get("title", "")),
+            start_timestamp=int(e.get("start_timestamp", 0)),
+            stop_timestamp=int(e.get("stop_timestamp", 0)),
+            description=_decode_base64(e.get("description", ""))
+        )
+        for e in listings
+    ]
+
+
+def _decode(body: bytes, mapper: Optional[Callable]):
+    with gc_paused():
+        data = json_codec.loads(body)
+        return mapper(data) if mapper else data
+
+
+def parse_series_info(raw: dict) -> dict:
+    """get_series_info-Antwort in Staffeln und Episoden zerlegen"""
+    info = raw.get("info", {}) or {}
+    episodes_raw = raw.get("episodes", {}) or {}
+
+    seasons = sorted(int(s) for s in episodes_raw.keys())
+    episodes: dict[int, list[Episode]] = {}
+
+    for season_str, ep_list in episodes_raw.items():
+        season_num = int(season_str)
+        parsed = []
+        for ep in (ep_list or []):
+            parsed.append(Episode(
+                id=str(ep.get("id", "")),
+                episode_num=int(ep.get("episode_num", 0)),
+                title=ep.get("title", ""),
+                container_extension=ep.get("container_extension", "mp4"),
+                duration=ep.get("info", {}).get("duration", "") if isinstance(ep.get("info"), dict) else "",
+                season=season_num,
+                plot=ep.get("info", {}).get("plot", "") if isinstance(ep.get("info"), dict) else "",
+            ))
+        parsed.sort(key=lambda e: e.episode_num)
+        episodes[season_num] = parsed
+
+    return {"info": info, "seasons": seasons, "episodes": episodes}
+
+
 class XtreamAPI:
-    def __init__(self, credentials: XtreamCredentials):
+    def __init__(self, credentials: XtreamCredentials, cache_ttl: Optional[dict] = None):
         self.creds = credentials
+        # Action -> TTL in Sekunden, Eintraege aus cache_ttl ueberschreiben die Standards
+        self.cache_ttl = {**DEFAULT_CACHE_TTL, **(cache_ttl or {})}
+        self._cache: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Task] = {}
 
     def _params(self, **extra) -> dict:
         params = {
@@ -123,7 +293,55 @@ class XtreamAPI:
         params.update(extra)
         return params
 
-    async def _get(self, action: str, retries: int = 3, **params) -> dict | list:
+    def invalidate(self, action: Optional[str] = None):
+        """Verwirft zwischengespeicherte Antworten (alle oder einer Action)."""
+        if action is None:
+            self._cache.clear()
+            return
+        for key in [k for k in self._cache if k[0] == action]:
+            del self._cache[key]
+
+    async def _get(self, action: str, retries: int = 3, mapper: Optional[Callable] = None,
+                   cache: bool = True, **params):
+        """GET auf player_api.php. Mit `mapper` wird das dekodierte JSON direkt in
+        Dataclasses/Catalog umgewandelt – bei grossen Antworten im Compute-Executor.
+
+        Identische Anfragen, die gleichzeitig laufen, teilen sich einen Request
+        (single-flight); Antworten werden pro Action `cache_ttl` Sekunden gehalten
+        (nicht mit cache=False). Das Ergebnis wird zwischen allen Aufrufern
+        geteilt und darf nicht veraendert werden.
+        """
+        key = (action, mapper, tuple(sorted((k, str(v)) for k, v in params.items())))
+        cached = self._cache.get(key) if cache else None
+        if cached is not None:
+            expires, value = cached
+            if expires > time.monotonic():
+                self._cache.move_to_end(key)
+                return value
+            del self._cache[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(action, retries, mapper, params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._store(key, t, cache))
+        # shield: bricht ein Aufrufer ab, laeuft der Request fuer die anderen weiter
+        return await asyncio.shield(task)
+
+    def _store(self, key: tuple, task: asyncio.Task, cache: bool = True):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not cache or task.cancelled() or task.exception() is not None:
+            return
+        ttl = self.cache_ttl.get(key[0], 0)
+        if ttl <= 0:
+            return
+        self._cache[key] = (time.monotonic() + ttl, task.result())
+        self._cache.move_to_end(key)
+        while len(self._cache) > _CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
+    async def _fetch(self, action: str, retries: int, mapper: Optional[Callable], params: dict):
         timeout = aiohttp.ClientTimeout(total=15)
         all_params = self._params(action=action, **params)
         for attempt in range(retries):
@@ -131,110 +349,53 @@ class XtreamAPI:
                 async with aiohttp.ClientSession(timeout=timeout) as session:
                     async with session.get(self.creds.base_url, params=all_params) as resp:
                         resp.raise_for_status()
-                        return await resp.json()
+                        body = await resp.read()
+                break
             except (aiohttp.ClientError, asyncio.TimeoutError):
                 if attempt == retries - 1:
                     raise
                 await asyncio.sleep(1 + attempt)
 
+        if len(body) >= _THREAD_DECODE_BYTES:
+            return await run_compute(_decode, body, mapper)
+        return _decode(body, mapper)
+
     async def get_account_info(self) -> dict:
         """Holt Account-Informationen"""
         return await self._get("")
 
     async def get_live_categories(self) -> list[Category]:
         """Holt alle Live-TV Kategorien"""
-        data = await self._get("get_live_categories")
-        return [
-            Category(
-                category_id=str(c.get("category_id", "")),
-                category_name=c.get("category_name", ""),
-                parent_id=c.get("parent_id", 0)
-            )
-            for c in (data or []) if isinstance(c, dict)
-        ]
-
-    async def get_live_streams(self, category_id: Optional[str] = None) -> list[LiveStream]:
+        return await self._get("get_live_categories", mapper=_map_categories)
+
+    async def get_live_streams(self, category_id: Optional[str] = None) -> LiveCatalog:
         """Holt Live-Streams einer Kategorie"""
         params = {}
         if category_id:
             params["category_id"] = category_id
-        data = await self._get("get_live_streams", **params)
-        return [
-            LiveStream(
-                stream_id=s.get("stream_id", 0),
-                name=s.get("name", ""),
-                stream_icon=s.get("stream_icon", ""),
-                epg_channel_id=s.get("epg_channel_id", ""),
-                category_id=str(s.get("category_id", "")),
-                tv_archive=bool(s.get("tv_archive", 0)),
-                tv_archive_duration=int(s.get("tv_archive_duration", 0) or 0),
-            )
-            for s in (data or []) if isinstance(s, dict)
-        ]
+        return await self._get("get_live_streams", mapper=_map_live_streams, cache=bool(category_id), **params)
 
     async def get_vod_categories(self) -> list[Category]:
         """Holt alle VOD Kategorien"""
-        data = await self._get("get_vod_categories")
-        return [
-            Category(
-                category_id=str(c.get("category_id", "")),
-                category_name=c.get("category_name", ""),
-                parent_id=c.get("parent_id", 0)
-            )
-            for c in (data or []) if isinstance(c, dict)
-        ]
-
-    async def get_vod_streams(self, category_id: Optional[str] = None) -> list[VodStream]:
+        return await self._get("get_vod_categories", mapper=_map_categories)
+
+    async def get_vod_streams(self, category_id: Optional[str] = None) -> VodCatalog:
         """Holt VOD-Streams einer Kategorie"""
         params = {}
         if category_id:
             params["category_id"] = category_id
-        data = await self._get("get_vod_streams", **params)
-        return [
-            VodStream(
-                stream_id=s.get("stream_id", 0),
-                name=s.get("name", ""),
-                stream_icon=s.get("stream_icon", ""),
-                rating=str(s.get("rating", "")),
-                rating_5based=float(s.get("rating_5based", 0) or 0),
-                added=str(s.get("added", "")),
-                category_id=str(s.get("category_id", "")),
-                container_extension=s.get("container_extension", "mp4")
-            )
-            for s in (data or []) if isinstance(s, dict)
-        ]
+        return await self._get("get_vod_streams", mapper=_map_vod_streams, cache=bool(category_id), **params)
 
     async def get_series_categories(self) -> list[Category]:
         """Holt alle Serien-Kategorien"""
-        data = await self._get("get_series_categories")
-        return [
-            Category(
-                category_id=str(c.get("category_id", "")),
-                category_name=c.get("category_name", ""),
-                parent_id=c.get("parent_id", 0)
-            )
-            for c in (data or []) if isinstance(c, dict)
-        ]
-
-    async def get_series(self, category_id: Optional[str] = None) -> list[Series]:
+        return await self._get("get_series_categories", mapper=_map_categories)
+
+    async def get_series(self, category_id: Optional[str] = None) -> SeriesCatalog:
         """Holt Serien einer Kategorie"""
         params = {}
         if category_id:
             params["category_id"] = category_id
-        data = await self._get("get_series", **params)
-        return [
-            Series(
-                series_id=s.get("series_id", 0),
-                name=s.get("name", ""),
-                cover=s.get("cover", ""),
-                plot=s.get("plot", ""),
-                rating=str(s.get("rating", "")),
-                rating_5based=float(s.get("rating_5based", 0) or 0),
-                added=str(s.get("added", "")),
-                category_id=str(s.get("category_id", ""))
-            )
-            for s in (data or []) if isinstance(s, dict)
-        ]
+        return await self._get("get_series", mapper=_map_series, cache=bool(category_id), **params)
 
     async def get_vod_info(self, vod_id: int) -> dict:
         """Holt detaillierte VOD-Informationen (Plot, Cast, Director etc.)"""
@@ -246,55 +407,12 @@ class XtreamAPI:
 
     async def get_series_info_parsed(self, series_id: int) -> dict:
         """Holt und parst Serien-Informationen mit Staffeln und Episoden"""
-        raw = await self.get_series_info(series_id)
-        info = raw.get("info", {}) or {}
-        episodes_raw = raw.get("episodes", {}) or {}
-
-        seasons = sorted(int(s) for s in episodes_raw.keys())
-        episodes: dict[int, list[Episode]] = {}
-
-        for season_str, ep_list in episodes_raw.items():
-            season_num = int(season_str)
-            parsed = []
-            for ep in (ep_list or []):
-                parsed.append(Episode(
-                    id=str(ep.get("id", "")),
-                    episode_num=int(ep.get("episode_num", 0)),
-                    title=ep.get("title", ""),
-                    container_extension=ep.get("container_extension", "mp4"),
-                    duration=ep.get("info", {}).get("duration", "") if isinstance(ep.get("info"), dict) else "",
-                    season=season_num,
-                    plot=ep.get("info", {}).get("plot", "") if isinstance(ep.get("info"), dict) else "",
-                ))
-            parsed.sort(key=lambda e: e.episode_num)
-            episodes[season_num] = parsed
-
-        return {"info": info, "seasons": seasons, "episodes": episodes}
+        return parse_series_info(await self.get_series_info(series_id))
 
     async def get_short_epg(self, stream_id: int, limit: int = 2) -> list[EpgEntry]:
         """Holt EPG-Daten fuer einen Stream (aktuell + kommend)"""
-        data = await self._get("get_short_epg", stream_id=stream_id, limit=limit)
-        listings = data.get("epg_listings", []) if isinstance(data, dict) else []
-        return [
-            EpgEntry(
-                title=_decode_base64(e.get("title", "")),
-                start_timestamp=int(e.get("start_timestamp", 0)),
-                stop_timestamp=int(e.get("stop_timestamp", 0)),
-                description=_decode_base64(e.get("description", ""))
-            )
-            for e in listings
-        ]
+        return await self._get("get_short_epg", mapper=_map_epg, stream_id=stream_id, limit=limit)
 
     async def get_full_epg(self, stream_id: int) -> list[EpgEntry]:
         """Holt vollstaendige EPG-Daten inkl. vergangener Sendungen"""
-        data = await self._get("get_simple_data_table", stream_id=stream_id)
-        listings = data.get("epg_listings", []) if isinstance(data, dict) else []
-        return [
-            EpgEntry(
-                title=_decode_base64(e.get("title", "")),
-                start_timestamp=int(e.get("start_timestamp", 0)),
-                stop_timestamp=int(e.get("stop_timestamp", 0)),
-                description=_decode_base64(e.get("description", ""))
-            )
-            for e in listings
-        ]
+        return await self._get("get_simple_data_table", mapper=_map_epg, stream_id=stream_id)